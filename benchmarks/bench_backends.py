@@ -0,0 +1,96 @@
+"""
+Benchmark pentru backend-urile de estimator (`src/backends.py`).
+
+Fiecare backend se antrenează într-un proces nou, pe același dataset simulat
+scris pe disc, cu același split train/test. Se raportează durata `fit`,
+throughput-ul predicției (rânduri/s, `predict_batch` pe 200.000 de rânduri),
+dimensiunea fișierului joblib, RMSE pe setul de test și memoria maximă.
+
+Rulare:
+    python benchmarks/bench_backends.py [număr_stații] [ani]
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.backends import BACKENDS
+from src.model import PM25Predictor, peak_rss_mb
+from src.storage import read_training_data
+from src.synthetic import write_synthetic_dataset
+
+PREDICT_ROWS = 200_000
+
+
+def measure_child(backend: str, data_path: str, model_dir: str):
+    """Rulează în procesul copil: antrenează, prezice și afișează măsurătorile ca JSON."""
+    predictor = PM25Predictor(
+        model_path=os.path.join(model_dir, f"{backend}.joblib"), backend=backend
+    )
+    predictor.train(data_path)
+
+    df = read_training_data(data_path, columns=predictor.feature_columns).dropna()
+    X = df[predictor.feature_columns].to_numpy(dtype=np.float64)
+    X = X[np.random.default_rng(0).integers(len(X), size=PREDICT_ROWS)]
+    predictor.predict_batch(X[:1000])  # încălzire
+    start = time.perf_counter()
+    predictor.predict_batch(X)
+    predict_seconds = time.perf_counter() - start
+
+    print(
+        json.dumps(
+            {
+                "fit_seconds": predictor.metrics["training"]["seconds"],
+                "rows_per_second": PREDICT_ROWS / predict_seconds,
+                "model_mb": os.path.getsize(predictor.model_path) / 1e6,
+                "test_rmse": predictor.metrics["test"]["rmse"],
+                "peak_rss_mb": peak_rss_mb(),
+            }
+        )
+    )
+
+
+def run_child(backend: str, data_path: str, model_dir: str) -> dict:
+    """Pornește un proces nou pentru un backend."""
+    output = subprocess.run(
+        [sys.executable, __file__, "--child", backend, data_path, model_dir],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main(n_stations: int = 20, years: float = 1):
+    """Generează un dataset pe disc și compară backend-urile."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        data_dir = os.path.join(tmp_dir, "data")
+        n_rows = write_synthetic_dataset(data_dir, n_stations, years, stations_per_chunk=5)
+
+        print(f"\n{n_rows:,} rânduri, {os.cpu_count()} CPU-uri")
+        print(
+            f"{'backend':>22s} | {'fit (s)':>8s} | {'predicție (rânduri/s)':>21s} | "
+            f"{'model (MB)':>10s} | {'RMSE test':>9s} | {'memorie (MB)':>12s}"
+        )
+        print("-" * 98)
+        for backend in BACKENDS:
+            result = run_child(backend, data_dir, tmp_dir)
+            print(
+                f"{backend:>22s} | {result['fit_seconds']:>8.1f} | "
+                f"{result['rows_per_second']:>21,.0f} | {result['model_mb']:>10.1f} | "
+                f"{result['test_rmse']:>9.2f} | {result['peak_rss_mb']:>12.0f}"
+            )
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--child":
+        measure_child(sys.argv[2], sys.argv[3], sys.argv[4])
+    else:
+        main(*(float(arg) if i else int(arg) for i, arg in enumerate(sys.argv[1:3])))
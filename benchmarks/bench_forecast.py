@@ -0,0 +1,83 @@
+"""
+Benchmark pentru prognoza PM2.5 pe orizont (24h / 7 zile).
+
+Compară bucla veche (câte un apel `predict` pe oră, cu DataFrame de un rând)
+cu `predict_next_24h` vectorizat, care evaluează tot orizontul într-un
+singur apel `model.predict`.
+
+Rulare:
+    python benchmarks/bench_forecast.py
+"""
+
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.model import PM25Predictor
+from src.storage import write_training_data
+from src.synthetic import generate_synthetic_dataset
+
+CURRENT_WEATHER = {
+    "temperature": 20.0,
+    "humidity": 60.0,
+    "pressure": 1013.0,
+    "wind_speed": 3.0,
+    "wind_direction": 180.0,
+    "clouds": 50.0,
+}
+
+
+def train_predictor(tmp_dir: str) -> PM25Predictor:
+    """Antrenează un model pe date simulate într-un director temporar."""
+    data_path = os.path.join(tmp_dir, "training_data.csv")
+    write_training_data(generate_synthetic_dataset(n_stations=5, years=1), data_path)
+    predictor = PM25Predictor(model_path=os.path.join(tmp_dir, "pm25_model.joblib"))
+    predictor.train(data_path)
+    return predictor
+
+
+def forecast_row_by_row(predictor: PM25Predictor, hours: int):
+    """Reproduce bucla inițială: un DataFrame și un `predict` pentru fiecare oră."""
+    current_time = datetime.now()
+    for hour_offset in range(hours):
+        future_time = current_time + timedelta(hours=hour_offset)
+        weather = predictor._simulate_weather_variation(CURRENT_WEATHER, hour_offset)
+        weather["hour"] = future_time.hour
+        weather["day_of_week"] = future_time.weekday()
+        weather["month"] = future_time.month
+        predictor.predict(weather)
+
+
+def time_ms(fn, repeats: int = 10) -> float:
+    """Mediana latenței în milisecunde."""
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return float(np.median(samples))
+
+
+def main():
+    """Rulează benchmark-ul pentru orizonturi de 24h și 7 zile."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        predictor = train_predictor(tmp_dir)
+
+        print(
+            f"\n{'orizont':>8s} | {'rând cu rând (ms)':>18s} | {'batch (ms)':>11s} | {'speedup':>8s}"
+        )
+        print("-" * 56)
+        for hours in [24, 168]:
+            slow = time_ms(lambda: forecast_row_by_row(predictor, hours), repeats=3)
+            fast = time_ms(lambda: predictor.predict_next_24h(CURRENT_WEATHER, hours=hours))
+            print(f"{hours:>7d}h | {slow:>18.1f} | {fast:>11.1f} | {slow / fast:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Benchmark pentru motoarele de inferență: sklearn vs pădurea compilată.
+
+Verifică mai întâi că pădurea compilată (scaler integrat în pragurile de
+split) dă aceleași predicții ca `RandomForestRegressor`, apoi măsoară
+latența și throughput-ul celor două motoare pentru loturi de 1 până la 100k
+rânduri, plus latența `PM25Predictor.predict` pentru un singur dicționar.
+`engine='compiled'` folosește pădurea compilată doar până la
+`COMPILED_MAX_ROWS` rânduri; tabelul arată de unde vine pragul.
+
+Rulare:
+    python benchmarks/bench_inference_engine.py
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.model import COMPILED_MAX_ROWS, PM25Predictor
+from src.model_artifacts import compile_forest
+from src.storage import read_training_data, write_training_data
+from src.synthetic import generate_synthetic_dataset
+
+BATCH_SIZES = [1, 10, 100, 1_000, 10_000, 100_000]
+
+
+def time_ms(fn, repeats: int) -> float:
+    """Mediana latenței în milisecunde."""
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return float(np.median(samples))
+
+
+def main():
+    """Rulează verificarea de corectitudine și benchmark-ul pe mărimi de lot."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        data_path = os.path.join(tmp_dir, "training_data.csv")
+        write_training_data(generate_synthetic_dataset(n_stations=5, years=1), data_path)
+        model_path = os.path.join(tmp_dir, "pm25_model.joblib")
+        sklearn_predictor = PM25Predictor(model_path=model_path)
+        sklearn_predictor.train(data_path)
+        compiled_predictor = PM25Predictor(model_path=model_path, engine="compiled")
+        compiled_predictor.load_model()
+
+        df = read_training_data(data_path)
+        X_all = df[sklearn_predictor.feature_columns].to_numpy(dtype=np.float64)
+        X_all = np.resize(X_all, (max(BATCH_SIZES), X_all.shape[1]))
+
+        model, scaler = sklearn_predictor.model, sklearn_predictor.scaler
+        compiled = compile_forest(model, scaler)
+
+        def predict_sklearn(X):
+            return model.predict(scaler.transform(X))
+
+        # Verificare de corectitudine față de sklearn
+        diff = np.abs(compiled.predict(X_all) - predict_sklearn(X_all)).max()
+        print(f"\n🔍 Diferența maximă compilat vs sklearn pe {len(X_all):,} rânduri: {diff:.2e}")
+        assert diff < 1e-9, "Pădurea compilată nu reproduce predicțiile sklearn"
+
+        print(
+            f"\n{'rânduri':>8s} | {'sklearn (ms)':>12s} | {'compilat (ms)':>13s} | "
+            f"{'rânduri/s compilat':>18s} | {'speedup':>8s}"
+        )
+        print("-" * 72)
+        for n_rows in BATCH_SIZES:
+            X = X_all[:n_rows]
+            repeats = 20 if n_rows <= 1_000 else 3
+            slow = time_ms(lambda: predict_sklearn(X), repeats)
+            fast = time_ms(lambda: compiled.predict(X), repeats)
+            print(
+                f"{n_rows:>8,d} | {slow:>12.2f} | {fast:>13.2f} | "
+                f"{n_rows / fast * 1000:>18,.0f} | {slow / fast:>7.1f}x"
+            )
+
+        row = df.iloc[0].to_dict()
+        slow = time_ms(lambda: sklearn_predictor.predict(row), 50)
+        fast = time_ms(lambda: compiled_predictor.predict(row), 50)
+        print(f"\nPrag de comutare în PM25Predictor: COMPILED_MAX_ROWS = {COMPILED_MAX_ROWS}")
+        print(f"predict(dict): sklearn {slow:.2f} ms, compilat {fast:.3f} ms ({slow / fast:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
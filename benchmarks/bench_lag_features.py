@@ -0,0 +1,72 @@
+"""
+Benchmark pentru features de lag și ferestre mobile.
+
+Compară calculul rând cu rând (reluarea istoricului fiecărei stații prin
+`OnlineLagState`) cu `add_lag_features` vectorizat și măsoară costul unei
+actualizări online (o observație nouă + features pentru ora următoare).
+
+Rulare:
+    python benchmarks/bench_lag_features.py
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.lag_features import OnlineLagState, add_lag_features
+from src.synthetic import generate_synthetic_dataset
+
+
+def row_by_row(df: pd.DataFrame):
+    """Features calculate rând cu rând, stație cu stație."""
+    for _, station in df.groupby("location", observed=True):
+        state = OnlineLagState()
+        for timestamp, value in zip(station["timestamp"], station["pm25"]):
+            state.features(timestamp)
+            state.update(timestamp, value)
+
+
+def time_seconds(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main():
+    """Rulează benchmark-ul pentru mai multe dimensiuni ale dataset-ului."""
+    print(
+        f"{'stații':>7s} | {'rânduri':>10s} | {'rând cu rând (s)':>17s} | "
+        f"{'vectorizat (s)':>15s} | {'speedup':>8s}"
+    )
+    print("-" * 70)
+    for n_stations in [10, 50]:
+        df = generate_synthetic_dataset(n_stations=n_stations, years=1, seed=1)
+        slow = time_seconds(lambda: row_by_row(df))
+        fast = time_seconds(lambda: add_lag_features(df))
+        print(
+            f"{n_stations:>7d} | {len(df):>10,d} | {slow:>17.2f} | {fast:>15.3f} | "
+            f"{slow / fast:>7.0f}x"
+        )
+
+    # Actualizarea online nu depinde de lungimea istoricului
+    print()
+    hours = pd.date_range("2024-01-01", periods=20_000, freq="H")
+    values = np.random.default_rng(0).uniform(5, 80, len(hours))
+    for n_updates in [1_000, 20_000]:
+        state = OnlineLagState()
+        elapsed = time_seconds(
+            lambda: [
+                (state.update(timestamp, value), state.features())
+                for timestamp, value in zip(hours[:n_updates], values[:n_updates])
+            ]
+        )
+        print(f"Actualizare online după {n_updates:,} ore: {elapsed / n_updates * 1e6:.1f} μs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Benchmark pentru încărcarea modelului: pickle joblib vs artefact `.mmap`.
+
+Fiecare măsurătoare rulează într-un proces Python nou (încărcare „rece” din
+punctul de vedere al interpretorului; fișierele pot fi deja în page cache).
+Se raportează timpul `load_model`, RSS-ul adăugat de încărcare și RSS-ul
+după o predicție de 24h. Paginile artefactului `.mmap` apar în RSS ca
+pagini partajate (page cache), deci se raportează separat și RSS-ul privat.
+
+Rulare:
+    python benchmarks/bench_model_loading.py [număr_stații]
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.model import PM25Predictor
+from src.storage import write_training_data
+from src.synthetic import generate_synthetic_dataset
+
+CURRENT_WEATHER = {
+    "temperature": 20.0,
+    "humidity": 60.0,
+    "pressure": 1013.0,
+    "wind_speed": 3.0,
+    "wind_direction": 180.0,
+    "clouds": 50.0,
+}
+
+
+def rss_mb() -> tuple:
+    """RSS-ul total și cel privat al procesului, în MB (din /proc/self/statm)."""
+    with open("/proc/self/statm") as f:
+        resident, shared = (int(v) for v in f.read().split()[1:3])
+    page_mb = os.sysconf("SC_PAGE_SIZE") / 1e6
+    return resident * page_mb, (resident - shared) * page_mb
+
+
+def measure_child(model_path: str, use_mmap: bool):
+    """Rulează în procesul copil: încarcă modelul și afișează măsurătorile ca JSON."""
+    predictor = PM25Predictor(model_path=model_path, use_mmap=use_mmap)
+    rss_before = rss_mb()
+
+    start = time.perf_counter()
+    predictor.load_model()
+    load_ms = (time.perf_counter() - start) * 1000
+    rss_loaded = rss_mb()
+
+    predictor.predict_next_24h(CURRENT_WEATHER)
+    rss_predicted = rss_mb()
+
+    print(
+        json.dumps(
+            {
+                "load_ms": load_ms,
+                "rss_load_mb": rss_loaded[0] - rss_before[0],
+                "rss_predict_mb": rss_predicted[0] - rss_before[0],
+                "private_predict_mb": rss_predicted[1] - rss_before[1],
+            }
+        )
+    )
+
+
+def run_child(model_path: str, use_mmap: bool) -> dict:
+    """Pornește un proces nou pentru o singură măsurătoare."""
+    output = subprocess.run(
+        [sys.executable, __file__, "--child", model_path, "1" if use_mmap else "0"],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def directory_size_mb(path: str) -> float:
+    """Dimensiunea unui fișier sau director, în MB."""
+    if os.path.isfile(path):
+        return os.path.getsize(path) / 1e6
+    return (
+        sum(
+            os.path.getsize(os.path.join(root, name))
+            for root, _, names in os.walk(path)
+            for name in names
+        )
+        / 1e6
+    )
+
+
+def main(n_stations: int = 20):
+    """Antrenează un model și compară încărcarea joblib cu cea mapată în memorie."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        data_path = os.path.join(tmp_dir, "training_data.csv")
+        write_training_data(generate_synthetic_dataset(n_stations=n_stations, years=1), data_path)
+        predictor = PM25Predictor(model_path=os.path.join(tmp_dir, "pm25_model.joblib"))
+        predictor.train(data_path)
+
+        print(
+            f"\n{'format':>8s} | {'disc (MB)':>9s} | {'load (ms)':>9s} | "
+            f"{'RSS load (MB)':>13s} | {'RSS +24h (MB)':>13s} | {'privat (MB)':>11s}"
+        )
+        print("-" * 80)
+        for name, use_mmap, path in [
+            ("joblib", False, predictor.model_path),
+            ("mmap", True, predictor.mmap_path),
+        ]:
+            runs = [run_child(predictor.model_path, use_mmap) for _ in range(3)]
+            best = min(runs, key=lambda r: r["load_ms"])
+            print(
+                f"{name:>8s} | {directory_size_mb(path):>9.1f} | {best['load_ms']:>9.1f} | "
+                f"{best['rss_load_mb']:>13.1f} | {best['rss_predict_mb']:>13.1f} | "
+                f"{best['private_predict_mb']:>11.1f}"
+            )
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--child":
+        measure_child(sys.argv[2], sys.argv[3] == "1")
+    else:
+        main(int(sys.argv[1]) if len(sys.argv) > 1 else 20)
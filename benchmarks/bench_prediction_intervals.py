@@ -0,0 +1,74 @@
+"""
+Benchmark pentru intervalele de predicție (p10/p90 din predicțiile arborilor).
+
+Compară, pentru loturi de diferite dimensiuni:
+- predicția punctuală (`predict_batch`)
+- intervalele vectorizate (`predict_intervals`: o singură matrice rânduri × arbori)
+- varianta naivă: `predict` separat pentru fiecare arbore sklearn, apoi cuantile
+
+Rulare:
+    python benchmarks/bench_prediction_intervals.py
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.model import INTERVAL_QUANTILES, PM25Predictor
+from src.storage import write_training_data
+from src.synthetic import generate_synthetic_dataset
+
+
+def naive_intervals(predictor: PM25Predictor, X: np.ndarray) -> np.ndarray:
+    """Câte un apel `predict` (cu validare) per arbore, apoi cuantile."""
+    X_scaled = predictor.scaler.transform(X)
+    outputs = np.column_stack([tree.predict(X_scaled) for tree in predictor.model.estimators_])
+    return np.quantile(outputs, INTERVAL_QUANTILES, axis=1)
+
+
+def time_ms(fn, repeats: int = 5) -> float:
+    """Mediana duratei în milisecunde."""
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return float(np.median(samples))
+
+
+def main():
+    """Antrenează un model pe date simulate și compară costul celor trei variante."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        data_path = os.path.join(tmp_dir, "training_data.csv")
+        df = generate_synthetic_dataset(n_stations=5, years=1)
+        write_training_data(df, data_path)
+        predictor = PM25Predictor(model_path=os.path.join(tmp_dir, "pm25_model.joblib"))
+        predictor.train(data_path)
+
+        X_all = df[predictor.feature_columns].to_numpy(dtype=np.float64)
+        predictor.predict_intervals(X_all[:24])  # compilarea pădurii, o singură dată
+
+        print(
+            f"\n{'rânduri':>8s} | {'punctual (ms)':>13s} | {'intervale (ms)':>14s} | "
+            f"{'naiv per arbore (ms)':>20s} | {'cost interval/punctual':>22s}"
+        )
+        print("-" * 92)
+        for n_rows in [24, 256, 10_000, 100_000]:
+            X = X_all[:n_rows]
+            repeats = 20 if n_rows <= 256 else 3
+            point = time_ms(lambda: predictor.predict_batch(X), repeats)
+            intervals = time_ms(lambda: predictor.predict_intervals(X), repeats)
+            naive = time_ms(lambda: naive_intervals(predictor, X), repeats)
+            print(
+                f"{n_rows:>8,d} | {point:>13.1f} | {intervals:>14.1f} | {naive:>20.1f} | "
+                f"{intervals / point:>21.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Benchmark pentru formatele de stocare ale dataset-ului de antrenare.
+
+Compară CSV, Parquet și Feather: dimensiunea fișierului, timpul de
+încărcare complet și timpul de încărcare cu proiecția folosită de `train`.
+
+Rulare:
+    python benchmarks/bench_storage.py [număr_rânduri]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data_collection import DataCollector
+from src.model import PM25Predictor
+from src.storage import HAS_PYARROW, read_training_data, write_training_data
+
+
+def build_dataset(n_rows: int) -> pd.DataFrame:
+    """Construiește un dataset simulat cu schema completă."""
+    collector = DataCollector()
+    timestamps = pd.Series(pd.date_range("2020-01-01", periods=n_rows, freq="H", tz="UTC"))
+    df = pd.DataFrame(
+        {
+            "timestamp": timestamps,
+            "pm25": np.random.default_rng(0).uniform(5, 150, n_rows),
+            "location": "Simulated Station",
+            "city": collector.city,
+            "country": collector.country,
+        }
+    )
+    return collector._enrich_with_weather(df)
+
+
+def time_load(path: str, columns=None, repeats: int = 3) -> float:
+    """Returnează cel mai bun timp de încărcare din `repeats` încercări."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        read_training_data(path, columns=columns)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    """Rulează benchmark-ul pe toate formatele disponibile."""
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    df = build_dataset(n_rows)
+    projection = PM25Predictor().feature_columns + ["pm25"]
+
+    extensions = [".csv"] + ([".parquet", ".feather"] if HAS_PYARROW else [])
+
+    print(f"\n📊 {n_rows:,} rânduri\n")
+    print(
+        f"{'format':>9s} | {'mărime (MB)':>11s} | {'load complet (s)':>16s} | {'load train (s)':>14s}"
+    )
+    print("-" * 62)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for extension in extensions:
+            path = os.path.join(tmp_dir, f"training_data{extension}")
+            write_training_data(df, path)
+            size_mb = os.path.getsize(path) / 1e6
+            print(
+                f"{extension:>9s} | {size_mb:>11.1f} | {time_load(path):>16.3f} | "
+                f"{time_load(path, projection):>14.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
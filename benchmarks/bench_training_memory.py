@@ -0,0 +1,78 @@
+"""
+Benchmark pentru memoria folosită la antrenare: `train` vs `train_chunked`.
+
+Fiecare mod rulează într-un proces nou, pe același dataset simulat scris
+pe disc, și raportează memoria maximă a procesului (`ru_maxrss`), durata
+și RMSE-ul pe setul de test.
+
+Rulare:
+    python benchmarks/bench_training_memory.py [număr_stații] [ani]
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.model import PM25Predictor, peak_rss_mb
+from src.synthetic import write_synthetic_dataset
+
+
+def measure_child(mode: str, data_path: str, model_dir: str, chunk_rows: int):
+    """Rulează în procesul copil: antrenează și afișează măsurătorile ca JSON."""
+    predictor = PM25Predictor(model_path=os.path.join(model_dir, f"{mode}.joblib"))
+    start = time.perf_counter()
+    if mode == "chunked":
+        predictor.train_chunked(data_path, chunk_rows=chunk_rows)
+    else:
+        predictor.train(data_path)
+    print(
+        json.dumps(
+            {
+                "seconds": time.perf_counter() - start,
+                "peak_rss_mb": peak_rss_mb(),
+                "test_rmse": predictor.metrics["test"]["rmse"],
+            }
+        )
+    )
+
+
+def run_child(mode: str, data_path: str, model_dir: str, chunk_rows: int) -> dict:
+    """Pornește un proces nou pentru un mod de antrenare."""
+    output = subprocess.run(
+        [sys.executable, __file__, "--child", mode, data_path, model_dir, str(chunk_rows)],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main(n_stations: int = 20, years: float = 1, chunk_rows: int = 100_000):
+    """Generează un dataset pe disc și compară cele două moduri de antrenare."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        data_dir = os.path.join(tmp_dir, "data")
+        n_rows = write_synthetic_dataset(data_dir, n_stations, years, stations_per_chunk=5)
+
+        print(f"\n{n_rows:,} rânduri, bucăți de {chunk_rows:,} rânduri")
+        print(
+            f"{'mod':>8s} | {'memorie maximă (MB)':>19s} | {'durată (s)':>10s} | {'RMSE test':>9s}"
+        )
+        print("-" * 56)
+        for mode in ["full", "chunked"]:
+            result = run_child(mode, data_dir, tmp_dir, chunk_rows)
+            print(
+                f"{mode:>8s} | {result['peak_rss_mb']:>19.0f} | "
+                f"{result['seconds']:>10.1f} | {result['test_rmse']:>9.2f}"
+            )
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--child":
+        measure_child(sys.argv[2], sys.argv[3], sys.argv[4], int(sys.argv[5]))
+    else:
+        main(*(float(arg) if i else int(arg) for i, arg in enumerate(sys.argv[1:3])))
@@ -0,0 +1,53 @@
+"""
+Benchmark pentru îmbogățirea cu date meteo a dataset-ului PM2.5.
+
+Compară calea veche (câte un apel `get_weather_data` pentru fiecare rând)
+cu calea vectorizată `get_weather_data_batch`, în modul simulat.
+
+Rulare:
+    python benchmarks/bench_weather_enrichment.py
+"""
+
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data_collection import DataCollector
+
+
+def bench_row_by_row(collector: DataCollector, timestamps: pd.Series) -> float:
+    """Returnează rânduri/secundă pentru îmbogățirea rând cu rând."""
+    start = time.perf_counter()
+    records = [collector._generate_synthetic_weather(ts) for ts in timestamps]
+    pd.DataFrame(records)
+    return len(timestamps) / (time.perf_counter() - start)
+
+
+def bench_batch(collector: DataCollector, timestamps: pd.Series) -> float:
+    """Returnează rânduri/secundă pentru îmbogățirea vectorizată."""
+    start = time.perf_counter()
+    collector._generate_synthetic_weather_batch(timestamps)
+    return len(timestamps) / (time.perf_counter() - start)
+
+
+def main():
+    """Rulează benchmark-ul pentru mai multe dimensiuni de dataset."""
+    collector = DataCollector()
+
+    print(
+        f"{'rânduri':>10s} | {'rând cu rând (r/s)':>20s} | {'vectorizat (r/s)':>18s} | {'speedup':>8s}"
+    )
+    print("-" * 66)
+    for n_rows in [1_000, 10_000, 100_000]:
+        timestamps = pd.Series(pd.date_range("2025-01-01", periods=n_rows, freq="H"))
+        slow = bench_row_by_row(collector, timestamps)
+        fast = bench_batch(collector, timestamps)
+        print(f"{n_rows:>10d} | {slow:>20,.0f} | {fast:>18,.0f} | {fast / slow:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
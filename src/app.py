@@ -22,6 +22,59 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.data_collection import DataCollector
 from src.model import PM25Predictor
+from src.model_artifacts import current_revision
+from src.model_registry import HotSwapPredictor, ModelRegistry
+from src.prediction_cache import PredictionCache
+
+# Cache pentru răspunsurile API, refolosit între click-uri
+HTTP_CACHE_DIR = os.getenv('HTTP_CACHE_DIR', 'data/http_cache')
+
+# Registry de modele (`python src/model_registry.py publish`); dacă are o
+# versiune activă, dashboard-ul o urmărește și o înlocuiește la cald
+MODEL_REGISTRY_DIR = os.getenv('MODEL_REGISTRY_DIR', 'models/registry')
+
+
+@st.cache_resource
+def load_predictor(model_version: str) -> PM25Predictor:
+    """
+    Încarcă modelul o singură dată per proces (artefact mapat în memorie),
+    cu un cache de predicții comun tuturor sesiunilor.
+    
+    `model_version` identifică ce se încarcă efectiv (vezi `current_model_version`),
+    deci un model reantrenat este reîncărcat automat.
+    """
+    predictor = PM25Predictor(use_mmap=True, engine='compiled',
+                              prediction_cache=PredictionCache())
+    predictor.load_model()
+    return predictor
+
+
+@st.cache_resource
+def load_hot_swap_predictor() -> HotSwapPredictor:
+    """Predictor comun tuturor sesiunilor, actualizat în fundal la fiecare publicare."""
+    return HotSwapPredictor(ModelRegistry(MODEL_REGISTRY_DIR), use_mmap=True, engine='compiled',
+                            prediction_cache_factory=PredictionCache)
+
+
+def current_model_version() -> str:
+    """
+    Revizia activă a artefactului `.mmap` sau, fără artefact, data fișierului joblib.
+
+    Artefactul este scris separat de fișierul joblib, deci data joblib-ului
+    nu garantează că artefactul încărcat este cel nou.
+    """
+    predictor = PM25Predictor()
+    revision = current_revision(predictor.mmap_path)
+    if revision is not None:
+        return revision
+    return str(os.path.getmtime(predictor.model_path))
+
+
+def get_predictor():
+    """Versiunea activă din registry, altfel modelul din `models/`."""
+    if ModelRegistry(MODEL_REGISTRY_DIR).current_version() is not None:
+        return load_hot_swap_predictor()
+    return load_predictor(current_model_version())
 
 
 # Configurare pagină
@@ -78,6 +131,26 @@ def plot_24h_prediction(predictions_df: pd.DataFrame):
     """Creează grafic pentru predicția pe 24h."""
     fig = go.Figure()
     
+    # Banda p10–p90 (dacă modelul o oferă)
+    if {'pm25_p10', 'pm25_p90'} <= set(predictions_df.columns):
+        fig.add_trace(go.Scatter(
+            x=predictions_df['timestamp'],
+            y=predictions_df['pm25_p90'],
+            mode='lines',
+            line=dict(width=0),
+            showlegend=False,
+            hoverinfo='skip'
+        ))
+        fig.add_trace(go.Scatter(
+            x=predictions_df['timestamp'],
+            y=predictions_df['pm25_p10'],
+            mode='lines',
+            line=dict(width=0),
+            fill='tonexty',
+            fillcolor='rgba(31, 119, 180, 0.2)',
+            name='Interval p10–p90'
+        ))
+    
     # Linie predicție
     fig.add_trace(go.Scatter(
         x=predictions_df['timestamp'],
@@ -199,15 +272,14 @@ def main():
                 with st.spinner("Se încarcă modelul și se generează predicții..."):
                     try:
                         # Inițializează predictor și collector
-                        predictor = PM25Predictor()
-                        predictor.load_model()
-                        collector = DataCollector()
+                        predictor = get_predictor()
+                        collector = DataCollector(cache_dir=HTTP_CACHE_DIR)
                         
                         # Obține date meteo curente
                         current_weather = collector.get_weather_data(datetime.now())
                         
                         # Generează predicții
-                        predictions_df = predictor.predict_next_24h(current_weather)
+                        predictions_df = predictor.predict_next_24h(current_weather, intervals=True)
                         
                         # Salvează în session state
                         st.session_state['predictions'] = predictions_df
@@ -277,7 +349,7 @@ def main():
         if st.button("📥 Încarcă Date Istorice"):
             with st.spinner("Se colectează date..."):
                 try:
-                    collector = DataCollector()
+                    collector = DataCollector(cache_dir=HTTP_CACHE_DIR)
                     historical_df = collector.get_air_quality_data(days=days)
                     
                     st.session_state['historical_data'] = historical_df
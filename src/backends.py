@@ -0,0 +1,81 @@
+"""
+Backend-uri de estimator pentru modelul PM2.5.
+
+Funcționalități:
+- `random_forest`: `RandomForestRegressor` pe features standardizate;
+  singurul backend compatibil cu motorul compilat, artefactul `.mmap`,
+  compactarea, antrenarea pe bucăți și căutarea de hiperparametri
+- `hist_gradient_boosting`: `HistGradientBoostingRegressor`, care împarte
+  fiecare feature în cel mult 255 de intervale (binning) și nu are nevoie
+  de `StandardScaler`; antrenare mult mai rapidă pe milioane de rânduri
+"""
+
+from typing import Dict, Optional
+
+from sklearn.ensemble import HistGradientBoostingRegressor, RandomForestRegressor
+
+# Parametrii impliciți ai pădurii (suprascriși de `tune`)
+DEFAULT_FOREST_PARAMS = {
+    "n_estimators": 100,
+    "max_depth": 15,
+    "min_samples_split": 5,
+    "min_samples_leaf": 2,
+}
+
+# Parametrii impliciți pentru gradient boosting cu histograme
+DEFAULT_HIST_GB_PARAMS = {
+    "max_iter": 300,
+    "learning_rate": 0.1,
+    "max_leaf_nodes": 63,
+    "min_samples_leaf": 20,
+    "early_stopping": False,
+}
+
+BACKENDS = {
+    "random_forest": {
+        "name": "Random Forest Regressor",
+        "estimator": RandomForestRegressor,
+        "params": DEFAULT_FOREST_PARAMS,
+        "scaled": True,
+    },
+    "hist_gradient_boosting": {
+        "name": "Histogram Gradient Boosting Regressor",
+        "estimator": HistGradientBoostingRegressor,
+        "params": DEFAULT_HIST_GB_PARAMS,
+        "scaled": False,
+    },
+}
+
+
+def _check_backend(backend: str):
+    if backend not in BACKENDS:
+        raise ValueError(f"Backend necunoscut: {backend} (disponibile: {list(BACKENDS)})")
+
+
+def default_params(backend: str) -> Dict:
+    """Parametrii impliciți ai unui backend (copie)."""
+    _check_backend(backend)
+    return dict(BACKENDS[backend]["params"])
+
+
+def uses_scaler(backend: str) -> bool:
+    """True dacă backend-ul primește features standardizate."""
+    _check_backend(backend)
+    return BACKENDS[backend]["scaled"]
+
+
+def build_estimator(backend: str, params: Optional[Dict] = None, n_jobs: int = -1):
+    """
+    Construiește estimatorul (neantrenat) al unui backend.
+
+    Args:
+        backend: Numele backend-ului (cheie din `BACKENDS`)
+        params: Parametrii estimatorului (implicit cei ai backend-ului)
+        n_jobs: Numărul de thread-uri pentru pădure (gradient boosting
+            folosește OpenMP, limitat prin `OMP_NUM_THREADS`)
+    """
+    _check_backend(backend)
+    kwargs = dict(default_params(backend) if params is None else params, random_state=42)
+    if backend == "random_forest":
+        kwargs["n_jobs"] = n_jobs
+    return BACKENDS[backend]["estimator"](**kwargs)
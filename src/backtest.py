@@ -0,0 +1,295 @@
+"""
+Backtest cu origine mobilă (rolling-origin) pentru modelul PM2.5.
+
+Funcționalități:
+- Reluarea istoricului: la fiecare moment de tăiere (cutoff) modelul este
+  reantrenat doar pe trecut și evaluat pe următoarele `horizon_hours` ore
+- Fold-urile rulează în paralel, pe un pool de procese
+- Datele sunt scrise o singură dată ca `.npy` și mapate în memorie de
+  fiecare proces (read-only, partajate prin page cache), fără copii per worker
+- Tabele RMSE/MAE per oră de orizont și per fold
+- Pentru modelele cu features de lag, fereastra este prezisă recursiv per
+  stație (`forecast_recursive`, ca în `predict_next_24h`), pornind de la
+  starea observată la cutoff: PM2.5 din fereastră nu ajunge niciodată în features
+
+Observație: features meteo din fereastra evaluată sunt cele observate, deci
+scorul măsoară modelul, nu și eroarea prognozei meteo.
+"""
+
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import StandardScaler
+
+from src.backends import build_estimator, uses_scaler
+from src.lag_features import HISTORY_HOURS, LAG_FEATURE_COLUMNS, OnlineLagState, forecast_recursive
+
+# Array-urile partajate cu procesele worker (deschise cu mmap_mode='r')
+_shared = {}
+
+
+def _open_shared(data_dir: str):
+    for name in ["X", "y", "hours", "groups"]:
+        path = os.path.join(data_dir, f"{name}.npy")
+        if os.path.exists(path):
+            _shared[name] = np.load(path, mmap_mode="r")
+
+
+def _hour_timestamps(hours: np.ndarray) -> pd.DatetimeIndex:
+    """Ore relative (întregi) ca timestamp-uri, pentru `OnlineLagState`."""
+    return pd.Timestamp(0) + pd.to_timedelta(np.asarray(hours), unit="h")
+
+
+def _forecast_window(
+    predict,
+    cutoff_hour: int,
+    horizon_hours: int,
+    test_start: int,
+    test_stop: int,
+    lag_positions: List[int],
+):
+    """
+    Prezice recursiv fereastra de după `cutoff_hour` pentru fiecare stație.
+
+    Starea fiecărei stații este construită din PM2.5 observat în ultimele
+    `HISTORY_HOURS` ore dinaintea cutoff-ului. O stație fără istoric complet
+    este sărită, iar prognoza ei se oprește la prima oră lipsă din fereastră.
+
+    Returns:
+        Tuple (orizont, valori reale, predicții) pentru orele prezise
+    """
+    X, y, hours, groups = _shared["X"], _shared["y"], _shared["hours"], _shared["groups"]
+    test_groups = np.asarray(groups[test_start:test_stop])
+    series, series_index = np.unique(test_groups, return_inverse=True)
+    steps_of_row = np.asarray(hours[test_start:test_stop]) - cutoff_hour
+
+    window = np.full((horizon_hours, len(series), X.shape[1]), np.nan)
+    actual = np.full((horizon_hours, len(series)), np.nan)
+    window[steps_of_row, series_index] = X[test_start:test_stop]
+    actual[steps_of_row, series_index] = y[test_start:test_stop]
+    present = ~np.isnan(actual)
+    steps = np.where(present.all(axis=0), horizon_hours, present.argmin(axis=0))
+
+    history_start = np.searchsorted(hours, cutoff_hour - HISTORY_HOURS)
+    history_groups = np.asarray(groups[history_start:test_start])
+    history_hours = _hour_timestamps(hours[history_start:test_start])
+    history_values = np.asarray(y[history_start:test_start])
+    last_hour = _hour_timestamps([cutoff_hour - 1])[0]
+    states = []
+    for i, group in enumerate(series):
+        state = OnlineLagState()
+        for row in np.flatnonzero(history_groups == group):
+            state.update(history_hours[row], history_values[row])
+        if not state.is_ready or state.last_hour != last_hour:
+            steps[i] = 0
+        states.append(state)
+
+    timestamps = _hour_timestamps(cutoff_hour + np.arange(horizon_hours))
+    predicted = forecast_recursive(predict, window, timestamps, states, lag_positions, steps)
+    scored = np.arange(horizon_hours)[:, None] < steps[None, :]
+    horizon = np.broadcast_to(np.arange(1, horizon_hours + 1)[:, None], scored.shape)
+    return horizon[scored], actual[scored], predicted[scored]
+
+
+def _run_fold(
+    cutoff_hour: int,
+    horizon_hours: int,
+    train_hours: Optional[int],
+    params: Dict,
+    backend: str,
+    lag_positions: Optional[List[int]] = None,
+) -> Dict:
+    """
+    Antrenează pe rândurile dinaintea `cutoff_hour` și prezice fereastra următoare.
+
+    Rândurile sunt sortate după timp, deci ambele seturi sunt felii contigue
+    ale array-urilor mapate. Cu `lag_positions`, fereastra este prezisă
+    recursiv (vezi `_forecast_window`), nu din lag-urile observate. Un fold
+    fără rânduri de antrenare sau de test (pauză în date) nu este evaluat.
+    """
+    start = time.perf_counter()
+    X, y, hours = _shared["X"], _shared["y"], _shared["hours"]
+
+    train_start = 0 if train_hours is None else np.searchsorted(hours, cutoff_hour - train_hours)
+    train_stop = np.searchsorted(hours, cutoff_hour)
+    test_stop = np.searchsorted(hours, cutoff_hour + horizon_hours)
+
+    if train_stop == train_start or test_stop == train_stop:
+        return {
+            "cutoff_hour": cutoff_hour,
+            "train_rows": int(train_stop - train_start),
+            "horizon": np.empty(0, dtype=np.int64),
+            "actual": np.empty(0),
+            "predicted": np.empty(0),
+            "seconds": time.perf_counter() - start,
+        }
+
+    X_train = X[train_start:train_stop]
+    scaler = None
+    if uses_scaler(backend):
+        scaler = StandardScaler()
+        X_train = scaler.fit_transform(X_train)
+    model = build_estimator(backend, params, n_jobs=1)
+    model.fit(X_train, y[train_start:train_stop])
+
+    def predict(X_raw: np.ndarray) -> np.ndarray:
+        X_model = X_raw if scaler is None else scaler.transform(X_raw)
+        return np.maximum(model.predict(X_model), 0)
+
+    if lag_positions is None:
+        horizon = np.asarray(hours[train_stop:test_stop] - cutoff_hour + 1)
+        actual = np.asarray(y[train_stop:test_stop])
+        predictions = predict(X[train_stop:test_stop])
+    else:
+        horizon, actual, predictions = _forecast_window(
+            predict, cutoff_hour, horizon_hours, train_stop, test_stop, lag_positions
+        )
+    return {
+        "cutoff_hour": cutoff_hour,
+        "train_rows": int(train_stop - train_start),
+        "horizon": horizon,
+        "actual": actual,
+        "predicted": predictions,
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def _error_table(df: pd.DataFrame, by: str) -> pd.DataFrame:
+    """RMSE, MAE și numărul de rânduri, grupate după coloana `by`."""
+    errors = df.assign(
+        sq=(df["predicted"] - df["actual"]) ** 2, abs=(df["predicted"] - df["actual"]).abs()
+    )
+    table = errors.groupby(by).agg(rows=("sq", "size"), mse=("sq", "mean"), mae=("abs", "mean"))
+    table["rmse"] = np.sqrt(table.pop("mse"))
+    return table[["rows", "rmse", "mae"]].reset_index()
+
+
+def rolling_origin_backtest(
+    df: pd.DataFrame,
+    feature_columns: List[str],
+    params: Dict,
+    n_folds: int = 8,
+    horizon_hours: int = 24,
+    step_hours: int = 24,
+    train_hours: Optional[int] = None,
+    max_workers: Optional[int] = None,
+    backend: str = "random_forest",
+    lag_features: bool = False,
+) -> Dict[str, pd.DataFrame]:
+    """
+    Rulează backtest-ul cu origine mobilă.
+
+    Ultimul cutoff este ales astfel încât fereastra lui să se termine la
+    ultima oră din date; cutoff-urile anterioare sunt la `step_hours` distanță.
+
+    Args:
+        df: Dataset cu `timestamp`, `pm25` și `feature_columns`
+        feature_columns: Coloanele folosite de model
+        params: Parametrii estimatorului
+        n_folds: Numărul de cutoff-uri
+        horizon_hours: Lungimea ferestrei evaluate după fiecare cutoff
+        step_hours: Distanța dintre cutoff-uri consecutive
+        train_hours: Fereastra de antrenare (implicit: tot istoricul anterior)
+        max_workers: Numărul de procese (implicit: min(fold-uri, CPU-uri))
+        backend: Estimatorul reantrenat la fiecare fold (vezi `backends.BACKENDS`)
+        lag_features: `feature_columns` conțin `LAG_FEATURE_COLUMNS`; fereastra
+            fiecărui fold este prezisă recursiv per stație (`location`)
+
+    Returns:
+        Dicționar cu tabelele `by_horizon` (RMSE/MAE per oră de orizont),
+        `by_fold` (per cutoff) și `predictions` (rând cu rând)
+    """
+    df = df.dropna(subset=feature_columns + ["pm25", "timestamp"]).sort_values("timestamp")
+    origin = df["timestamp"].min().floor("H")
+    hours = ((df["timestamp"] - origin) // pd.Timedelta(hours=1)).to_numpy(dtype=np.int64)
+
+    last_cutoff = int(hours[-1]) + 1 - horizon_hours
+    cutoffs = [last_cutoff - i * step_hours for i in reversed(range(n_folds))]
+    if cutoffs[0] <= hours[0]:
+        raise ValueError(
+            f"Istoric insuficient pentru {n_folds} fold-uri la {step_hours}h distanță "
+            f"({hours[-1] - hours[0] + 1} ore de date)"
+        )
+
+    max_workers = max_workers or min(n_folds, os.cpu_count() or 1)
+    print(
+        f"🔁 Backtest: {n_folds} fold-uri × {horizon_hours}h, {len(df):,} rânduri, "
+        f"{max_workers} procese"
+    )
+
+    results = []
+    with tempfile.TemporaryDirectory() as data_dir:
+        # Datele sunt scrise o dată; fiecare proces le mapează read-only
+        np.save(os.path.join(data_dir, "X.npy"), df[feature_columns].to_numpy(dtype=np.float64))
+        np.save(os.path.join(data_dir, "y.npy"), df["pm25"].to_numpy(dtype=np.float64))
+        np.save(os.path.join(data_dir, "hours.npy"), hours)
+        lag_positions = None
+        if lag_features:
+            np.save(os.path.join(data_dir, "groups.npy"), pd.factorize(df["location"])[0])
+            lag_positions = [feature_columns.index(col) for col in LAG_FEATURE_COLUMNS]
+
+        with ProcessPoolExecutor(
+            max_workers=max_workers, initializer=_open_shared, initargs=(data_dir,)
+        ) as executor:
+            futures = [
+                executor.submit(
+                    _run_fold, cutoff, horizon_hours, train_hours, params, backend, lag_positions
+                )
+                for cutoff in cutoffs
+            ]
+            for future in as_completed(futures):
+                result = future.result()
+                results.append(result)
+                cutoff = origin + pd.Timedelta(hours=result["cutoff_hour"])
+                if not len(result["predicted"]):
+                    print(
+                        f"  ⚠️ Cutoff {cutoff}: fără date de antrenare sau în fereastră, "
+                        f"fold neevaluat"
+                    )
+                    continue
+                print(
+                    f"  ✅ Cutoff {cutoff}: "
+                    f"{result['train_rows']:,} rânduri de antrenare, {result['seconds']:.1f}s"
+                )
+
+    predictions = pd.concat(
+        [
+            pd.DataFrame(
+                {
+                    "cutoff": origin + pd.Timedelta(hours=r["cutoff_hour"]),
+                    "horizon": r["horizon"],
+                    "actual": r["actual"],
+                    "predicted": r["predicted"],
+                }
+            )
+            for r in results
+        ],
+        ignore_index=True,
+    ).sort_values(["cutoff", "horizon"], ignore_index=True)
+
+    # Fold-urile neevaluate rămân în tabel, cu 0 rânduri și erori NaN
+    fold_info = pd.DataFrame(
+        {
+            "cutoff": [origin + pd.Timedelta(hours=r["cutoff_hour"]) for r in results],
+            "train_rows": [r["train_rows"] for r in results],
+            "seconds": [r["seconds"] for r in results],
+        }
+    )
+    by_fold = (
+        fold_info[["cutoff"]]
+        .merge(_error_table(predictions, "cutoff"), on="cutoff", how="left")
+        .merge(fold_info, on="cutoff")
+        .sort_values("cutoff", ignore_index=True)
+    )
+    by_fold["rows"] = by_fold["rows"].fillna(0).astype(int)
+
+    return {
+        "by_horizon": _error_table(predictions, "horizon"),
+        "by_fold": by_fold,
+        "predictions": predictions,
+    }
@@ -0,0 +1,198 @@
+"""
+Compactarea modelului Random Forest pentru producție.
+
+Funcționalități:
+- Selecția celor mai utili arbori (greedy, după RMSE pe un set de validare)
+- Limitarea numărului de frunze per arbore (reconstrucție best-first)
+- Praguri și valori float32
+- Raport pe niveluri de compactare: dimensiune pe disc, timp de încărcare,
+  latența unei prognoze de 24h și RMSE pe setul de test
+"""
+
+import os
+import shutil
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import StandardScaler
+
+from src.model_artifacts import (
+    FlatForest,
+    compile_forest,
+    flatten_forest,
+    load_mmap_artifact,
+    save_mmap_artifact,
+)
+
+# Niveluri de compactare comparate în raport
+COMPACTION_LEVELS = [
+    {"name": "complet", "n_trees": None, "max_leaves": None, "float32": False},
+    {"name": "float32", "n_trees": None, "max_leaves": None, "float32": True},
+    {"name": "50 arbori", "n_trees": 50, "max_leaves": None, "float32": True},
+    {"name": "20 arbori", "n_trees": 20, "max_leaves": None, "float32": True},
+    {"name": "50 arbori, 1024 frunze", "n_trees": 50, "max_leaves": 1024, "float32": True},
+    {"name": "20 arbori, 256 frunze", "n_trees": 20, "max_leaves": 256, "float32": True},
+]
+
+
+def select_trees(
+    forest: FlatForest, X_val: np.ndarray, y_val: np.ndarray, n_trees: int
+) -> List[int]:
+    """
+    Alege greedy `n_trees` arbori: la fiecare pas se adaugă arborele care
+    minimizează RMSE-ul mediei arborilor aleși pe setul de validare.
+
+    Args:
+        forest: Pădurea aplatizată (nescalată)
+        X_val: Features de validare, scalate
+        y_val: Valorile reale de validare
+        n_trees: Numărul de arbori păstrați
+
+    Returns:
+        Indicii arborilor aleși, în ordinea selecției
+    """
+    outputs = forest.predict_trees(X_val)
+    y_val = np.asarray(y_val, dtype=np.float64)[:, None]
+    remaining = np.arange(forest.n_estimators)
+    total = np.zeros((len(outputs), 1))
+    chosen = []
+
+    for k in range(min(n_trees, forest.n_estimators)):
+        errors = (((total + outputs[:, remaining]) / (k + 1) - y_val) ** 2).mean(axis=0)
+        best = int(np.argmin(errors))
+        chosen.append(int(remaining[best]))
+        total += outputs[:, [remaining[best]]]
+        remaining = np.delete(remaining, best)
+
+    return chosen
+
+
+def compact_forest(
+    model,
+    X_val: np.ndarray,
+    y_val: np.ndarray,
+    n_trees: Optional[int] = None,
+    max_leaves: Optional[int] = None,
+    float32: bool = False,
+) -> FlatForest:
+    """
+    Construiește o pădure compactă dintr-un `RandomForestRegressor`.
+
+    Args:
+        model: Pădurea sklearn antrenată
+        X_val, y_val: Set de validare (features scalate) pentru selecția arborilor
+        n_trees: Numărul de arbori păstrați (implicit: toți)
+        max_leaves: Numărul maxim de frunze per arbore
+        float32: Praguri și valori float32
+
+    Returns:
+        `FlatForest` compactă
+    """
+    trees = None
+    if n_trees is not None and n_trees < len(model.estimators_):
+        trees = select_trees(flatten_forest(model, max_leaves=max_leaves), X_val, y_val, n_trees)
+    forest = flatten_forest(model, trees=trees, max_leaves=max_leaves)
+    return forest.to_float32() if float32 else forest
+
+
+def _median_ms(fn, repeats: int = 5) -> float:
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return float(np.median(samples))
+
+
+def _size_bytes(path: str) -> int:
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    return sum(
+        os.path.getsize(os.path.join(root, name))
+        for root, _, names in os.walk(path)
+        for name in names
+    )
+
+
+def compaction_report(
+    model,
+    scaler: StandardScaler,
+    feature_columns: List[str],
+    X_val: np.ndarray,
+    y_val: np.ndarray,
+    X_test: np.ndarray,
+    y_test: np.ndarray,
+    levels: Optional[List[Dict]] = None,
+    joblib_path: Optional[str] = None,
+) -> pd.DataFrame:
+    """
+    Compară nivelurile de compactare ale unui model.
+
+    Fiecare nivel este salvat ca artefact `.mmap` într-un director temporar;
+    timpul de încărcare include citirea completă a array-urilor, iar latența
+    este cea a unei prognoze de 24 de rânduri cu motorul compilat.
+
+    Args:
+        model: Pădurea sklearn antrenată
+        scaler: Scaler-ul modelului
+        feature_columns: Coloanele modelului
+        X_val, y_val: Set de validare (features scalate) pentru selecția arborilor
+        X_test, y_test: Set de test (features scalate) pentru RMSE
+        levels: Nivelurile comparate (implicit `COMPACTION_LEVELS`)
+        joblib_path: Fișierul joblib al modelului, raportat ca referință
+
+    Returns:
+        DataFrame cu câte un rând per nivel: noduri, bytes, load_ms, latency_ms, test_rmse
+    """
+    X_forecast = scaler.inverse_transform(X_test[:24])
+    rows = []
+
+    if joblib_path is not None:
+        predictions = np.maximum(model.predict(X_test), 0)
+        rows.append(
+            {
+                "level": "sklearn (joblib)",
+                "trees": len(model.estimators_),
+                "nodes": sum(estimator.tree_.node_count for estimator in model.estimators_),
+                "bytes": _size_bytes(joblib_path),
+                "load_ms": _median_ms(lambda: joblib.load(joblib_path), repeats=3),
+                "latency_ms": _median_ms(
+                    lambda: model.predict(scaler.transform(X_forecast)), repeats=20
+                ),
+                "test_rmse": float(np.sqrt(np.mean((predictions - y_test) ** 2))),
+            }
+        )
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for level in levels or COMPACTION_LEVELS:
+            forest = compact_forest(
+                model,
+                X_val,
+                y_val,
+                level.get("n_trees"),
+                level.get("max_leaves"),
+                level.get("float32", False),
+            )
+            path = os.path.join(tmp_dir, "model.mmap")
+            save_mmap_artifact(path, forest, scaler, feature_columns, {}, None)
+
+            compiled = compile_forest(forest, scaler)
+            predictions = np.maximum(forest.predict(X_test), 0)
+            rows.append(
+                {
+                    "level": level["name"],
+                    "trees": forest.n_estimators,
+                    "nodes": len(forest.threshold),
+                    "bytes": _size_bytes(path),
+                    "load_ms": _median_ms(lambda: load_mmap_artifact(path, mmap_mode=None)),
+                    "latency_ms": _median_ms(lambda: compiled.predict(X_forecast), repeats=20),
+                    "test_rmse": float(np.sqrt(np.mean((predictions - y_test) ** 2))),
+                }
+            )
+            shutil.rmtree(path)
+
+    return pd.DataFrame(rows)
@@ -5,107 +5,316 @@ Student 1: Berciu Antonio
 Funcționalități:
 - Colectare date PM2.5 din OpenAQ API
 - Colectare date meteo din OpenWeatherMap API
-- Salvare date în format CSV pentru antrenare model
+- Salvare date pentru antrenare model (Parquet/Feather sau CSV)
+- Colectare meteo concurentă, cu conexiuni reutilizate și limitare de rată
+- Colectare PM2.5 paginată, în flux, direct pe disc
+- Cache persistent pentru răspunsurile API (opțional)
+- Actualizare incrementală a dataset-ului pe baza watermark-urilor
+- Date meteo istorice colectate în bloc și aliniate cu merge_asof
+- Instrumentare: timp pe etape, request-uri, bytes, rânduri/s, fallback-uri
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 import pandas as pd
+import numpy as np
 import json
+import math
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional
 import os
+import sys
 from dotenv import load_dotenv
 import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Adaugă directorul părinte la path pentru import module
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.instrumentation import PipelineStats
+from src.rate_limiter import TokenBucket
+from src.response_cache import ResponseCache
+from src.storage import (DEFAULT_TRAINING_PATH, append_training_data, read_training_data,
+                         to_utc_naive, training_data_size, write_training_data)
+from src.synthetic import synthetic_weather
 
 # Încărcare variabile de mediu
 load_dotenv()
 
+WEATHER_COLUMNS = ['temperature', 'humidity', 'pressure', 'wind_speed', 'wind_direction', 'clouds']
+
 
 class DataCollector:
     """Clasă pentru colectarea datelor de calitate a aerului și meteo."""
     
-    def __init__(self):
+    def __init__(self, max_workers: int = 8, cache_dir: Optional[str] = None,
+                 city: Optional[str] = None, country: Optional[str] = None,
+                 lat: Optional[float] = None, lon: Optional[float] = None):
         self.openaq_url = os.getenv('OPENAQ_API_URL', 'https://api.openaq.org/v2')
         self.weather_api_key = os.getenv('WEATHER_API_KEY')
         self.weather_url = os.getenv('WEATHER_API_URL', 'https://api.openweathermap.org/data/2.5')
+        self.weather_history_url = os.getenv('WEATHER_HISTORY_URL',
+                                             'https://history.openweathermap.org/data/2.5')
+        
+        # Locație (implicit din variabilele de mediu)
+        self.city = city or os.getenv('DEFAULT_CITY', 'Bucharest')
+        self.country = country or os.getenv('DEFAULT_COUNTRY', 'RO')
+        self.lat = float(lat if lat is not None else os.getenv('DEFAULT_LAT', '44.4268'))
+        self.lon = float(lon if lon is not None else os.getenv('DEFAULT_LON', '26.1025'))
+        
+        # Sesiune HTTP cu conexiuni keep-alive partajate între thread-uri
+        self.max_workers = max_workers
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=max_workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
         
-        # Locație implicită
-        self.city = os.getenv('DEFAULT_CITY', 'Bucharest')
-        self.country = os.getenv('DEFAULT_COUNTRY', 'RO')
-        self.lat = float(os.getenv('DEFAULT_LAT', '44.4268'))
-        self.lon = float(os.getenv('DEFAULT_LON', '26.1025'))
+        # Limitare de rată conform cotei OpenWeatherMap (apeluri/minut)
+        self.weather_rate_limiter = TokenBucket.per_minute(
+            float(os.getenv('WEATHER_API_CALLS_PER_MINUTE', '60'))
+        )
+        self.weather_fetch_stats = {}
         
-    def get_air_quality_data(self, days: int = 7) -> pd.DataFrame:
+        # Cache pe disc pentru răspunsurile API (dezactivat implicit)
+        cache_dir = cache_dir or os.getenv('HTTP_CACHE_DIR')
+        self.cache = ResponseCache(cache_dir) if cache_dir else None
+        
+        # Statistici de timp și throughput pentru pipeline
+        self.stats = PipelineStats()
+        
+    def _get_json(self, base_url: str, endpoint: str, params: Dict,
+                  rate_limiter: Optional[TokenBucket] = None) -> Dict:
+        """
+        Execută un GET și returnează corpul JSON, trecând prin cache dacă există.
+        
+        Limitatorul de rată este consumat doar pentru request-urile de rețea.
+        """
+        url = f'{base_url}/{endpoint}'
+        before_request = rate_limiter.acquire if rate_limiter is not None else None
+        
+        def on_response(response, seconds):
+            self.stats.record_request(endpoint, len(response.content), seconds)
+        
+        if self.cache is not None:
+            with self.stats.stage('http'):
+                return self.cache.fetch(self.session, url, params, endpoint,
+                                        before_request, on_response)
+        
+        if before_request is not None:
+            before_request()
+        with self.stats.stage('http'):
+            start = time.perf_counter()
+            response = self.session.get(url, params=params)
+            on_response(response, time.perf_counter() - start)
+        response.raise_for_status()
+        with self.stats.stage('json_parse'):
+            return response.json()
+    
+    def get_air_quality_data(self, days: int = 7, since: Optional[datetime] = None,
+                             synthetic_fallback: bool = True) -> pd.DataFrame:
         """
         Colectează date PM2.5 din OpenAQ API.
         
+        Toate paginile rezultatului sunt parcurse, deci nu se mai pierd
+        înregistrările de peste o singură pagină.
+        
         Args:
             days: Numărul de zile în trecut pentru care se colectează date
+            since: Moment de început explicit (UTC); are prioritate față de `days`
+            synthetic_fallback: Dacă False, la eroare sau fără date se întoarce un
+                DataFrame gol în loc de date simulate
             
         Returns:
             DataFrame cu date PM2.5
         """
-        print(f"📡 Colectare date PM2.5 pentru ultimele {days} zile...")
-        
         # Calculează intervalul de date
-        date_to = datetime.utcnow()
-        date_from = date_to - timedelta(days=days)
-        
-        params = {
-            'country': self.country,
-            'city': self.city,
-            'parameter': 'pm25',
-            'date_from': date_from.isoformat(),
-            'date_to': date_to.isoformat(),
-            'limit': 10000
-        }
+        # Rotunjit la oră, pentru chei de cache stabile între apeluri
+        date_to = datetime.utcnow().replace(minute=0, second=0, microsecond=0)
+        if since is not None:
+            date_from = since
+            days = max(1, math.ceil((date_to - date_from).total_seconds() / 86400))
+            print(f"📡 Colectare date PM2.5 începând cu {date_from}...")
+        else:
+            date_from = date_to - timedelta(days=days)
+            print(f"📡 Colectare date PM2.5 pentru ultimele {days} zile...")
         
-        try:
-            response = requests.get(f'{self.openaq_url}/measurements', params=params)
-            response.raise_for_status()
-            data = response.json()
-            
-            if 'results' in data and len(data['results']) > 0:
-                # Extrage datele relevante
-                records = []
-                for measurement in data['results']:
-                    records.append({
-                        'timestamp': measurement['date']['utc'],
-                        'pm25': measurement['value'],
-                        'location': measurement.get('location', 'Unknown'),
-                        'city': measurement.get('city', self.city),
-                        'country': measurement.get('country', self.country)
-                    })
+        with self.stats.stage('collect_pm25'):
+            try:
+                chunks = list(self._iter_openaq_pages(date_from, date_to))
                 
-                df = pd.DataFrame(records)
-                df['timestamp'] = pd.to_datetime(df['timestamp'])
-                df = df.sort_values('timestamp')
-                
-                print(f"✅ Colectate {len(df)} înregistrări PM2.5")
-                return df
-            else:
-                print("⚠️ Nu s-au găsit date PM2.5. Se generează date simulate...")
-                return self._generate_synthetic_pm25_data(days)
+                if chunks:
+                    with self.stats.stage('dataframe'):
+                        df = pd.concat(chunks, ignore_index=True)
+                        df = df.sort_values('timestamp')
+                    
+                    print(f"✅ Colectate {len(df)} înregistrări PM2.5")
+                else:
+                    print("⚠️ Nu s-au găsit date PM2.5.")
+                    df = self._pm25_fallback(days, synthetic_fallback)
+                    
+            except Exception as e:
+                print(f"❌ Eroare la colectarea datelor PM2.5: {e}")
+                df = self._pm25_fallback(days, synthetic_fallback)
+        
+        self.stats.add_rows('collect_pm25', len(df))
+        return df
+    
+    def _measurements_to_frame(self, results: List[Dict]) -> pd.DataFrame:
+        """Transformă o pagină de rezultate OpenAQ în DataFrame."""
+        with self.stats.stage('dataframe'):
+            df = pd.DataFrame({
+                'timestamp': [m['date']['utc'] for m in results],
+                'pm25': [m['value'] for m in results],
+                'location': [m.get('location', 'Unknown') for m in results],
+                'city': [m.get('city', self.city) for m in results],
+                'country': [m.get('country', self.country) for m in results]
+            })
+            df['timestamp'] = pd.to_datetime(df['timestamp'])
+        self.stats.add_rows('dataframe', len(df))
+        return df
+    
+    def _iter_openaq_pages(self, date_from: datetime, date_to: datetime,
+                           page_size: int = 1000, window_days: int = 7) -> Iterator[pd.DataFrame]:
+        """
+        Parcurge paginile `/measurements` pentru intervalul dat.
+        
+        Intervalul este împărțit în ferestre de `window_days` zile, iar fiecare
+        fereastră este paginată cu `limit=page_size`, astfel încât nu se
+        atinge limita de paginare adâncă a API-ului. API-ul include ambele
+        capete ale intervalului, așa că măsurătorile de la sfârșitul unei
+        ferestre sunt păstrate doar de fereastra următoare (ferestre
+        semi-deschise). Erorile HTTP sunt propagate.
+        
+        Yields:
+            DataFrame-uri de cel mult `page_size` rânduri, în ordine cronologică
+        """
+        window_start = date_from
+        while window_start < date_to:
+            window_end = min(window_start + timedelta(days=window_days), date_to)
+            page = 1
+            while True:
+                params = {
+                    'country': self.country,
+                    'city': self.city,
+                    'parameter': 'pm25',
+                    'date_from': window_start.isoformat(),
+                    'date_to': window_end.isoformat(),
+                    'order_by': 'datetime',
+                    'sort': 'asc',
+                    'limit': page_size,
+                    'page': page
+                }
+                results = self._get_json(self.openaq_url, 'measurements', params).get('results', [])
                 
+                if results:
+                    df = self._measurements_to_frame(results)
+                    if window_end < date_to:
+                        df = df[(to_utc_naive(df['timestamp']) < window_end).values]
+                    if not df.empty:
+                        yield df
+                if len(results) < page_size:
+                    break
+                page += 1
+            window_start = window_end
+    
+    def iter_air_quality_chunks(self, days: int = 7, page_size: int = 1000,
+                                window_days: int = 7) -> Iterator[pd.DataFrame]:
+        """
+        Generator care livrează datele PM2.5 pe bucăți de dimensiune limitată.
+        
+        Dacă API-ul nu returnează nimic (sau eșuează înainte de prima pagină),
+        se livrează date simulate, tot pe bucăți de `page_size` rânduri. O
+        eroare apărută după primele bucăți este propagată, ca apelantul să nu
+        trateze un rezultat trunchiat drept complet.
+        
+        Args:
+            days: Numărul de zile în trecut pentru care se colectează date
+            page_size: Numărul maxim de rânduri per bucată
+            window_days: Dimensiunea ferestrei de timp per serie de pagini
+            
+        Yields:
+            DataFrame-uri cu date PM2.5
+        """
+        # Rotunjit la oră, pentru chei de cache stabile între apeluri
+        date_to = datetime.utcnow().replace(minute=0, second=0, microsecond=0)
+        date_from = date_to - timedelta(days=days)
+        
+        yielded = 0
+        try:
+            for chunk in self._iter_openaq_pages(date_from, date_to, page_size, window_days):
+                yielded += len(chunk)
+                yield chunk
         except Exception as e:
             print(f"❌ Eroare la colectarea datelor PM2.5: {e}")
-            print("⚠️ Se generează date simulate...")
-            return self._generate_synthetic_pm25_data(days)
+            if yielded:
+                print(f"⚠️ Colectare întreruptă după {yielded} înregistrări")
+                raise
+        
+        if not yielded:
+            print("⚠️ Nu s-au găsit date PM2.5. Se generează date simulate...")
+            synthetic_df = self._generate_synthetic_pm25_data(days)
+            for start in range(0, len(synthetic_df), page_size):
+                yield synthetic_df.iloc[start:start + page_size]
+    
+    def stream_air_quality_to_csv(self, days: int, output_file: str,
+                                  page_size: int = 1000) -> int:
+        """
+        Scrie datele PM2.5 direct pe disc, bucată cu bucată.
+        
+        Memoria folosită este limitată de `page_size`, indiferent de `days`.
+        Fișierul este scris sub un nume temporar și redenumit doar la final,
+        deci o colectare întreruptă nu lasă un CSV incomplet.
+        
+        Args:
+            days: Numărul de zile în trecut pentru care se colectează date
+            output_file: Calea fișierului CSV de ieșire
+            page_size: Numărul maxim de rânduri ținute în memorie
+            
+        Returns:
+            Numărul total de înregistrări scrise
+        """
+        print(f"📡 Colectare în flux a datelor PM2.5 pentru ultimele {days} zile...")
+        
+        os.makedirs(os.path.dirname(output_file) or '.', exist_ok=True)
+        tmp_file = f'{output_file}.tmp'
+        total = 0
+        try:
+            for chunk in self.iter_air_quality_chunks(days, page_size=page_size):
+                with self.stats.stage('write'):
+                    chunk.to_csv(tmp_file, mode='w' if total == 0 else 'a',
+                                 header=(total == 0), index=False)
+                total += len(chunk)
+                self.stats.add_rows('write', len(chunk))
+        except Exception:
+            if os.path.exists(tmp_file):
+                os.remove(tmp_file)
+            raise
+        if total:
+            os.replace(tmp_file, output_file)
+        
+        print(f"✅ {total} înregistrări PM2.5 scrise în {output_file}")
+        return total
+    
+    def _pm25_fallback(self, days: int, synthetic: bool) -> pd.DataFrame:
+        """Date simulate sau, dacă `synthetic` e False, un DataFrame gol."""
+        if not synthetic:
+            print("⚠️ Nu se generează date simulate.")
+            return pd.DataFrame(columns=['timestamp', 'pm25', 'location', 'city', 'country'])
+        print("⚠️ Se generează date simulate...")
+        return self._generate_synthetic_pm25_data(days)
     
     def _generate_synthetic_pm25_data(self, days: int) -> pd.DataFrame:
         """Generează date PM2.5 simulate pentru testare."""
-        import numpy as np
-        
         # Generează timestamp-uri la fiecare oră
         end_date = datetime.utcnow()
         start_date = end_date - timedelta(days=days)
         timestamps = pd.date_range(start=start_date, end=end_date, freq='H')
         
         # Generează valori PM2.5 realiste (variază între 10-100 μg/m³)
-        np.random.seed(42)
+        rng = np.random.default_rng(42)
         base_pm25 = 30
         pm25_values = base_pm25 + 20 * np.sin(np.arange(len(timestamps)) * 2 * np.pi / 24) + \
-                      np.random.normal(0, 10, len(timestamps))
+                      rng.normal(0, 10, len(timestamps))
         pm25_values = np.clip(pm25_values, 5, 150)
         
         df = pd.DataFrame({
@@ -115,6 +324,7 @@ class DataCollector:
             'city': self.city,
             'country': self.country
         })
+        self.stats.record_fallback('pm25', len(df))
         
         return df
     
@@ -140,9 +350,7 @@ class DataCollector:
                 'units': 'metric'
             }
             
-            response = requests.get(f'{self.weather_url}/weather', params=params)
-            response.raise_for_status()
-            data = response.json()
+            data = self._get_json(self.weather_url, 'weather', params, self.weather_rate_limiter)
             
             return {
                 'temperature': data['main']['temp'],
@@ -155,12 +363,11 @@ class DataCollector:
             
         except Exception as e:
             print(f"⚠️ Eroare API meteo: {e}. Se folosesc date simulate.")
+            self.stats.record_fallback('weather')
             return self._generate_synthetic_weather(timestamp)
     
     def _generate_synthetic_weather(self, timestamp: datetime) -> Dict:
         """Generează date meteo simulate realiste."""
-        import numpy as np
-        
         hour = timestamp.hour
         day_of_year = timestamp.timetuple().tm_yday
         
@@ -192,14 +399,257 @@ class DataCollector:
             'clouds': round(clouds, 2)
         }
     
-    def create_training_dataset(self, days: int = 30, output_file: str = 'data/training_data.csv'):
+    def _generate_synthetic_weather_batch(self, timestamps: pd.Series,
+                                          rng: Optional[np.random.Generator] = None) -> pd.DataFrame:
+        """
+        Generează date meteo simulate pentru o coloană întreagă de timestamp-uri.
+
+        Varianta vectorizată a `_generate_synthetic_weather`: aceleași formule,
+        dar toate valorile sunt generate într-un singur apel NumPy.
+
+        Args:
+            timestamps: Serie (sau index) de timestamp-uri
+            rng: Generator NumPy opțional (pentru reproductibilitate)
+
+        Returns:
+            DataFrame cu date meteo, câte un rând pentru fiecare timestamp
+        """
+        if rng is None:
+            rng = np.random.default_rng()
+
+        return synthetic_weather(timestamps, rng)
+
+    def get_weather_data_batch(self, timestamps: pd.Series) -> pd.DataFrame:
+        """
+        Colectează date meteo pentru o coloană întreagă de timestamp-uri.
+
+        În modul simulat datele sunt generate vectorizat. În modul API se
+        folosește calea în bloc (`get_weather_data_asof`); dacă API-ul istoric
+        nu este disponibil (plan fără acces istoric), se folosesc date simulate,
+        înregistrate ca fallback. Condițiile curente (`/weather`) nu sunt
+        folosite niciodată pentru ore trecute.
+
+        Args:
+            timestamps: Serie de timestamp-uri
+
+        Returns:
+            DataFrame cu date meteo, aliniat pozițional cu `timestamps`
+        """
+        with self.stats.stage('enrich_weather'):
+            if not self.weather_api_key or self.weather_api_key == 'your_api_key_here':
+                self.stats.record_fallback('weather', len(timestamps))
+                weather_df = self._generate_synthetic_weather_batch(timestamps)
+            else:
+                try:
+                    weather_df = self.get_weather_data_asof(timestamps)
+                except Exception as e:
+                    print(f"⚠️ API meteo istoric indisponibil ({e}). Se folosesc date simulate.")
+                    self.stats.record_fallback('weather', len(timestamps))
+                    weather_df = self._generate_synthetic_weather_batch(timestamps)
+        
+        self.stats.add_rows('enrich_weather', len(weather_df))
+        return weather_df
+
+    @staticmethod
+    def _parse_weather_list(items: List[Dict]) -> pd.DataFrame:
+        """Transformă lista `list` din răspunsurile history/forecast în DataFrame."""
+        return pd.DataFrame({
+            'timestamp': pd.to_datetime([item['dt'] for item in items], unit='s'),
+            'temperature': [item['main']['temp'] for item in items],
+            'humidity': [item['main']['humidity'] for item in items],
+            'pressure': [item['main']['pressure'] for item in items],
+            'wind_speed': [item['wind']['speed'] for item in items],
+            'wind_direction': [item['wind'].get('deg', 0) for item in items],
+            'clouds': [item.get('clouds', {}).get('all', 0) for item in items]
+        })
+
+    def get_weather_range(self, start: datetime, end: datetime,
+                          chunk_days: int = 7) -> pd.DataFrame:
+        """
+        Colectează date meteo orare pentru un interval, în câteva apeluri în bloc.
+
+        Partea din trecut vine din API-ul istoric (`history/city`, câte un
+        apel la `chunk_days` zile, în paralel pe `max_workers` thread-uri și
+        limitat de `weather_rate_limiter`); partea din viitor, dacă există,
+        din prognoza `/forecast` (pas de 3 ore).
+
+        Args:
+            start: Începutul intervalului (UTC)
+            end: Sfârșitul intervalului (UTC)
+            chunk_days: Numărul de zile per apel istoric
+
+        Returns:
+            DataFrame sortat după `timestamp` (UTC fără fus orar) cu coloanele meteo
+        """
+        start = pd.Timestamp(start)
+        end = pd.Timestamp(end)
+        now = pd.Timestamp.utcnow().tz_localize(None)
+        base_params = {
+            'lat': self.lat,
+            'lon': self.lon,
+            'appid': self.weather_api_key,
+            'units': 'metric'
+        }
+
+        history_end = min(end, now)
+        windows = []
+        chunk_start = start
+        while chunk_start < history_end:
+            chunk_end = min(chunk_start + pd.Timedelta(days=chunk_days), history_end)
+            windows.append((chunk_start, chunk_end))
+            chunk_start = chunk_end
+
+        def fetch_history(window) -> pd.DataFrame:
+            params = dict(base_params, type='hour',
+                          start=int(window[0].timestamp()), end=int(window[1].timestamp()))
+            data = self._get_json(self.weather_history_url, 'history/city', params,
+                                  self.weather_rate_limiter)
+            return self._parse_weather_list(data.get('list', []))
+
+        fetch_start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            frames = list(executor.map(fetch_history, windows))
+        elapsed = time.perf_counter() - fetch_start
+        self.weather_fetch_stats = {
+            'requests': len(windows),
+            'elapsed_seconds': elapsed,
+            'requests_per_second': len(windows) / elapsed if elapsed > 0 else 0.0
+        }
+
+        if end > now:
+            data = self._get_json(self.weather_url, 'forecast', base_params,
+                                  self.weather_rate_limiter)
+            frames.append(self._parse_weather_list(data.get('list', [])))
+
+        if not frames:
+            return self._parse_weather_list([])
+
+        weather_df = pd.concat(frames, ignore_index=True)
+        return weather_df.drop_duplicates('timestamp').sort_values('timestamp').reset_index(drop=True)
+
+    def get_weather_data_asof(self, timestamps: pd.Series, tolerance: str = '90min') -> pd.DataFrame:
+        """
+        Aliniază datele meteo în bloc la timestamp-uri cu un as-of join sortat.
+
+        Numărul de request-uri depinde de lungimea intervalului, nu de numărul
+        de rânduri. Rândurile fără o observație meteo în `tolerance` sunt
+        completate cu date simulate.
+
+        Args:
+            timestamps: Serie de timestamp-uri
+            tolerance: Distanța maximă față de cea mai apropiată observație meteo
+
+        Returns:
+            DataFrame cu date meteo, aliniat pozițional cu `timestamps`
+        """
+        tolerance = pd.Timedelta(tolerance)
+        left = pd.DataFrame({
+            'timestamp': to_utc_naive(pd.Series(timestamps)).values,
+            '_position': np.arange(len(timestamps))
+        }).sort_values('timestamp')
+
+        weather_df = self.get_weather_range(left['timestamp'].iloc[0] - tolerance,
+                                            left['timestamp'].iloc[-1] + tolerance)
+        if weather_df.empty:
+            raise ValueError("API-ul nu a returnat date meteo pentru interval")
+
+        weather_df['timestamp'] = weather_df['timestamp'].astype(left['timestamp'].dtype)
+        merged = pd.merge_asof(left, weather_df, on='timestamp',
+                               direction='nearest', tolerance=tolerance)
+        merged = merged.sort_values('_position').reset_index(drop=True)
+
+        missing = merged['temperature'].isna().to_numpy()
+        if missing.any():
+            print(f"⚠️ {missing.sum()} rânduri fără date meteo în toleranță. "
+                  f"Se folosesc date simulate.")
+            self.stats.record_fallback('weather', missing.sum())
+            synthetic_df = self._generate_synthetic_weather_batch(
+                pd.Series(pd.DatetimeIndex(timestamps)[missing])
+            )
+            merged.loc[missing, WEATHER_COLUMNS] = synthetic_df[WEATHER_COLUMNS].values
+
+        return merged[WEATHER_COLUMNS]
+
+    def _enrich_with_weather(self, pm25_df: pd.DataFrame) -> pd.DataFrame:
+        """Adaugă date meteo și features temporale la datele PM2.5."""
+        # Adaugă date meteo pentru toate timestamp-urile într-un singur apel
+        print("\n🌤️ Colectare date meteo...")
+        weather_df = self.get_weather_data_batch(pm25_df['timestamp'])
+        
+        with self.stats.stage('dataframe'):
+            # Combină datele
+            combined_df = pd.concat([pm25_df.reset_index(drop=True), weather_df], axis=1)
+            
+            # Adaugă features temporale
+            combined_df['hour'] = combined_df['timestamp'].dt.hour
+            combined_df['day_of_week'] = combined_df['timestamp'].dt.dayofweek
+            combined_df['month'] = combined_df['timestamp'].dt.month
+        
+        return combined_df
+    
+    @staticmethod
+    def _watermark_path(output_file: str) -> str:
+        """Calea fișierului cu watermark-uri asociat unui dataset."""
+        return os.path.splitext(output_file)[0] + '_watermarks.json'
+    
+    def _compute_watermarks(self, df: pd.DataFrame) -> Dict[str, str]:
+        """Ultimul timestamp (UTC) pentru fiecare pereche oraș/locație."""
+        keys = df['city'].astype(str) + '|' + df['location'].astype(str)
+        latest = to_utc_naive(df['timestamp']).groupby(keys.values).max()
+        return {key: ts.isoformat() for key, ts in latest.items()}
+    
+    def _load_watermarks(self, output_file: str) -> Dict[str, str]:
+        """
+        Încarcă watermark-urile unui dataset.
+        
+        Dacă fișierul de watermark-uri lipsește sau nu corespunde dimensiunii
+        dataset-ului (ex: întrerupere între scriere și salvarea watermark-urilor),
+        acestea sunt recalculate din dataset, ca să nu apară duplicate.
+        """
+        if not os.path.exists(output_file):
+            return {}
+        
+        watermark_path = self._watermark_path(output_file)
+        if os.path.exists(watermark_path):
+            with open(watermark_path, 'r') as f:
+                state = json.load(f)
+            if state.get('store_size') == training_data_size(output_file):
+                return state['watermarks']
+        
+        print(f"⚠️ Watermark-uri lipsă sau desincronizate. Se recalculează din {output_file}")
+        existing = read_training_data(output_file, columns=['timestamp', 'location', 'city'])
+        return self._compute_watermarks(existing)
+    
+    def _save_watermarks(self, output_file: str, watermarks: Dict[str, str]):
+        """Salvează atomic watermark-urile împreună cu dimensiunea dataset-ului."""
+        watermark_path = self._watermark_path(output_file)
+        state = {
+            'watermarks': watermarks,
+            'store_size': training_data_size(output_file),
+            'updated_at': datetime.utcnow().isoformat()
+        }
+        tmp_path = watermark_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(state, f, indent=2)
+        os.replace(tmp_path, watermark_path)
+    
+    def create_training_dataset(self, days: int = 30, output_file: str = DEFAULT_TRAINING_PATH,
+                                incremental: bool = False, csv_export: Optional[str] = None):
         """
         Creează un dataset complet pentru antrenarea modelului.
         
         Args:
             days: Numărul de zile de date de colectat
-            output_file: Calea fișierului de ieșire
+            output_file: Calea fișierului de ieșire (formatul este dat de extensie:
+                .parquet, .feather sau .csv)
+            incremental: Dacă True, adaugă doar înregistrările noi la dataset-ul
+                existent (vezi `update_training_dataset`)
+            csv_export: Cale opțională pentru o copie CSV a dataset-ului
         """
+        if incremental:
+            return self.update_training_dataset(days, output_file)
+        
+        self.stats.reset()
         print(f"\n🚀 Creare dataset de antrenare pentru {days} zile...\n")
         
         # Colectează date PM2.5
@@ -209,42 +659,96 @@ class DataCollector:
             print("❌ Nu s-au putut colecta date PM2.5")
             return
         
-        # Adaugă date meteo pentru fiecare timestamp
-        print("\n🌤️ Colectare date meteo...")
-        weather_data = []
-        
-        total = len(pm25_df)
-        for idx, row in pm25_df.iterrows():
-            if idx % 50 == 0:
-                print(f"  Progres: {idx}/{total} înregistrări")
-            
-            weather = self.get_weather_data(row['timestamp'])
-            weather_data.append(weather)
-            
-            # Pauză pentru a evita limitele API
-            if self.weather_api_key and self.weather_api_key != 'your_api_key_here':
-                time.sleep(0.1)
-        
-        # Combină datele
-        weather_df = pd.DataFrame(weather_data)
-        combined_df = pd.concat([pm25_df.reset_index(drop=True), weather_df], axis=1)
-        
-        # Adaugă features temporale
-        combined_df['hour'] = combined_df['timestamp'].dt.hour
-        combined_df['day_of_week'] = combined_df['timestamp'].dt.dayofweek
-        combined_df['month'] = combined_df['timestamp'].dt.month
+        combined_df = self._enrich_with_weather(pm25_df)
         
         # Salvează dataset
-        os.makedirs(os.path.dirname(output_file), exist_ok=True)
-        combined_df.to_csv(output_file, index=False)
+        with self.stats.stage('write'):
+            write_training_data(combined_df, output_file)
+            self._save_watermarks(output_file, self._compute_watermarks(combined_df))
+            if csv_export:
+                write_training_data(combined_df, csv_export)
+        self.stats.add_rows('write', len(combined_df))
         
         print(f"\n✅ Dataset salvat: {output_file}")
+        if csv_export:
+            print(f"📤 Export CSV: {csv_export}")
         print(f"📊 Total înregistrări: {len(combined_df)}")
         print(f"📅 Interval: {combined_df['timestamp'].min()} -> {combined_df['timestamp'].max()}")
         print(f"\n📈 Statistici PM2.5:")
         print(combined_df['pm25'].describe())
+        self._report_stats('create_training_dataset', output_file)
         
         return combined_df
+    
+    def update_training_dataset(self, days: int = 30,
+                                output_file: str = DEFAULT_TRAINING_PATH) -> pd.DataFrame:
+        """
+        Actualizează incremental dataset-ul de antrenare.
+        
+        Colectează doar măsurătorile mai noi decât ultimul timestamp salvat
+        pentru fiecare oraș/locație, le îmbogățește cu date meteo și le adaugă
+        la sfârșitul dataset-ului. Rularea repetată nu produce duplicate.
+        
+        Colectarea pornește de la cel mai vechi watermark, dar nu mai devreme
+        de `days` zile în urmă: o stație dezafectată sau inactivă nu forțează
+        re-descărcarea întregului istoric la fiecare rulare.
+        
+        Args:
+            days: Fereastra folosită dacă dataset-ul nu există încă și limita
+                de timp în urmă a unei actualizări
+            output_file: Calea dataset-ului
+            
+        Returns:
+            DataFrame cu înregistrările adăugate
+        """
+        watermarks = self._load_watermarks(output_file)
+        if not watermarks:
+            print(f"ℹ️ Nu există dataset în {output_file}. Se creează complet.")
+            return self.create_training_dataset(days, output_file)
+        
+        self.stats.reset()
+        window_start = pd.Timestamp(datetime.utcnow() - timedelta(days=days))
+        since = max(min(pd.Timestamp(ts) for ts in watermarks.values()), window_start)
+        print(f"\n🔄 Actualizare incrementală dataset (colectare începând cu {since})...\n")
+        
+        # Datele simulate nu sunt adăugate: ar avansa watermark-urile peste ore
+        # pentru care măsurătorile reale nu au fost încă colectate
+        pm25_df = self.get_air_quality_data(days, since=since.to_pydatetime(),
+                                            synthetic_fallback=False)
+        if pm25_df.empty:
+            print("⚠️ Fără date reale noi. Dataset-ul și watermark-urile rămân neschimbate.")
+            self._report_stats('update_training_dataset', output_file)
+            return pm25_df
+        
+        # Păstrează doar rândurile mai noi decât watermark-ul locației lor
+        keys = pm25_df['city'].astype(str) + '|' + pm25_df['location'].astype(str)
+        timestamps = to_utc_naive(pm25_df['timestamp'])
+        limits = pd.to_datetime(keys.map(watermarks))
+        is_new = limits.isna() | (timestamps > limits)
+        new_df = pm25_df[is_new.values].drop_duplicates(subset=['timestamp', 'location', 'city'])
+        
+        if new_df.empty:
+            print("✅ Dataset-ul este deja la zi")
+            self._report_stats('update_training_dataset', output_file)
+            return new_df
+        
+        combined_df = self._enrich_with_weather(new_df)
+        
+        with self.stats.stage('write'):
+            append_training_data(combined_df, output_file)
+            watermarks.update(self._compute_watermarks(combined_df))
+            self._save_watermarks(output_file, watermarks)
+        self.stats.add_rows('write', len(combined_df))
+        
+        print(f"\n✅ {len(combined_df)} înregistrări noi adăugate în {output_file}")
+        self._report_stats('update_training_dataset', output_file)
+        return combined_df
+    
+    def _report_stats(self, event: str, output_file: str):
+        """Afișează rezumatul instrumentării și îl emite ca linie JSON în log."""
+        print("\n⏱️ Instrumentare pipeline:")
+        print(self.stats.summary())
+        self.stats.log(event, {'city': self.city, 'output_file': output_file})
 
 
 def main():
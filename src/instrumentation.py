@@ -0,0 +1,115 @@
+"""
+Instrumentare pentru pipeline-ul de colectare date.
+
+Funcționalități:
+- Cronometre pe etape (HTTP, parsare JSON, construire DataFrame, scriere)
+- Contoare de request-uri și bytes primiți, per endpoint
+- Rânduri/secundă per etapă
+- Contoare pentru revenirile la date simulate
+- Export ca dicționar / linie JSON pentru comparare între rulări
+"""
+
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class PipelineStats:
+    """Statistici de timp și throughput, sigure pentru utilizare din mai multe thread-uri."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Resetează toate contoarele."""
+        with self._lock:
+            self.started_at = datetime.utcnow().isoformat()
+            self.stages = {}
+            self.requests = {}
+            self.fallbacks = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        """
+        Cronometrează un bloc de cod și adaugă durata la etapa `name`.
+
+        Etapele pot fi imbricate (ex: `http` în interiorul `collect_pm25`),
+        deci duratele lor nu se însumează la timpul total.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                record = self.stages.setdefault(name, {"seconds": 0.0, "calls": 0, "rows": 0})
+                record["seconds"] += elapsed
+                record["calls"] += 1
+
+    def add_rows(self, name: str, rows: int):
+        """Adaugă numărul de rânduri procesate de o etapă."""
+        with self._lock:
+            record = self.stages.setdefault(name, {"seconds": 0.0, "calls": 0, "rows": 0})
+            record["rows"] += int(rows)
+
+    def record_request(self, endpoint: str, n_bytes: int, seconds: float):
+        """Înregistrează un request HTTP efectuat."""
+        with self._lock:
+            record = self.requests.setdefault(endpoint, {"count": 0, "bytes": 0, "seconds": 0.0})
+            record["count"] += 1
+            record["bytes"] += int(n_bytes)
+            record["seconds"] += seconds
+
+    def record_fallback(self, kind: str, rows: int = 1):
+        """Înregistrează rânduri generate simulat în locul datelor reale."""
+        with self._lock:
+            self.fallbacks[kind] = self.fallbacks.get(kind, 0) + int(rows)
+
+    def to_dict(self) -> Dict:
+        """Returnează statisticile ca dicționar serializabil JSON."""
+        with self._lock:
+            stages = {}
+            for name, record in self.stages.items():
+                stages[name] = dict(record)
+                if record["rows"] and record["seconds"] > 0:
+                    stages[name]["rows_per_second"] = record["rows"] / record["seconds"]
+
+            return {
+                "started_at": self.started_at,
+                "stages": stages,
+                "requests": {name: dict(record) for name, record in self.requests.items()},
+                "total_requests": sum(r["count"] for r in self.requests.values()),
+                "bytes_received": sum(r["bytes"] for r in self.requests.values()),
+                "fallbacks": dict(self.fallbacks),
+            }
+
+    def log(self, event: str = "pipeline_stats", extra: Optional[Dict] = None):
+        """Emite statisticile ca o singură linie JSON prin `logging`."""
+        payload = dict(self.to_dict(), event=event, **(extra or {}))
+        logger.info(json.dumps(payload, default=str))
+
+    def summary(self) -> str:
+        """Tabel text cu duratele și throughput-ul fiecărei etape."""
+        stats = self.to_dict()
+        lines = [
+            f"{'etapă':<24s} {'apeluri':>8s} {'secunde':>9s} {'rânduri':>9s} {'rânduri/s':>11s}"
+        ]
+        for name, record in stats["stages"].items():
+            rate = record.get("rows_per_second")
+            lines.append(
+                f"{name:<24s} {record['calls']:>8d} {record['seconds']:>9.3f} "
+                f"{record['rows']:>9d} {(f'{rate:,.0f}' if rate else '-'):>11s}"
+            )
+        lines.append(
+            f"requests: {stats['total_requests']}, "
+            f"bytes: {stats['bytes_received']:,}, "
+            f"fallback simulat: {stats['fallbacks'] or '-'}"
+        )
+        return "\n".join(lines)
@@ -0,0 +1,266 @@
+"""
+Features de lag și ferestre mobile pentru PM2.5, per stație.
+
+Funcționalități:
+- Lag-uri (PM2.5 de acum 1, 2, 3, 6, 12, 24 ore), medii și maxime pe
+  ferestre mobile și medii exponențiale (EWM), calculate doar din trecut
+- Varianta de antrenare (`add_lag_features`) este vectorizată: o singură
+  sortare după stație și timp, apoi deplasări și ferestre pe tot array-ul
+- Varianta online (`OnlineLagState`) produce aceleași valori pentru
+  inferența live, cu cost constant per observație nouă (buffer circular,
+  sume glisante, deque monoton pentru maxim, recurență EWM)
+- Prognoza recursivă (`forecast_recursive`), comună prognozei live și
+  backtest-ului: fiecare predicție devine lag pentru ora următoare
+
+O fereastră este validă doar dacă orele ei sunt consecutive pentru aceeași
+stație; după o pauză în date, lag-urile și ferestrele sunt NaN până la
+reumplere, iar EWM continuă peste pauză.
+"""
+
+import copy
+from collections import deque
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+# Configurația features (orele sunt numere de rânduri orare consecutive)
+LAG_HOURS = (1, 2, 3, 6, 12, 24)
+ROLLING_WINDOWS = (6, 24)
+EWM_SPANS = (6, 24)
+
+# Numărul de ore de istoric necesare pentru toate features
+HISTORY_HOURS = max(LAG_HOURS + ROLLING_WINDOWS)
+
+LAG_FEATURE_COLUMNS = (
+    [f"pm25_lag_{k}h" for k in LAG_HOURS]
+    + [f"pm25_roll_{stat}_{w}h" for w in ROLLING_WINDOWS for stat in ("mean", "max")]
+    + [f"pm25_ewm_{s}h" for s in EWM_SPANS]
+)
+
+_HOUR = pd.Timedelta(hours=1)
+
+
+def _contiguous(codes: np.ndarray, hours: np.ndarray, k: int) -> np.ndarray:
+    """Masca rândurilor pentru care rândul de acum `k` poziții este aceeași stație, cu `k` ore în urmă."""
+    valid = np.zeros(len(codes), dtype=bool)
+    if k < len(codes):
+        valid[k:] = (codes[k:] == codes[:-k]) & (hours[k:] - hours[:-k] == k)
+    return valid
+
+
+def add_lag_features(
+    df: pd.DataFrame, target: str = "pm25", group_col: str = "location", time_col: str = "timestamp"
+) -> pd.DataFrame:
+    """
+    Adaugă coloanele `LAG_FEATURE_COLUMNS`, calculate per stație din valorile anterioare.
+
+    Rândul de la ora t folosește doar valorile de la orele < t. Rândurile
+    fără istoric suficient primesc NaN (eliminate de obicei cu `dropna`).
+
+    Args:
+        df: Dataset cu `target`, `group_col` și `time_col`, în orice ordine
+        target: Coloana din care se calculează features
+        group_col: Coloana care identifică stația
+        time_col: Coloana cu timestamp-uri (rotunjite la oră)
+
+    Returns:
+        Copie a DataFrame-ului, cu aceeași ordine a rândurilor și coloanele noi
+    """
+    missing_cols = [col for col in (target, group_col, time_col) if col not in df.columns]
+    if missing_cols:
+        raise ValueError(f"Lipsesc coloane: {missing_cols}")
+
+    n = len(df)
+    codes = pd.factorize(df[group_col])[0]
+    timestamps = pd.to_datetime(df[time_col]).dt.floor("H")
+    hours = ((timestamps - pd.Timestamp("1970-01-01")) // _HOUR).to_numpy(dtype=np.int64)
+
+    # O singură sortare: stație, apoi timp
+    order = np.lexsort((hours, codes))
+    codes, hours = codes[order], hours[order]
+    values = df[target].to_numpy(dtype=np.float64)[order]
+
+    columns = {}
+    for k in LAG_HOURS:
+        lagged = np.full(n, np.nan)
+        if k < n:
+            lagged[k:] = values[:-k]
+        lagged[~_contiguous(codes, hours, k)] = np.nan
+        columns[f"pm25_lag_{k}h"] = lagged
+
+    # Ferestrele globale traversează granițele dintre stații doar în rânduri mascate
+    previous = pd.Series(values).shift(1)
+    for w in ROLLING_WINDOWS:
+        invalid = ~_contiguous(codes, hours, w)
+        rolling = previous.rolling(w)
+        for stat, result in (("mean", rolling.mean()), ("max", rolling.max())):
+            result = result.to_numpy()
+            result[invalid] = np.nan
+            columns[f"pm25_roll_{stat}_{w}h"] = result
+
+    first_of_station = np.ones(n, dtype=bool)
+    first_of_station[1:] = codes[1:] != codes[:-1]
+    for s in EWM_SPANS:
+        ewm = (
+            pd.Series(values)
+            .groupby(codes, sort=False)
+            .ewm(span=s, adjust=False)
+            .mean()
+            .droplevel(0)
+            .sort_index()
+            .to_numpy()
+        )
+        shifted = np.empty(n)
+        shifted[1:] = ewm[:-1]
+        shifted[first_of_station] = np.nan
+        columns[f"pm25_ewm_{s}h"] = shifted
+
+    # Înapoi în ordinea inițială a rândurilor
+    result = df.copy()
+    for name, sorted_values in columns.items():
+        restored = np.empty(n)
+        restored[order] = sorted_values
+        result[name] = restored
+    return result
+
+
+class OnlineLagState:
+    """Starea incrementală a unei stații: aceleași features ca `add_lag_features`, în O(1)."""
+
+    def __init__(self):
+        self.last_hour = None
+        self._ewm = {s: None for s in EWM_SPANS}
+        self._reset_windows()
+
+    def _reset_windows(self):
+        """Golește ferestrele (după o pauză în date); EWM este păstrat."""
+        self._buffer = deque(maxlen=HISTORY_HOURS)
+        self._sums = {w: 0.0 for w in ROLLING_WINDOWS}
+        # Deque monoton descrescător de (poziție, valoare) per fereastră
+        self._maxima = {w: deque() for w in ROLLING_WINDOWS}
+        self._position = 0
+
+    @classmethod
+    def from_history(
+        cls, df: pd.DataFrame, target: str = "pm25", time_col: str = "timestamp"
+    ) -> "OnlineLagState":
+        """Construiește starea din istoricul unei singure stații."""
+        state = cls()
+        history = df[[time_col, target]].dropna().sort_values(time_col)
+        for timestamp, value in zip(history[time_col], history[target]):
+            state.update(timestamp, value)
+        return state
+
+    @property
+    def is_ready(self) -> bool:
+        """True dacă ultimele `HISTORY_HOURS` ore sunt consecutive (toate features definite)."""
+        return len(self._buffer) >= HISTORY_HOURS
+
+    def update(self, timestamp, value: float):
+        """
+        Adaugă observația PM2.5 de la ora `timestamp`.
+
+        Raises:
+            ValueError: Dacă ora nu este ulterioară ultimei observații
+        """
+        hour = pd.Timestamp(timestamp).floor("H")
+        if self.last_hour is not None:
+            if hour <= self.last_hour:
+                raise ValueError(
+                    f"Observațiile trebuie să fie în ordine: {hour} după {self.last_hour}"
+                )
+            if hour - self.last_hour != _HOUR:
+                self._reset_windows()
+        self.last_hour = hour
+        value = float(value)
+
+        for w in ROLLING_WINDOWS:
+            if len(self._buffer) >= w:
+                self._sums[w] -= self._buffer[-w]
+            self._sums[w] += value
+
+            maxima = self._maxima[w]
+            while maxima and maxima[-1][1] <= value:
+                maxima.pop()
+            maxima.append((self._position, value))
+            if maxima[0][0] <= self._position - w:
+                maxima.popleft()
+
+        self._buffer.append(value)
+        self._position += 1
+
+        for s in EWM_SPANS:
+            alpha = 2 / (s + 1)
+            previous = self._ewm[s]
+            self._ewm[s] = value if previous is None else (1 - alpha) * previous + alpha * value
+
+    def features(self, timestamp=None) -> Dict[str, float]:
+        """
+        Features pentru ora următoare ultimei observații (sau pentru `timestamp`).
+
+        Pentru o oră care nu urmează imediat ultimei observații, lag-urile și
+        ferestrele sunt NaN, ca în `add_lag_features`.
+        """
+        available = len(self._buffer)
+        if timestamp is not None and (
+            self.last_hour is None or pd.Timestamp(timestamp).floor("H") - self.last_hour != _HOUR
+        ):
+            available = 0
+
+        features = {}
+        for k in LAG_HOURS:
+            features[f"pm25_lag_{k}h"] = self._buffer[-k] if available >= k else np.nan
+        for w in ROLLING_WINDOWS:
+            ready = available >= w
+            features[f"pm25_roll_mean_{w}h"] = self._sums[w] / w if ready else np.nan
+            features[f"pm25_roll_max_{w}h"] = self._maxima[w][0][1] if ready else np.nan
+        for s in EWM_SPANS:
+            features[f"pm25_ewm_{s}h"] = np.nan if self._ewm[s] is None else self._ewm[s]
+        return features
+
+    def copy(self) -> "OnlineLagState":
+        """Copie independentă (ex: pentru o prognoză recursivă)."""
+        return copy.deepcopy(self)
+
+
+def forecast_recursive(
+    predict: Callable[[np.ndarray], np.ndarray],
+    X: np.ndarray,
+    timestamps: Sequence,
+    states: List[OnlineLagState],
+    lag_positions: List[int],
+    steps: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """
+    Prognoză recursivă oră cu oră pentru una sau mai multe stații.
+
+    La fiecare oră, features de lag ale fiecărei stații sunt luate din starea
+    ei, toate stațiile sunt prezise într-un singur apel `predict`, iar fiecare
+    predicție este adăugată în stare ca intrare pentru ora următoare.
+
+    Args:
+        predict: Modelul (matrice de features brute -> predicții)
+        X: Features, formă (ore, stații, n_features); coloanele de lag sunt completate pe loc
+        timestamps: Ora fiecărui pas, comună tuturor stațiilor
+        states: Starea fiecărei stații la ora dinaintea primului pas (actualizată pe loc)
+        lag_positions: Pozițiile coloanelor `LAG_FEATURE_COLUMNS` în X
+        steps: Numărul de ore prezise per stație (implicit: toate)
+
+    Returns:
+        Predicțiile, formă (ore, stații); NaN după ultimul pas al unei stații
+    """
+    n_hours, n_series = X.shape[:2]
+    steps = np.full(n_series, n_hours) if steps is None else np.asarray(steps)
+    predictions = np.full((n_hours, n_series), np.nan)
+    for hour, timestamp in enumerate(timestamps):
+        active = np.flatnonzero(steps > hour)
+        if not len(active):
+            break
+        for series in active:
+            features = states[series].features(timestamp)
+            X[hour, series, lag_positions] = [features[col] for col in LAG_FEATURE_COLUMNS]
+        predictions[hour, active] = predict(X[hour, active])
+        for series in active:
+            states[series].update(timestamp, predictions[hour, series])
+    return predictions
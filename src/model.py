@@ -3,12 +3,21 @@ Modul pentru antrenarea și utilizarea modelului de predicție PM2.5.
 Student 2: Munteanu Radu
 
 Funcționalități:
-- Antrenare model Random Forest
+- Antrenare model Random Forest (în memorie sau pe bucăți, pentru date mai mari decât RAM-ul)
+  sau Histogram Gradient Boosting (backend-uri în `backends.py`)
+- Căutare de hiperparametri cu buget de timp (`tune`, successive halving)
+- Backtest cu origine mobilă, în paralel (`backtest`)
+- Compactarea modelului (selecție de arbori, limită de frunze, float32) și raport
+- Features opționale de lag/ferestre mobile per stație, cu stare online pentru prognoză
 - Evaluare performanță model
-- Predicție PM2.5 pentru următoarele 24h
-- Salvare/încărcare model
+- Predicție PM2.5 pentru următoarele 24h (sau până la 7 zile), într-un singur apel,
+  cu benzi p10/p90 din predicțiile arborilor (`predict_intervals`)
+- Predicție în bloc pentru multe locații și momente (`predict_batch`)
+- Salvare/încărcare model (joblib sau artefact mapat în memorie)
+- Cache opțional pentru predicții cu features cuantizate (`PredictionCache`)
 """
 
+import argparse
 import pandas as pd
 import numpy as np
 from sklearn.model_selection import train_test_split
@@ -17,34 +26,131 @@ from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
 from sklearn.preprocessing import StandardScaler
 import joblib
 import os
-from datetime import datetime, timedelta
-from typing import Tuple, Dict, List
+import shutil
+import sys
+from datetime import datetime
+from typing import Tuple, Dict, Iterable, Iterator, List, Optional, Union
 import json
+import time
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Adaugă directorul părinte la path pentru import module
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.backends import BACKENDS, build_estimator, default_params, uses_scaler
+from src.backtest import rolling_origin_backtest
+from src.compaction import COMPACTION_LEVELS, compact_forest, compaction_report
+from src.lag_features import (LAG_FEATURE_COLUMNS, OnlineLagState, add_lag_features,
+                              forecast_recursive)
+from src.model_artifacts import compile_forest, load_mmap_artifact, save_mmap_artifact
+from src.prediction_cache import PredictionCache
+from src.storage import DEFAULT_TRAINING_PATH, iter_training_data, read_training_data
+from src.tuning import sample_candidates, successive_halving
+
+# Moduri de evaluare după antrenare și limita implicită de rânduri evaluate per set
+EVALUATION_MODES = ('full', 'sample', 'oob')
+MAX_EVAL_ROWS = 200_000
+
+# Orizontul maxim de prognoză (7 zile)
+MAX_HORIZON_HOURS = 7 * 24
+
+# Motoare de inferență: sklearn sau pădurea compilată din `model_artifacts`
+ENGINES = ('sklearn', 'compiled')
+
+# Cuantilele implicite ale benzilor de predicție (coloanele `pm25_p10`, `pm25_p90`)
+INTERVAL_QUANTILES = (0.1, 0.9)
+
+# Peste acest număr de rânduri, RandomForestRegressor.predict (cod compilat,
+# pe mai multe thread-uri) este mai rapid decât parcurgerea NumPy
+COMPILED_MAX_ROWS = 256
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Memoria maximă (RSS) folosită până acum de proces, în MB, dacă e disponibilă."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss este în bytes pe macOS și în KB pe Linux
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
 
 
 class PM25Predictor:
     """Clasă pentru predicția nivelului PM2.5."""
     
-    def __init__(self, model_path: str = 'models/pm25_model.joblib'):
+    def __init__(self, model_path: str = 'models/pm25_model.joblib', use_mmap: bool = False,
+                 engine: str = 'sklearn', prediction_cache: Optional[PredictionCache] = None,
+                 params: Optional[Dict] = None, lag_features: bool = False,
+                 backend: str = 'random_forest', n_jobs: int = -1):
+        """
+        Args:
+            model_path: Calea fișierului joblib al modelului
+            use_mmap: Încarcă artefactul `.mmap` în locul fișierului joblib
+            engine: Motorul de inferență (`'sklearn'` sau `'compiled'`)
+            prediction_cache: Cache opțional pentru predicții (golit la
+                fiecare antrenare sau încărcare de model)
+            params: Parametrii estimatorului (implicit cei ai backend-ului,
+                ex: `DEFAULT_FOREST_PARAMS`)
+            lag_features: Adaugă features de lag/ferestre mobile ale PM2.5 per
+                stație (`LAG_FEATURE_COLUMNS`); datele trebuie să aibă
+                `location` și `timestamp`
+            backend: Estimatorul (`'random_forest'` sau `'hist_gradient_boosting'`);
+                la `load_model` este preluat din fișierul modelului
+            n_jobs: Thread-urile pădurii la antrenare și predicție (-1: toate CPU-urile)
+        """
+        if engine not in ENGINES:
+            raise ValueError(f"Motor necunoscut: {engine} (disponibile: {ENGINES})")
+        self.backend = backend
+        self.n_jobs = n_jobs
         self.model_path = model_path
+        self.use_mmap = use_mmap
+        self.engine = engine
+        self._compiled = None
+        self.prediction_cache = prediction_cache
+        self.params = dict(params or default_params(backend))
         self.model = None
-        self.scaler = StandardScaler()
+        self.scaler = StandardScaler() if uses_scaler(backend) else None
         self.feature_columns = [
             'temperature', 'humidity', 'pressure', 'wind_speed', 
             'wind_direction', 'clouds', 'hour', 'day_of_week', 'month'
         ]
+        if lag_features:
+            self.feature_columns += LAG_FEATURE_COLUMNS
         self.metrics = {}
+        self.last_forecast_latency_ms = None
+        
+    @property
+    def uses_lag_features(self) -> bool:
+        """True dacă modelul folosește features de lag (`LAG_FEATURE_COLUMNS`)."""
+        return any(col in LAG_FEATURE_COLUMNS for col in self.feature_columns)
+        
+    def _training_columns(self) -> List[str]:
+        """Coloanele citite din dataset: features stocate, target și cheile pentru lag-uri."""
+        columns = [col for col in self.feature_columns if col not in LAG_FEATURE_COLUMNS]
+        if self.uses_lag_features:
+            columns += ['location', 'timestamp']
+        return columns + ['pm25']
         
     def prepare_features(self, df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
         """
         Pregătește features pentru antrenare sau predicție.
         
+        Dacă modelul folosește features de lag și acestea lipsesc din `df`,
+        sunt calculate aici (`add_lag_features`); rândurile fără istoric
+        suficient (primele ore ale fiecărei stații, după pauze) sunt eliminate.
+        
         Args:
             df: DataFrame cu date
             
         Returns:
             Tuple (X, y) cu features și target
         """
+        if self.uses_lag_features and not set(LAG_FEATURE_COLUMNS) <= set(df.columns):
+            df = add_lag_features(df).dropna(subset=LAG_FEATURE_COLUMNS)
+        
         # Verifică că toate coloanele necesare există
         missing_cols = [col for col in self.feature_columns if col not in df.columns]
         if missing_cols:
@@ -55,20 +161,33 @@ class PM25Predictor:
         
         return X, y
     
-    def train(self, data_path: str = 'data/training_data.csv'):
+    def train(self, data_path: str = DEFAULT_TRAINING_PATH, evaluation: str = 'sample',
+              max_eval_rows: int = MAX_EVAL_ROWS):
         """
-        Antrenează modelul Random Forest.
+        Antrenează modelul (backend-ul ales în constructor).
         
         Args:
-            data_path: Calea către fișierul cu date de antrenare
+            data_path: Calea către fișierul cu date de antrenare (.parquet, .feather sau .csv)
+            evaluation: Modul de evaluare (`EVALUATION_MODES`, vezi `_evaluate_model`);
+                `'oob'` este disponibil doar pentru pădurea cu bootstrap
+            max_eval_rows: Numărul maxim de rânduri evaluate per set
         """
+        if evaluation not in EVALUATION_MODES:
+            raise ValueError(f"Mod de evaluare necunoscut: {evaluation} "
+                             f"(disponibile: {EVALUATION_MODES})")
+        if evaluation == 'oob':
+            self._require_backend('random_forest', "Evaluarea out-of-bag")
+            if not self.params.get('bootstrap', True):
+                raise ValueError("Evaluarea out-of-bag necesită bootstrap=True")
+        
         print("🎓 Începere antrenare model...\n")
         
         # Încarcă datele
         if not os.path.exists(data_path):
             raise FileNotFoundError(f"Fișierul {data_path} nu există. Rulați mai întâi data_collection.py")
         
-        df = pd.read_csv(data_path)
+        # Citește doar coloanele folosite de model
+        df = read_training_data(data_path, columns=self._training_columns())
         print(f"📊 Date încărcate: {len(df)} înregistrări")
         
         # Elimină valori lipsă
@@ -78,8 +197,9 @@ class PM25Predictor:
         # Pregătește features
         X, y = self.prepare_features(df)
         
-        # Normalizează features
-        X_scaled = self.scaler.fit_transform(X)
+        # Normalizează features (doar pentru backend-urile care o cer)
+        self.scaler = StandardScaler() if uses_scaler(self.backend) else None
+        X_scaled = self._scale(X, fit=True)
         
         # Împarte în train/test
         X_train, X_test, y_train, y_test = train_test_split(
@@ -89,80 +209,459 @@ class PM25Predictor:
         print(f"📚 Set antrenare: {len(X_train)} înregistrări")
         print(f"🧪 Set testare: {len(X_test)} înregistrări\n")
         
-        # Antrenează modelul Random Forest
-        print("🌲 Antrenare Random Forest Regressor...")
+        # Antrenează modelul
+        print(f"🌲 Antrenare {BACKENDS[self.backend]['name']}...")
+        self.model = build_estimator(self.backend, self.params, n_jobs=self.n_jobs)
+        if evaluation == 'oob':
+            self.model.set_params(oob_score=True)
+        
+        fit_start = time.perf_counter()
+        self.model.fit(X_train, y_train)
+        fit_seconds = time.perf_counter() - fit_start
+        self._on_model_changed()
+        print(f"✅ Antrenare finalizată în {fit_seconds:.1f}s!\n")
+        
+        # Evaluează modelul
+        self._evaluate_model(X_train, y_train, X_test, y_test, evaluation, max_eval_rows)
+        if evaluation == 'oob':
+            # Predicțiile OOB (un float per rând de antrenare) nu se salvează cu modelul
+            del self.model.oob_prediction_
+        self.metrics['params'] = dict(self.params)
+        self.metrics['training'] = {
+            'mode': 'full',
+            'backend': self.backend,
+            'rows': len(X_train),
+            'seconds': fit_seconds,
+            'peak_rss_mb': peak_rss_mb()
+        }
+        
+        # Salvează modelul
+        self.save_model()
+        
+    def train_chunked(self, data_path: str = DEFAULT_TRAINING_PATH, chunk_rows: int = 500_000,
+                      n_estimators: Optional[int] = None, test_size: float = 0.2,
+                      max_eval_rows: int = 200_000):
+        """
+        Antrenează modelul citind dataset-ul pe bucăți (out-of-core).
+        
+        Prima trecere potrivește scaler-ul incremental (`partial_fit`) și
+        numără rândurile; a doua adaugă arbori noi pentru fiecare bucată
+        (`warm_start`), deci fiecare arbore vede o singură bucată. Cei
+        `n_estimators` arbori sunt împărțiți cât mai egal între bucăți; dacă
+        sunt mai multe bucăți decât arbori, ultimele bucăți nu primesc arbori
+        și servesc doar la evaluare. Features de
+        lag sunt calculate per bucată, deci primele ore ale fiecărei stații din
+        bucată se pierd ca istoric de pornire. Setul de
+        test este ales aleator per rând, ca în `train`; pentru evaluare se
+        păstrează în memorie aproximativ `max_eval_rows` rânduri de test și
+        tot atâtea de antrenare, eșantionate cu fracțiuni separate.
+        
+        Args:
+            data_path: Fișierul sau directorul partiționat cu date de antrenare
+            chunk_rows: Numărul de rânduri citite odată
+            n_estimators: Numărul total de arbori (implicit din `params`)
+            test_size: Fracțiunea de rânduri rezervate pentru test
+            max_eval_rows: Numărul maxim de rânduri păstrate pentru evaluare
+        """
+        print(f"🎓 Începere antrenare model pe bucăți de {chunk_rows:,} rânduri...\n")
+        
+        self._require_backend('random_forest', "Antrenarea pe bucăți")
+        if not os.path.exists(data_path):
+            raise FileNotFoundError(f"Fișierul {data_path} nu există. Rulați mai întâi data_collection.py")
+        
+        columns = self._training_columns()
+        start = time.perf_counter()
+        
+        # Trecerea 1: scaler incremental și numărul de rânduri valide
+        self.scaler = StandardScaler()
+        n_rows, n_chunks = 0, 0
+        for chunk in iter_training_data(data_path, columns, chunk_rows):
+            X, _ = self.prepare_features(chunk.dropna())
+            if len(X):
+                self.scaler.partial_fit(X)
+                n_rows += len(X)
+                n_chunks += 1
+        if n_rows == 0:
+            raise ValueError(f"Nu există rânduri valide în {data_path}")
+        print(f"📊 Date valide: {n_rows:,} înregistrări în {n_chunks} bucăți\n")
+        
+        # Trecerea 2: arbori noi pentru fiecare bucată
+        n_estimators = n_estimators or self.params['n_estimators']
+        base, extra = divmod(n_estimators, n_chunks)
+        trees_per_chunk = [base + (i < extra) for i in range(n_chunks)]
+        train_fraction = min(1.0, max_eval_rows / max(1.0, n_rows * (1 - test_size)))
+        test_fraction = min(1.0, max_eval_rows / max(1.0, n_rows * test_size))
+        rng = np.random.default_rng(42)
         self.model = RandomForestRegressor(
-            n_estimators=100,
-            max_depth=15,
-            min_samples_split=5,
-            min_samples_leaf=2,
+            **dict(self.params, n_estimators=0),
             random_state=42,
-            n_jobs=-1
+            n_jobs=self.n_jobs,
+            warm_start=True
         )
         
-        self.model.fit(X_train, y_train)
-        print("✅ Antrenare finalizată!\n")
+        print(f"🌲 Antrenare Random Forest: {n_estimators} arbori în {n_chunks} bucăți "
+              f"({max(trees_per_chunk)} per bucată)...")
+        eval_train, eval_test = [], []
+        n_train, i = 0, 0
+        for chunk in iter_training_data(data_path, columns, chunk_rows):
+            X, y = self.prepare_features(chunk.dropna())
+            if not len(X):
+                continue
+            X = self.scaler.transform(X)
+            is_test = rng.random(len(X)) < test_size
+            keep = rng.random(len(X)) < np.where(is_test, test_fraction, train_fraction)
+            
+            if trees_per_chunk[i]:
+                self.model.n_estimators += trees_per_chunk[i]
+                self.model.fit(X[~is_test], y[~is_test])
+                n_train += int((~is_test).sum())
+            i += 1
+            
+            eval_train.append((X[~is_test & keep], y[~is_test & keep]))
+            eval_test.append((X[is_test & keep], y[is_test & keep]))
         
-        # Evaluează modelul
-        self._evaluate_model(X_train, y_train, X_test, y_test)
+        self._on_model_changed()
+        X_train = np.concatenate([X for X, _ in eval_train])
+        y_train = np.concatenate([y for _, y in eval_train])
+        X_test = np.concatenate([X for X, _ in eval_test])
+        y_test = np.concatenate([y for _, y in eval_test])
+        
+        peak_mb = peak_rss_mb()
+        elapsed = time.perf_counter() - start
+        print(f"✅ Antrenare finalizată: {len(self.model.estimators_)} arbori, "
+              f"{n_train:,} rânduri în {elapsed:.1f}s")
+        if peak_mb is not None:
+            print(f"📈 Memorie maximă a procesului: {peak_mb:.0f} MB\n")
+        
+        # Evaluează modelul pe eșantionul păstrat
+        self._evaluate_model(X_train, y_train, X_test, y_test, 'sample', max_eval_rows)
+        self.metrics['params'] = dict(self.params)
+        self.metrics['training'] = {
+            'mode': 'chunked',
+            'backend': self.backend,
+            'rows': n_rows,
+            'chunks': n_chunks,
+            'chunk_rows': chunk_rows,
+            'trees_per_chunk': trees_per_chunk,
+            'eval_rows': {'train': len(X_train), 'test': len(X_test)},
+            'seconds': elapsed,
+            'peak_rss_mb': peak_mb
+        }
         
         # Salvează modelul
         self.save_model()
         
-    def _evaluate_model(self, X_train, y_train, X_test, y_test):
-        """Evaluează performanța modelului."""
+    @property
+    def tuning_path(self) -> str:
+        """Fișierul cu rezultatul căutării de hiperparametri, alături de metrici."""
+        return self.model_path.replace('.joblib', '_tuning.json')
+        
+    def tune(self, data_path: str = DEFAULT_TRAINING_PATH, budget_seconds: float = 300,
+             n_candidates: int = 27, max_workers: Optional[int] = None, refit: bool = True) -> Dict:
+        """
+        Caută parametrii pădurii prin successive halving, în limita unui buget de timp.
+        
+        Căutarea folosește doar setul de antrenare din `train` (împărțit în
+        antrenare/validare), deci setul de test rămâne neatins. Configurația
+        câștigătoare și istoricul căutării sunt salvate în `tuning_path`;
+        cu `refit=True` modelul este apoi reantrenat cu `train`.
+        
+        Args:
+            data_path: Calea către fișierul cu date de antrenare
+            budget_seconds: Timpul maxim al căutării
+            n_candidates: Numărul de configurații din prima rundă
+            max_workers: Numărul de procese (implicit: numărul de CPU-uri)
+            refit: Reantrenează și salvează modelul cu parametrii găsiți
+            
+        Returns:
+            Rezultatul căutării (vezi `successive_halving`)
+        """
+        self._require_backend('random_forest', "Căutarea de hiperparametri")
+        print(f"🎛️ Căutare hiperparametri (buget {budget_seconds:.0f}s)...\n")
+        
+        if not os.path.exists(data_path):
+            raise FileNotFoundError(f"Fișierul {data_path} nu există. Rulați mai întâi data_collection.py")
+        
+        df = read_training_data(data_path, columns=self._training_columns()).dropna()
+        X, y = self.prepare_features(df)
+        X_scaled = StandardScaler().fit_transform(X)
+        
+        # Aceeași împărțire ca în `train`; validarea se ia din setul de antrenare
+        X_train, _, y_train, _ = train_test_split(X_scaled, y, test_size=0.2, random_state=42)
+        X_fit, X_val, y_fit, y_val = train_test_split(X_train, y_train, test_size=0.2,
+                                                      random_state=42)
+        
+        candidates = sample_candidates(n_candidates, include=self.params)
+        result = successive_halving(X_fit, y_fit, X_val, y_val, candidates,
+                                    budget_seconds=budget_seconds, max_workers=max_workers)
+        result['baseline_params'] = dict(self.params)
+        
+        if result['best_params'] is not None:
+            self.params = dict(result['best_params'])
+            print(f"\n🏆 Parametri câștigători: {self.params} "
+                  f"(RMSE validare {result['best_val_rmse']:.3f})\n")
+        else:
+            print("\n⚠️ Niciun candidat terminat în buget; se păstrează parametrii actuali\n")
+        
+        os.makedirs(os.path.dirname(self.tuning_path) or '.', exist_ok=True)
+        with open(self.tuning_path, 'w') as f:
+            json.dump(result, f, indent=2, default=str)
+        print(f"📊 Rezultat căutare salvat: {self.tuning_path}\n")
+        
+        if refit:
+            self.train(data_path)
+        return result
+        
+    def load_tuned_params(self) -> bool:
+        """Folosește parametrii salvați de `tune`, dacă există. Returnează True dacă s-au găsit."""
+        if self.backend != 'random_forest' or not os.path.exists(self.tuning_path):
+            return False
+        with open(self.tuning_path, 'r') as f:
+            best_params = json.load(f).get('best_params')
+        if best_params:
+            self.params = best_params
+        return bool(best_params)
+        
+    @property
+    def backtest_path(self) -> str:
+        """Fișierul cu rezultatele backtest-ului, alături de metrici."""
+        return self.model_path.replace('.joblib', '_backtest.json')
+        
+    def backtest(self, data_path: str = DEFAULT_TRAINING_PATH, n_folds: int = 8,
+                 horizon_hours: int = 24, step_hours: int = 24,
+                 train_hours: Optional[int] = None,
+                 max_workers: Optional[int] = None) -> Dict[str, pd.DataFrame]:
+        """
+        Evaluează modelul prin backtest cu origine mobilă (fără scurgeri din viitor).
+        
+        La fiecare cutoff se antrenează un model nou cu `params` pe datele
+        anterioare și se prezic următoarele `horizon_hours` ore. Modelul
+        salvat nu este modificat; tabelele sunt salvate în `backtest_path`.
+        Pentru un model cu lag-uri, fereastra este prezisă recursiv per stație,
+        din starea observată la cutoff (aceeași cale ca `predict_next_24h`).
+        
+        Returns:
+            Dicționar cu tabelele `by_horizon`, `by_fold` și `predictions`
+            (vezi `rolling_origin_backtest`)
+        """
+        if not os.path.exists(data_path):
+            raise FileNotFoundError(f"Fișierul {data_path} nu există. Rulați mai întâi data_collection.py")
+        
+        columns = self._training_columns()
+        if 'timestamp' not in columns:
+            columns.append('timestamp')
+        df = read_training_data(data_path, columns=columns)
+        if self.uses_lag_features:
+            df = add_lag_features(df)
+        
+        tables = rolling_origin_backtest(
+            df, self.feature_columns, self.params, n_folds=n_folds,
+            horizon_hours=horizon_hours, step_hours=step_hours,
+            train_hours=train_hours, max_workers=max_workers, backend=self.backend,
+            lag_features=self.uses_lag_features
+        )
+        
+        by_horizon = tables['by_horizon']
+        print("\n📉 Eroare per oră de orizont:")
+        print(by_horizon.to_string(index=False, float_format=lambda v: f'{v:.2f}'))
+        
+        overall = {
+            'rmse': float(np.sqrt((by_horizon['rmse'] ** 2 * by_horizon['rows']).sum()
+                                  / by_horizon['rows'].sum())),
+            'mae': float((by_horizon['mae'] * by_horizon['rows']).sum() / by_horizon['rows'].sum())
+        }
+        print(f"\n📊 Total: RMSE {overall['rmse']:.2f} μg/m³, MAE {overall['mae']:.2f} μg/m³\n")
+        
+        os.makedirs(os.path.dirname(self.backtest_path) or '.', exist_ok=True)
+        with open(self.backtest_path, 'w') as f:
+            json.dump({
+                'backend': self.backend,
+                'params': self.params,
+                'n_folds': n_folds,
+                'horizon_hours': horizon_hours,
+                'step_hours': step_hours,
+                'train_hours': train_hours,
+                'overall': overall,
+                'by_horizon': by_horizon.to_dict(orient='records'),
+                'by_fold': tables['by_fold'].to_dict(orient='records')
+            }, f, indent=2, default=str)
+        print(f"📊 Backtest salvat: {self.backtest_path}\n")
+        
+        return tables
+        
+    def _holdout_split(self, data_path: str) -> Tuple[np.ndarray, ...]:
+        """
+        Reface setul de test din `train` și îl împarte în validare și test.
+        
+        Returns:
+            Tuple (X_val, y_val, X_test, y_test), cu features scalate
+        """
+        if not os.path.exists(data_path):
+            raise FileNotFoundError(f"Fișierul {data_path} nu există. Rulați mai întâi data_collection.py")
+        
+        df = read_training_data(data_path, columns=self._training_columns()).dropna()
+        X, y = self.prepare_features(df)
+        _, X_holdout, _, y_holdout = train_test_split(X, y, test_size=0.2, random_state=42)
+        X_val, X_test, y_val, y_test = train_test_split(X_holdout, y_holdout, test_size=0.5,
+                                                        random_state=42)
+        return self._scale(X_val), y_val, self._scale(X_test), y_test
+        
+    def _require_backend(self, backend: str, operation: str):
+        if self.backend != backend:
+            raise ValueError(f"{operation} este disponibilă doar pentru backend-ul {backend} "
+                             f"(model curent: {self.backend})")
+        
+    def _require_sklearn_model(self):
+        if self.model is None:
+            self.load_model()
+        self._require_backend('random_forest', "Compactarea")
+        if not hasattr(self.model, 'estimators_'):
+            raise ValueError("Compactarea necesită modelul sklearn complet (fișierul joblib original)")
+        
+    @property
+    def compaction_path(self) -> str:
+        """Fișierul cu raportul de compactare, alături de metrici."""
+        return self.model_path.replace('.joblib', '_compaction.json')
+        
+    def compaction_report(self, data_path: str = DEFAULT_TRAINING_PATH,
+                          levels: Optional[List[Dict]] = None) -> pd.DataFrame:
+        """
+        Compară nivelurile de compactare: bytes, timp de încărcare, latență, RMSE.
+        
+        Arborii sunt selectați pe jumătate din setul de test al lui `train`,
+        iar RMSE-ul este calculat pe cealaltă jumătate. Raportul este salvat
+        în `compaction_path`.
+        
+        Returns:
+            DataFrame cu câte un rând per nivel (vezi `compaction.compaction_report`)
+        """
+        self._require_sklearn_model()
+        X_val, y_val, X_test, y_test = self._holdout_split(data_path)
+        
+        report = compaction_report(self.model, self.scaler, self.feature_columns,
+                                   X_val, y_val, X_test, y_test, levels or COMPACTION_LEVELS,
+                                   joblib_path=self.model_path)
+        
+        print("\n🗜️ Raport compactare model:")
+        print(report.to_string(index=False, float_format=lambda v: f'{v:.2f}'))
+        print()
+        
+        with open(self.compaction_path, 'w') as f:
+            json.dump(report.to_dict(orient='records'), f, indent=2)
+        print(f"📊 Raport salvat: {self.compaction_path}\n")
+        return report
+        
+    def compact(self, data_path: str = DEFAULT_TRAINING_PATH, n_trees: Optional[int] = None,
+                max_leaves: Optional[int] = None, float32: bool = True):
+        """
+        Înlocuiește modelul cu o versiune compactă și îl salvează.
+        
+        Modelul rezultat este o `FlatForest` (evaluată cu motorul compilat);
+        fișierul joblib original este suprascris, deci rulați întâi
+        `compaction_report` pentru a alege nivelul.
+        
+        Args:
+            data_path: Datele din care se reface setul de validare/test
+            n_trees: Numărul de arbori păstrați (implicit: toți)
+            max_leaves: Numărul maxim de frunze per arbore
+            float32: Praguri și valori float32
+        """
+        self._require_sklearn_model()
+        X_val, y_val, X_test, y_test = self._holdout_split(data_path)
+        
+        full_rmse = float(np.sqrt(np.mean((self.model.predict(X_test) - y_test) ** 2)))
+        self.model = compact_forest(self.model, X_val, y_val, n_trees, max_leaves, float32)
+        self._on_model_changed()
+        compact_rmse = float(np.sqrt(np.mean((np.maximum(self.model.predict(X_test), 0)
+                                              - y_test) ** 2)))
+        
+        self.metrics['compaction'] = {
+            'n_trees': self.model.n_estimators,
+            'max_leaves': max_leaves,
+            'float32': float32,
+            'nbytes': self.model.nbytes,
+            'test_rmse_full': full_rmse,
+            'test_rmse_compact': compact_rmse
+        }
+        print(f"🗜️ Model compactat: {self.model.n_estimators} arbori, "
+              f"{self.model.nbytes / 1e6:.1f} MB, RMSE {full_rmse:.2f} -> {compact_rmse:.2f}")
+        self.save_model()
+        
+    def _evaluate_model(self, X_train, y_train, X_test, y_test, evaluation: str = 'full',
+                        max_eval_rows: Optional[int] = None):
+        """
+        Evaluează performanța modelului.
+        
+        Args:
+            X_train, y_train: Setul de antrenare
+            X_test, y_test: Setul de test
+            evaluation: `'full'` (toate rândurile), `'sample'` (cel mult
+                `max_eval_rows` rânduri aleatoare din fiecare set) sau `'oob'`
+                (ca `'sample'`, plus scorurile out-of-bag pe tot setul de
+                antrenare, din predicțiile calculate deja la `fit`, sub cheia `'oob'`)
+            max_eval_rows: Limita de rânduri per set pentru `'sample'`/`'oob'`
+        """
         print("📊 Evaluare model...\n")
         
-        # Predicții
-        y_train_pred = self.model.predict(X_train)
-        y_test_pred = self.model.predict(X_test)
+        rng = np.random.default_rng(42)
         
-        # Metrici train
-        train_rmse = np.sqrt(mean_squared_error(y_train, y_train_pred))
-        train_mae = mean_absolute_error(y_train, y_train_pred)
-        train_r2 = r2_score(y_train, y_train_pred)
+        def capped(X, y):
+            if evaluation == 'full' or max_eval_rows is None or len(X) <= max_eval_rows:
+                return X, y
+            rows = np.sort(rng.choice(len(X), size=max_eval_rows, replace=False))
+            return X[rows], y[rows]
         
-        # Metrici test
-        test_rmse = np.sqrt(mean_squared_error(y_test, y_test_pred))
-        test_mae = mean_absolute_error(y_test, y_test_pred)
-        test_r2 = r2_score(y_test, y_test_pred)
+        X_train_eval, y_train_eval = capped(X_train, y_train)
+        y_train_pred = self.model.predict(X_train_eval)
+        X_test_eval, y_test_eval = capped(X_test, y_test)
+        y_test_pred = self.model.predict(X_test_eval)
         
         # Salvează metrici
         self.metrics = {
-            'train': {
-                'rmse': float(train_rmse),
-                'mae': float(train_mae),
-                'r2': float(train_r2)
-            },
-            'test': {
-                'rmse': float(test_rmse),
-                'mae': float(test_mae),
-                'r2': float(test_r2)
+            'train': self._regression_metrics(y_train_eval, y_train_pred),
+            'test': self._regression_metrics(y_test_eval, y_test_pred),
+            'evaluation': {
+                'mode': evaluation,
+                'max_eval_rows': max_eval_rows,
+                'rows': {'train': len(y_train_eval), 'test': len(y_test_eval)}
             }
         }
+        sets = [('train', 'Set Antrenare', '📈'), ('test', 'Set Testare', '📉')]
+        
+        # Out-of-bag: predicțiile sunt deja calculate la fit, fără re-predicție
+        if evaluation == 'oob':
+            self.metrics['oob'] = self._regression_metrics(y_train, self.model.oob_prediction_)
+            self.metrics['evaluation']['rows']['oob'] = len(y_train)
+            sets.insert(1, ('oob', 'Out-of-Bag', '🎒'))
         
         # Afișează rezultate
-        print("📈 Performanță Set Antrenare:")
-        print(f"   RMSE: {train_rmse:.2f} μg/m³")
-        print(f"   MAE:  {train_mae:.2f} μg/m³")
-        print(f"   R²:   {train_r2:.4f}")
-        
-        print("\n📉 Performanță Set Testare:")
-        print(f"   RMSE: {test_rmse:.2f} μg/m³")
-        print(f"   MAE:  {test_mae:.2f} μg/m³")
-        print(f"   R²:   {test_r2:.4f}\n")
-        
-        # Feature importance
-        feature_importance = pd.DataFrame({
-            'feature': self.feature_columns,
-            'importance': self.model.feature_importances_
-        }).sort_values('importance', ascending=False)
+        for name, label, icon in sets:
+            scores = self.metrics[name]
+            print(f"{icon} Performanță {label} ({self.metrics['evaluation']['rows'][name]:,} rânduri):")
+            print(f"   RMSE: {scores['rmse']:.2f} μg/m³")
+            print(f"   MAE:  {scores['mae']:.2f} μg/m³")
+            print(f"   R²:   {scores['r2']:.4f}\n")
+        
+        # Feature importance (gradient boosting nu o calculează)
+        if not hasattr(self.model, 'feature_importances_'):
+            return
+        feature_importance = sorted(zip(self.feature_columns, self.model.feature_importances_),
+                                    key=lambda item: item[1], reverse=True)
         
         print("🎯 Importanța Features:")
-        for idx, row in feature_importance.iterrows():
-            print(f"   {row['feature']:15s}: {row['importance']:.4f}")
+        for feature, importance in feature_importance:
+            print(f"   {feature:15s}: {importance:.4f}")
         print()
         
+    @staticmethod
+    def _regression_metrics(y_true: np.ndarray, y_pred: np.ndarray) -> Dict[str, float]:
+        """RMSE, MAE și R²."""
+        return {
+            'rmse': float(np.sqrt(mean_squared_error(y_true, y_pred))),
+            'mae': float(mean_absolute_error(y_true, y_pred)),
+            'r2': float(r2_score(y_true, y_pred))
+        }
+        
     def save_model(self):
         """Salvează modelul și scaler."""
         os.makedirs(os.path.dirname(self.model_path), exist_ok=True)
@@ -176,27 +675,56 @@ class PM25Predictor:
             'trained_at': datetime.now().isoformat()
         }
         
-        joblib.dump(model_data, self.model_path)
+        # Scriere într-un fișier temporar și înlocuire atomică: cititorii nu
+        # văd niciodată un fișier parțial
+        tmp_path = f'{self.model_path}.tmp'
+        joblib.dump(dict(model_data, backend=self.backend), tmp_path)
+        os.replace(tmp_path, self.model_path)
         print(f"💾 Model salvat: {self.model_path}")
         
+        # Salvează și artefactul mapabil în memorie (încărcare rapidă, doar pentru păduri)
+        if self.backend == 'random_forest':
+            save_mmap_artifact(self.mmap_path, **model_data)
+            print(f"💾 Artefact mmap salvat: {self.mmap_path}")
+        elif os.path.isdir(self.mmap_path):
+            shutil.rmtree(self.mmap_path)  # artefactul unui model anterior
+        
         # Salvează metrici în JSON
         metrics_path = self.model_path.replace('.joblib', '_metrics.json')
         with open(metrics_path, 'w') as f:
             json.dump(self.metrics, f, indent=2)
         print(f"📊 Metrici salvate: {metrics_path}\n")
         
+    @property
+    def mmap_path(self) -> str:
+        """Directorul artefactului mapat în memorie, alături de fișierul joblib."""
+        return self.model_path.replace('.joblib', '.mmap')
+        
     def load_model(self):
-        """Încarcă modelul salvat."""
-        if not os.path.exists(self.model_path):
+        """
+        Încarcă modelul salvat.
+        
+        Cu `use_mmap=True` se deschide artefactul `.mmap` (arborii sunt citiți
+        de pe disc la cerere și partajați între procese); dacă artefactul
+        lipsește, se revine la fișierul joblib.
+        """
+        if self.use_mmap and os.path.isdir(self.mmap_path):
+            model_data = load_mmap_artifact(self.mmap_path)
+            source = self.mmap_path
+        elif os.path.exists(self.model_path):
+            model_data = joblib.load(self.model_path)
+            source = self.model_path
+        else:
             raise FileNotFoundError(f"Modelul nu există: {self.model_path}")
         
-        model_data = joblib.load(self.model_path)
         self.model = model_data['model']
+        self.backend = model_data.get('backend', 'random_forest')
         self.scaler = model_data['scaler']
         self.feature_columns = model_data['feature_columns']
         self.metrics = model_data.get('metrics', {})
+        self._on_model_changed()
         
-        print(f"✅ Model încărcat: {self.model_path}")
+        print(f"✅ Model încărcat: {source}")
         
     def predict(self, weather_data: Dict) -> float:
         """
@@ -211,64 +739,288 @@ class PM25Predictor:
         if self.model is None:
             self.load_model()
         
-        # Creează DataFrame cu features
-        features = pd.DataFrame([weather_data])
+        # Verifică features și construiește direct rândul (fără DataFrame)
+        missing_cols = [col for col in self.feature_columns if col not in weather_data]
+        if missing_cols:
+            raise ValueError(f"Lipsesc coloane: {missing_cols}")
+        X = np.array([[weather_data[col] for col in self.feature_columns]], dtype=np.float64)
         
-        # Verifică features
-        X, _ = self.prepare_features(features)
+        # Normalizează și prezice
+        return float(self._predict_matrix(X)[0])
+    
+    def _on_model_changed(self):
+        """Invalidează starea derivată din modelul anterior."""
+        self._compiled = None
+        if self.prediction_cache is not None:
+            self.prediction_cache.clear()
+    
+    def _predict_matrix(self, X: np.ndarray) -> np.ndarray:
+        """Prezice o matrice de features, prin cache-ul de predicții dacă există."""
+        if self.prediction_cache is not None:
+            return self.prediction_cache.get_or_compute(X, self.feature_columns,
+                                                        self._predict_uncached)
+        return self._predict_uncached(X)
+    
+    def _predict_uncached(self, X: np.ndarray) -> np.ndarray:
+        """Normalizează o matrice de features și prezice, fără validare per rând."""
+        if (self.engine == 'compiled' and self.backend == 'random_forest'
+                and (len(X) <= COMPILED_MAX_ROWS or not hasattr(self.model, 'estimators_'))):
+            if self._compiled is None:
+                self._compiled = compile_forest(self.model, self.scaler)
+            predictions = self._compiled.predict(X)
+        else:
+            predictions = self.model.predict(self._scale(X))
+        return np.maximum(predictions, 0)  # PM2.5 nu poate fi negativ
+    
+    def _scale(self, X: np.ndarray, fit: bool = False) -> np.ndarray:
+        """Aplică scaler-ul, dacă backend-ul are unul."""
+        if self.scaler is None:
+            return X
+        return self.scaler.fit_transform(X) if fit else self.scaler.transform(X)
+    
+    @property
+    def supports_intervals(self) -> bool:
+        """True dacă modelul are predicții per arbore (pădure, nu gradient boosting)."""
+        return self.backend == 'random_forest'
+    
+    def _predict_tree_outputs(self, X: np.ndarray) -> np.ndarray:
+        """
+        Predicțiile tuturor arborilor pentru o matrice de features brute, formă (n, n_arbori).
         
-        # Normalizează
-        X_scaled = self.scaler.transform(X)
+        Loturile mici trec o singură dată prin pădurea compilată (toți arborii
+        deodată); cele mari folosesc arborii sklearn, câte o coloană per arbore.
+        """
+        if not self.supports_intervals:
+            raise ValueError(f"Backend-ul {self.backend} nu are predicții per arbore")
         
-        # Prezice
-        prediction = self.model.predict(X_scaled)[0]
+        if len(X) <= COMPILED_MAX_ROWS or not hasattr(self.model, 'estimators_'):
+            if self._compiled is None:
+                self._compiled = compile_forest(self.model, self.scaler)
+            return self._compiled.predict_trees(X)
         
-        return max(0, prediction)  # PM2.5 nu poate fi negativ
+        X_scaled = np.ascontiguousarray(self.scaler.transform(X), dtype=np.float32)
+        outputs = np.empty((len(X), len(self.model.estimators_)), dtype=np.float64)
+        for i, tree in enumerate(self.model.estimators_):
+            outputs[:, i] = tree.predict(X_scaled, check_input=False)
+        return outputs
+    
+    @staticmethod
+    def _interval_columns(tree_outputs: np.ndarray,
+                          quantiles: Tuple[float, ...]) -> Dict[str, np.ndarray]:
+        """Coloanele `pm25_p<q>` calculate pe axa arborilor (≥ 0)."""
+        bands = np.maximum(np.quantile(tree_outputs, quantiles, axis=1), 0)
+        return {f'pm25_p{round(q * 100)}': band for q, band in zip(quantiles, bands)}
     
-    def predict_next_24h(self, current_weather: Dict, weather_forecast: List[Dict] = None) -> pd.DataFrame:
+    def predict_intervals(self, X: Union[np.ndarray, pd.DataFrame],
+                          quantiles: Tuple[float, ...] = INTERVAL_QUANTILES,
+                          chunk_size: int = 10_000) -> pd.DataFrame:
         """
-        Prezice PM2.5 pentru următoarele 24 de ore.
+        Prezice PM2.5 cu benzi de cuantile din distribuția predicțiilor arborilor.
+        
+        Pentru fiecare bucată se calculează o singură matrice (rânduri × arbori);
+        media ei este predicția punctuală (identică cu `predict_batch`), iar
+        cuantilele pe axa arborilor dau benzile. Benzile descriu dezacordul
+        dintre arbori, nu și zgomotul măsurătorilor.
         
         Args:
-            current_weather: Date meteo curente
-            weather_forecast: Listă cu prognoză meteo pentru 24h (opțional)
+            X: Array (n, n_features) sau DataFrame cu `feature_columns`
+            quantiles: Cuantilele benzilor (implicit p10 și p90)
+            chunk_size: Numărul maxim de rânduri evaluate odată
             
         Returns:
-            DataFrame cu predicții orare
+            DataFrame cu `pm25_predicted` și câte o coloană `pm25_p<q>` per cuantilă
         """
         if self.model is None:
             self.load_model()
         
-        predictions = []
-        current_time = datetime.now()
+        X = self._as_feature_matrix(X)
+        chunks = []
+        for start in range(0, max(len(X), 1), chunk_size):
+            outputs = self._predict_tree_outputs(X[start:start + chunk_size])
+            chunks.append(pd.DataFrame({
+                'pm25_predicted': np.maximum(outputs.mean(axis=1), 0),
+                **self._interval_columns(outputs, quantiles)
+            }))
+        return pd.concat(chunks, ignore_index=True)
+    
+    def _as_feature_matrix(self, X: Union[np.ndarray, pd.DataFrame]) -> np.ndarray:
+        """Convertește un DataFrame sau un array la matricea de features a modelului."""
+        if isinstance(X, pd.DataFrame):
+            missing_cols = [col for col in self.feature_columns if col not in X.columns]
+            if missing_cols:
+                raise ValueError(f"Lipsesc coloane: {missing_cols}")
+            return X[self.feature_columns].to_numpy(dtype=np.float64)
         
-        for hour_offset in range(24):
-            future_time = current_time + timedelta(hours=hour_offset)
-            
-            # Folosește prognoza meteo dacă este disponibilă
-            if weather_forecast and hour_offset < len(weather_forecast):
-                weather = weather_forecast[hour_offset]
-            else:
-                # Simulează variații meteo
-                weather = self._simulate_weather_variation(current_weather, hour_offset)
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim != 2 or X.shape[1] != len(self.feature_columns):
+            raise ValueError(
+                f"Matricea trebuie să aibă forma (n, {len(self.feature_columns)}), "
+                f"în ordinea {self.feature_columns}; primit: {X.shape}"
+            )
+        return X
+    
+    def iter_predict_batch(self, chunks: Iterable[Union[np.ndarray, pd.DataFrame]],
+                           chunk_size: int = 100_000) -> Iterator[np.ndarray]:
+        """
+        Prezice PM2.5 pentru un flux de bucăți, returnând predicțiile bucată cu bucată.
+        
+        Memoria folosită este limitată de `chunk_size`, indiferent de lungimea fluxului.
+        
+        Args:
+            chunks: Iterabil de array-uri sau DataFrame-uri cu `feature_columns`
+            chunk_size: Numărul maxim de rânduri evaluate odată
             
-            # Adaugă features temporale
-            weather['hour'] = future_time.hour
-            weather['day_of_week'] = future_time.weekday()
-            weather['month'] = future_time.month
+        Yields:
+            Vectori de predicții, câte unul pentru fiecare bucată de intrare
+        """
+        if self.model is None:
+            self.load_model()
+        
+        for chunk in chunks:
+            X = self._as_feature_matrix(chunk)
+            predictions = np.empty(len(X), dtype=np.float64)
+            for start in range(0, len(X), chunk_size):
+                stop = start + chunk_size
+                predictions[start:stop] = self._predict_matrix(X[start:stop])
+            yield predictions
+    
+    def predict_batch(self, X: Union[np.ndarray, pd.DataFrame, Iterable],
+                      chunk_size: int = 100_000) -> np.ndarray:
+        """
+        Prezice PM2.5 pentru multe rânduri (ex: stații × ore) dintr-o dată.
+        
+        Validarea coloanelor se face o singură dată per intrare, nu per rând,
+        iar evaluarea se face pe bucăți de `chunk_size` rânduri.
+        
+        Args:
+            X: Array (n, n_features) în ordinea `feature_columns`, DataFrame
+                cu `feature_columns`, sau un iterabil de astfel de bucăți
+            chunk_size: Numărul maxim de rânduri evaluate odată
             
-            # Prezice PM2.5
-            pm25_pred = self.predict(weather)
+        Returns:
+            Vector de predicții PM2.5 (≥ 0)
+        """
+        if isinstance(X, (np.ndarray, pd.DataFrame)):
+            X = [X]
+        predictions = list(self.iter_predict_batch(X, chunk_size))
+        return np.concatenate(predictions) if predictions else np.empty(0)
+    
+    def predict_next_24h(self, current_weather: Dict, weather_forecast: List[Dict] = None,
+                         hours: int = 24, lag_state: Optional[OnlineLagState] = None,
+                         intervals: bool = False) -> pd.DataFrame:
+        """
+        Prezice PM2.5 pentru următoarele 24 de ore (sau `hours` ore).
+        
+        Întregul orizont este asamblat într-o singură matrice de features și
+        evaluat cu un singur apel `model.predict`; latența ultimei prognoze
+        este păstrată în `last_forecast_latency_ms`.
+        
+        Pentru un model cu features de lag prognoza este recursivă: începe cu
+        ora de după ultima observație din `lag_state`, iar fiecare predicție
+        este adăugată într-o copie a stării ca intrare pentru ora următoare.
+        
+        Predicțiile punctuale trec prin `_predict_matrix` (cache-ul de predicții
+        și motorul configurat). Cu `intervals=True`, pentru păduri se adaugă
+        benzile `pm25_p10`/`pm25_p90` (vezi `predict_intervals`), calculate
+        separat din predicțiile arborilor.
+        
+        Args:
+            current_weather: Date meteo curente
+            weather_forecast: Listă cu prognoză meteo orară (opțional)
+            hours: Orizontul prognozei în ore (maxim `MAX_HORIZON_HOURS`, 7 zile)
+            lag_state: Istoricul PM2.5 al stației (obligatoriu pentru modelele cu lag-uri)
+            intervals: Adaugă benzile p10/p90 (opțional; ignorat pentru gradient boosting)
             
-            predictions.append({
-                'timestamp': future_time,
-                'pm25_predicted': pm25_pred,
-                'temperature': weather['temperature'],
-                'humidity': weather['humidity'],
-                'wind_speed': weather['wind_speed']
-            })
-        
-        return pd.DataFrame(predictions)
+        Returns:
+            DataFrame cu predicții orare
+        """
+        if not 1 <= hours <= MAX_HORIZON_HOURS:
+            raise ValueError(f"Orizontul trebuie să fie între 1 și {MAX_HORIZON_HOURS} ore: {hours}")
+        
+        if self.model is None:
+            self.load_model()
+        
+        if self.uses_lag_features and (lag_state is None or not lag_state.is_ready):
+            raise ValueError("Modelul folosește features de lag: este necesar un `lag_state` "
+                             "cu ultimele ore PM2.5 consecutive ale stației")
+        
+        start = time.perf_counter()
+        if self.uses_lag_features:
+            current_time = lag_state.last_hour + pd.Timedelta(hours=1)
+        else:
+            current_time = datetime.now()
+        offsets = np.arange(hours)
+        timestamps = pd.Timestamp(current_time) + pd.to_timedelta(offsets, unit='h')
+        
+        # Simulează variații meteo, apoi suprascrie orele acoperite de prognoză
+        weather = self._simulate_weather_variation_batch(current_weather, offsets)
+        if weather_forecast:
+            forecast = pd.DataFrame(weather_forecast[:hours])
+            for column in forecast.columns.intersection(weather.columns):
+                weather.loc[:len(forecast) - 1, column] = forecast[column].values
+        
+        # Adaugă features temporale
+        weather['hour'] = timestamps.hour
+        weather['day_of_week'] = timestamps.dayofweek
+        weather['month'] = timestamps.month
+        
+        with_trees = intervals and self.supports_intervals
+        if self.uses_lag_features:
+            predictions, tree_outputs = self._predict_recursive(weather, timestamps,
+                                                                lag_state.copy(), with_trees)
+        else:
+            # Prezice tot orizontul într-un singur apel
+            X, _ = self.prepare_features(weather)
+            predictions = self._predict_matrix(X)
+            tree_outputs = self._predict_tree_outputs(X) if with_trees else None
+        bands = self._interval_columns(tree_outputs, INTERVAL_QUANTILES) if with_trees else {}
+        
+        self.last_forecast_latency_ms = (time.perf_counter() - start) * 1000
+        
+        return pd.DataFrame({
+            'timestamp': timestamps,
+            'pm25_predicted': predictions,
+            **bands,
+            'temperature': weather['temperature'].values,
+            'humidity': weather['humidity'].values,
+            'wind_speed': weather['wind_speed'].values
+        })
+    
+    def _predict_recursive(self, weather: pd.DataFrame, timestamps: pd.DatetimeIndex,
+                           state: OnlineLagState,
+                           with_trees: bool = False) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """
+        Prezice oră cu oră, actualizând `state` cu fiecare predicție.
+        
+        Returns:
+            Tuple (predicții, predicțiile arborilor sau None)
+        """
+        X = np.empty((len(weather), 1, len(self.feature_columns)), dtype=np.float64)
+        lag_positions = [self.feature_columns.index(col) for col in LAG_FEATURE_COLUMNS]
+        for i, col in enumerate(self.feature_columns):
+            if col not in LAG_FEATURE_COLUMNS:
+                X[:, 0, i] = weather[col].values
+        
+        predictions = forecast_recursive(self._predict_matrix, X, timestamps, [state],
+                                         lag_positions)[:, 0]
+        # Coloanele de lag sunt acum completate: benzile se calculează într-o singură trecere
+        tree_outputs = self._predict_tree_outputs(X[:, 0]) if with_trees else None
+        return predictions, tree_outputs
+    
+    def _simulate_weather_variation_batch(self, base_weather: Dict,
+                                          hours_ahead: np.ndarray) -> pd.DataFrame:
+        """Varianta vectorizată a `_simulate_weather_variation` pentru mai multe ore."""
+        n = len(hours_ahead)
+        phase = np.sin(2 * np.pi * hours_ahead / 24)
+        
+        return pd.DataFrame({
+            'temperature': base_weather.get('temperature', 20) + 3 * phase,
+            'humidity': np.clip(base_weather.get('humidity', 60) - 5 * phase, 30, 95),
+            'pressure': base_weather.get('pressure', 1013) + np.random.normal(0, 1, n),
+            'wind_speed': base_weather.get('wind_speed', 3) + np.random.normal(0, 0.5, n),
+            'wind_direction': np.full(n, base_weather.get('wind_direction', 180), dtype=float),
+            'clouds': np.full(n, base_weather.get('clouds', 50), dtype=float)
+        })
     
     def _simulate_weather_variation(self, base_weather: Dict, hours_ahead: int) -> Dict:
         """Simulează variații meteo pentru predicții."""
@@ -294,11 +1046,51 @@ class PM25Predictor:
 
 def main():
     """Funcție principală pentru antrenarea modelului."""
-    predictor = PM25Predictor()
+    parser = argparse.ArgumentParser(description="Antrenare model PM2.5")
+    parser.add_argument('--data', default=DEFAULT_TRAINING_PATH,
+                        help="Fișierul sau directorul partiționat cu date de antrenare")
+    parser.add_argument('--chunk-rows', type=int, default=None,
+                        help="Antrenare pe bucăți de N rânduri (pentru date mai mari decât RAM-ul)")
+    parser.add_argument('--tune', type=float, default=None, metavar='SECUNDE',
+                        help="Caută hiperparametrii cu bugetul dat, apoi antrenează")
+    parser.add_argument('--tuned-params', action='store_true',
+                        help="Antrenează cu parametrii salvați de o căutare anterioară (--tune)")
+    parser.add_argument('--backtest', type=int, default=None, metavar='FOLDURI',
+                        help="Rulează doar backtest-ul cu origine mobilă (24h per fold)")
+    parser.add_argument('--compaction-report', action='store_true',
+                        help="Compară nivelurile de compactare ale modelului salvat")
+    parser.add_argument('--lag-features', action='store_true',
+                        help="Adaugă features de lag și ferestre mobile ale PM2.5 per stație")
+    parser.add_argument('--backend', choices=list(BACKENDS), default='random_forest',
+                        help="Estimatorul antrenat")
+    parser.add_argument('--evaluation', choices=EVALUATION_MODES, default='sample',
+                        help="Evaluare pe toate rândurile, pe un eșantion sau out-of-bag")
+    args = parser.parse_args()
+    
+    predictor = PM25Predictor(lag_features=args.lag_features, backend=args.backend)
+    if args.tuned_params and not args.tune:
+        if not predictor.load_tuned_params():
+            print(f"❌ Nu există parametri căutați în {predictor.tuning_path} "
+                  f"(rulați mai întâi cu --tune)")
+            return
+        print(f"🎛️ Parametri din {predictor.tuning_path}: {predictor.params}\n")
+    elif not args.tune:
+        print(f"🎛️ Parametri impliciți: {predictor.params}\n")
     
     # Antrenează modelul
     try:
-        predictor.train()
+        if args.backtest:
+            predictor.backtest(args.data, n_folds=args.backtest)
+            return
+        if args.compaction_report:
+            predictor.compaction_report(args.data)
+            return
+        if args.tune:
+            predictor.tune(args.data, budget_seconds=args.tune)
+        elif args.chunk_rows:
+            predictor.train_chunked(args.data, chunk_rows=args.chunk_rows)
+        else:
+            predictor.train(args.data, evaluation=args.evaluation)
         
         print("\n" + "="*60)
         print("✅ Model antrenat și salvat cu succes!")
@@ -317,6 +1109,9 @@ def main():
             'day_of_week': 2,
             'month': 1
         }
+        if predictor.uses_lag_features:
+            # Istoric constant: 25 μg/m³ în ultimele 24 de ore
+            test_weather.update(dict.fromkeys(LAG_FEATURE_COLUMNS, 25.0))
         
         pm25_pred = predictor.predict(test_weather)
         print(f"   PM2.5 prezis: {pm25_pred:.2f} μg/m³")
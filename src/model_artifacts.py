@@ -0,0 +1,411 @@
+"""
+Artefacte de model mapate în memorie (memory-mapped) și motor de inferență compilat.
+
+Un `RandomForestRegressor` salvat cu joblib este reconstruit complet la
+încărcare: sklearn copiază nodurile fiecărui arbore în buffere proprii, deci
+`joblib.load(mmap_mode='r')` nu ajută. Aici pădurea este aplatizată în
+câteva array-uri NumPy contigue, salvate necomprimat (`.npy`), care pot fi
+deschise cu `np.load(mmap_mode='r')`: paginile sunt încărcate la cerere și
+partajate între procese prin page cache-ul sistemului de operare.
+
+Structura unui artefact (director):
+    CURRENT              - pointer către revizia activă (înlocuit atomic)
+    revisions/<revizie>/
+        meta.json        - coloane, metrici, parametri scaler, adâncime maximă
+        children.npy     - copiii fiecărui nod, intercalați: [stâng, drept] (int32)
+        feature.npy      - feature-ul folosit la split (int32)
+        threshold.npy    - pragul de split (float64)
+        value.npy        - valoarea nodului (float64)
+        roots.npy        - indexul rădăcinii fiecărui arbore (int32)
+
+Fiecare salvare scrie o revizie nouă și apoi înlocuiește pointerul, ca în
+`ModelRegistry`: un cititor vede mereu o revizie completă.
+
+Aceleași array-uri stau la baza motorului compilat (`compile_forest`):
+scaler-ul este integrat în pragurile de split, deci un rând este evaluat
+fără `scaler.transform` și fără overhead-ul per apel al sklearn.
+"""
+
+import heapq
+import json
+import os
+import shutil
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from sklearn.preprocessing import StandardScaler
+
+ARTIFACT_VERSION = 1
+ARRAY_NAMES = ["children", "feature", "threshold", "value", "roots"]
+
+CURRENT_POINTER = "CURRENT"
+REVISIONS_DIR = "revisions"
+# Revizia anterioară este păstrată pentru cititorii care au citit deja pointerul
+KEEP_REVISIONS = 2
+
+
+def _tree_nodes(tree, max_leaves: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray, int]:
+    """
+    Alege nodurile păstrate dintr-un arbore sklearn.
+
+    Fără limită se păstrează tot arborele. Cu `max_leaves`, arborele este
+    reconstruit best-first: se expandează mereu nodul cu cea mai mare
+    reducere ponderată a impurității, până la `max_leaves` frunze; nodurile
+    neexpandate devin frunze cu valoarea (media) lor din antrenare.
+
+    Returns:
+        Tuple (noduri păstrate în numerotarea originală, mască frunze, adâncime)
+    """
+    left, right = tree.children_left, tree.children_right
+    if max_leaves is None or tree.n_leaves <= max_leaves:
+        return np.arange(tree.node_count), left == -1, int(tree.max_depth)
+
+    weighted = tree.weighted_n_node_samples * tree.impurity
+
+    def gain(node):
+        return weighted[node] - weighted[left[node]] - weighted[right[node]]
+
+    depth = {0: 0}
+    expanded = set()
+    heap = [(-gain(0), 0)] if left[0] != -1 else []
+    n_leaves = 1
+    while heap and n_leaves < max_leaves:
+        _, node = heapq.heappop(heap)
+        expanded.add(node)
+        n_leaves += 1
+        for child in (left[node], right[node]):
+            depth[child] = depth[node] + 1
+            if left[child] != -1:
+                heapq.heappush(heap, (-gain(child), child))
+
+    nodes = np.array(sorted(depth))
+    is_leaf = np.array([node not in expanded for node in nodes])
+    return nodes, is_leaf, max(depth.values())
+
+
+def flatten_forest(
+    model, trees: Optional[List[int]] = None, max_leaves: Optional[int] = None
+) -> "FlatForest":
+    """
+    Aplatizează arborii unei păduri sklearn în array-uri contigue.
+
+    Frunzele devin noduri care trimit spre ele însele (prag +inf), astfel
+    încât parcurgerea poate rula un număr fix de pași fără ramificații.
+    Copiii nodului `i` sunt `children[2 * i]` (stâng) și `children[2 * i + 1]`
+    (drept), deci pasul de parcurgere este o singură indexare.
+
+    Args:
+        model: `RandomForestRegressor` antrenat
+        trees: Indicii arborilor păstrați (implicit: toți)
+        max_leaves: Numărul maxim de frunze per arbore (vezi `_tree_nodes`)
+
+    Returns:
+        `FlatForest` cu array-urile din `ARRAY_NAMES`
+    """
+    children, features, thresholds, values, roots = [], [], [], [], []
+    offset, max_depth = 0, 0
+    estimators = model.estimators_ if trees is None else [model.estimators_[i] for i in trees]
+    for estimator in estimators:
+        tree = estimator.tree_
+        nodes, is_leaf, depth = _tree_nodes(tree, max_leaves)
+        new_ids = np.full(tree.node_count, -1)
+        new_ids[nodes] = np.arange(len(nodes)) + offset
+
+        children.append(
+            np.column_stack(
+                [
+                    np.where(is_leaf, new_ids[nodes], new_ids[tree.children_left[nodes]]),
+                    np.where(is_leaf, new_ids[nodes], new_ids[tree.children_right[nodes]]),
+                ]
+            ).ravel()
+        )
+        features.append(np.where(is_leaf, 0, tree.feature[nodes]))
+        thresholds.append(np.where(is_leaf, np.inf, tree.threshold[nodes]))
+        values.append(tree.value.reshape(tree.node_count)[nodes])
+        roots.append(offset)
+        offset += len(nodes)
+        max_depth = max(max_depth, depth)
+
+    arrays = {
+        "children": np.concatenate(children).astype(np.int32),
+        "feature": np.concatenate(features).astype(np.int32),
+        "threshold": np.concatenate(thresholds).astype(np.float64),
+        "value": np.concatenate(values).astype(np.float64),
+        "roots": np.asarray(roots, dtype=np.int32),
+    }
+    return FlatForest(arrays, max_depth, model.feature_importances_.tolist())
+
+
+class FlatForest:
+    """Pădure aplatizată, evaluată prin parcurgere vectorizată a tuturor arborilor."""
+
+    def __init__(
+        self,
+        arrays: Dict[str, np.ndarray],
+        max_depth: int,
+        feature_importances: List[float] = None,
+        folded: bool = False,
+    ):
+        """
+        Args:
+            arrays: Array-urile din `ARRAY_NAMES`
+            max_depth: Adâncimea maximă a arborilor (numărul de pași de parcurgere)
+            feature_importances: Importanța features, ca la `RandomForestRegressor`
+            folded: True dacă pragurile sunt în spațiul features brute
+                (scaler-ul a fost integrat cu `fold_scaler`)
+        """
+        self.children = arrays["children"]
+        self.feature = arrays["feature"]
+        self.threshold = arrays["threshold"]
+        self.value = arrays["value"]
+        self.roots = arrays["roots"]
+        self.max_depth = int(max_depth)
+        self.feature_importances_ = np.asarray(feature_importances or [])
+        self.folded = folded
+
+    @property
+    def n_estimators(self) -> int:
+        return len(self.roots)
+
+    @property
+    def arrays(self) -> Dict[str, np.ndarray]:
+        return {name: getattr(self, name) for name in ARRAY_NAMES}
+
+    @property
+    def nbytes(self) -> int:
+        """Dimensiunea totală a array-urilor de noduri."""
+        return sum(array.nbytes for array in self.arrays.values())
+
+    def to_float32(self) -> "FlatForest":
+        """
+        Returnează o copie cu praguri și valori float32 (și indici de feature pe 8 biți).
+
+        Pragurile sunt rotunjite în jos la float32, deci comparația
+        `float32(x) <= t` rămâne exactă; doar valorile frunzelor își pierd precizia.
+        """
+        if self.threshold.dtype == np.float32:
+            return self
+        threshold = self.threshold.astype(np.float32)
+        rounded_up = threshold.astype(np.float64) > self.threshold
+        threshold[rounded_up] = np.nextafter(threshold[rounded_up], np.float32(-np.inf))
+
+        arrays = dict(self.arrays, threshold=threshold, value=self.value.astype(np.float32))
+        if self.feature.max(initial=0) < 256:
+            arrays["feature"] = self.feature.astype(np.uint8)
+        return FlatForest(arrays, self.max_depth, self.feature_importances_.tolist(), self.folded)
+
+    def fold_scaler(self, scaler: StandardScaler) -> "FlatForest":
+        """
+        Integrează un `StandardScaler` în pragurile de split.
+
+        sklearn compară `float32((x - mean) / scale) <= t`. Pentru `scale > 0`
+        condiția este echivalentă cu `x < b`, unde `b` este limita de rotunjire
+        dintre cel mai mare float32 ≤ t și următorul float32, readusă în
+        spațiul brut. Pădurea rezultată primește features nescalate (float64)
+        și dă aceleași rezultate ca sklearn, fără `scaler.transform`.
+
+        Returns:
+            O nouă `FlatForest` (doar pragurile sunt copiate)
+        """
+        if self.folded:
+            return self
+
+        threshold = np.array(self.threshold, dtype=np.float64)
+        internal = np.isfinite(threshold)
+        features = self.feature[internal]
+
+        t = threshold[internal]
+        t32 = t.astype(np.float32)
+        t32 = np.where(t32.astype(np.float64) > t, np.nextafter(t32, np.float32(-np.inf)), t32)
+        boundary = (t32.astype(np.float64) + np.nextafter(t32, np.float32(np.inf))) / 2
+        threshold[internal] = boundary * scaler.scale_[features] + scaler.mean_[features]
+
+        arrays = dict(self.arrays, threshold=threshold)
+        return FlatForest(arrays, self.max_depth, self.feature_importances_.tolist(), folded=True)
+
+    def predict_trees(self, X: np.ndarray, chunk_size: int = 10_000) -> np.ndarray:
+        """
+        Returnează predicția fiecărui arbore pentru fiecare rând, formă (n, n_arbori).
+
+        Toate rândurile și toți arborii avansează împreună, câte un nivel pe
+        pas, timp de `max_depth` pași; frunzele rămân pe loc. Ca în sklearn,
+        features scalate sunt comparate în float32; o pădure cu scaler-ul
+        integrat primește features brute, în float64.
+        """
+        X = np.asarray(X, dtype=np.float64 if self.folded else np.float32)
+        n_features = X.shape[1]
+        outputs = np.empty((len(X), self.n_estimators), dtype=np.float64)
+
+        for start in range(0, len(X), chunk_size):
+            X_chunk = X[start : start + chunk_size]
+            X_flat = X_chunk.ravel()
+            row_offsets = (np.arange(len(X_chunk)) * n_features)[:, None]
+            nodes = np.broadcast_to(self.roots, (len(X_chunk), len(self.roots)))
+            for _ in range(self.max_depth):
+                values = np.take(X_flat, row_offsets + np.take(self.feature, nodes))
+                thresholds = np.take(self.threshold, nodes)
+                go_right = values >= thresholds if self.folded else values > thresholds
+                nodes = np.take(self.children, 2 * nodes + go_right)
+            outputs[start : start + len(X_chunk)] = np.take(self.value, nodes)
+
+        return outputs
+
+    def predict(self, X: np.ndarray, chunk_size: int = 10_000) -> np.ndarray:
+        """Prezice media arborilor pentru fiecare rând din `X`."""
+        return self.predict_trees(X, chunk_size).mean(axis=1)
+
+
+def compile_forest(model, scaler: StandardScaler) -> FlatForest:
+    """
+    Compilează un model (sklearn sau `FlatForest`) și scaler-ul său într-o
+    `FlatForest` care primește direct features brute.
+    """
+    if not isinstance(model, FlatForest):
+        model = flatten_forest(model)
+    return model.fold_scaler(scaler)
+
+
+def save_mmap_artifact(
+    path: str,
+    model,
+    scaler: StandardScaler,
+    feature_columns: List[str],
+    metrics: Dict,
+    trained_at: str,
+):
+    """
+    Salvează modelul (sklearn sau `FlatForest`) ca artefact mapabil în memorie
+    (director cu fișiere `.npy`).
+
+    Revizia nouă este scrisă complet într-un director de lucru, redenumită
+    în `revisions/<revizie>/` și abia apoi activată prin înlocuirea atomică
+    a pointerului `CURRENT`; în niciun moment nu lipsește o revizie activă.
+    """
+    forest = model if isinstance(model, FlatForest) else flatten_forest(model)
+
+    revisions_dir = os.path.join(path, REVISIONS_DIR)
+    revision = _new_revision_id(revisions_dir)
+    tmp_path = os.path.join(revisions_dir, f".staging-{revision}")
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(tmp_path)
+
+    for name, array in forest.arrays.items():
+        np.save(os.path.join(tmp_path, f"{name}.npy"), np.ascontiguousarray(array))
+
+    meta = {
+        "version": ARTIFACT_VERSION,
+        "feature_columns": feature_columns,
+        "metrics": metrics,
+        "trained_at": trained_at,
+        "max_depth": forest.max_depth,
+        "feature_importances": [float(v) for v in forest.feature_importances_],
+        "scaler": {
+            "mean": scaler.mean_.tolist(),
+            "scale": scaler.scale_.tolist(),
+            "var": scaler.var_.tolist(),
+            "n_samples_seen": int(np.max(scaler.n_samples_seen_)),
+        },
+    }
+    with open(os.path.join(tmp_path, "meta.json"), "w") as f:
+        json.dump(meta, f, indent=2)
+
+    os.rename(tmp_path, os.path.join(revisions_dir, revision))
+
+    pointer_path = os.path.join(path, CURRENT_POINTER)
+    with open(f"{pointer_path}.tmp", "w") as f:
+        f.write(revision)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(f"{pointer_path}.tmp", pointer_path)
+
+    _prune_revisions(path)
+
+
+def _new_revision_id(revisions_dir: str) -> str:
+    revision = datetime.now().strftime("%Y%m%dT%H%M%S%f")
+    candidate, suffix = revision, 0
+    while os.path.exists(os.path.join(revisions_dir, candidate)):
+        suffix += 1
+        candidate = f"{revision}-{suffix}"
+    return candidate
+
+
+def _prune_revisions(path: str):
+    """Păstrează ultimele `KEEP_REVISIONS` revizii și șterge fișierele formatului fără revizii."""
+    revisions_dir = os.path.join(path, REVISIONS_DIR)
+    current = current_revision(path)
+    revisions = sorted(name for name in os.listdir(revisions_dir) if not name.startswith("."))
+    for name in revisions[:-KEEP_REVISIONS]:
+        if name != current:
+            shutil.rmtree(os.path.join(revisions_dir, name), ignore_errors=True)
+
+    for name in ["meta.json"] + [f"{array}.npy" for array in ARRAY_NAMES]:
+        legacy_path = os.path.join(path, name)
+        if os.path.isfile(legacy_path):
+            os.remove(legacy_path)
+
+
+def current_revision(path: str) -> Optional[str]:
+    """Revizia activă a unui artefact sau None (artefact lipsă sau fără revizii)."""
+    try:
+        with open(os.path.join(path, CURRENT_POINTER), "r") as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def _build_scaler(params: Dict) -> StandardScaler:
+    """Reconstruiește un `StandardScaler` antrenat din parametrii salvați."""
+    scaler = StandardScaler()
+    scaler.mean_ = np.asarray(params["mean"])
+    scaler.scale_ = np.asarray(params["scale"])
+    scaler.var_ = np.asarray(params["var"])
+    scaler.n_samples_seen_ = params["n_samples_seen"]
+    scaler.n_features_in_ = len(scaler.mean_)
+    return scaler
+
+
+def load_mmap_artifact(path: str, mmap_mode: str = "r") -> Dict:
+    """
+    Deschide un artefact salvat cu `save_mmap_artifact`.
+
+    Args:
+        path: Directorul artefactului
+        mmap_mode: Modul de mapare (`'r'`) sau None pentru citire completă în RAM
+
+    Returns:
+        Dicționar cu aceleași chei ca fișierul joblib: model, scaler,
+        feature_columns, metrics, trained_at
+    """
+    # O salvare concurentă poate șterge revizia citită între pointer și fișiere;
+    # se reîncearcă doar dacă pointerul s-a mutat între timp
+    while True:
+        revision = current_revision(path)
+        try:
+            return _load_revision(
+                path if revision is None else os.path.join(path, REVISIONS_DIR, revision), mmap_mode
+            )
+        except FileNotFoundError:
+            if revision is None or current_revision(path) == revision:
+                raise
+
+
+def _load_revision(path: str, mmap_mode: Optional[str]) -> Dict:
+    with open(os.path.join(path, "meta.json"), "r") as f:
+        meta = json.load(f)
+    if meta.get("version") != ARTIFACT_VERSION:
+        raise ValueError(f"Versiune artefact necunoscută: {meta.get('version')}")
+
+    arrays = {
+        name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode=mmap_mode)
+        for name in ARRAY_NAMES
+    }
+
+    return {
+        "model": FlatForest(arrays, meta["max_depth"], meta.get("feature_importances")),
+        "scaler": _build_scaler(meta["scaler"]),
+        "feature_columns": meta["feature_columns"],
+        "metrics": meta.get("metrics", {}),
+        "trained_at": meta.get("trained_at"),
+    }
@@ -0,0 +1,322 @@
+"""
+Registry de modele PM2.5 cu versiuni și înlocuire la cald.
+
+Funcționalități:
+- Fiecare model publicat primește o versiune proprie (`versions/<versiune>/`),
+  scrisă complet într-un director de lucru și apoi redenumită atomic
+- Pointerul `CURRENT` indică versiunea activă și este înlocuit atomic
+  (`os.replace`), deci cititorii văd fie versiunea veche, fie pe cea nouă
+- Activarea oricărei versiuni și revenirea la versiunea anterioară (rollback)
+- `HotSwapPredictor`: urmărește pointerul în fundal și înlocuiește modelul
+  fără să blocheze predicțiile în curs (acestea se termină pe modelul vechi)
+
+Rulare:
+    python src/model_registry.py publish        # publică models/pm25_model.joblib
+    python src/model_registry.py list
+    python src/model_registry.py rollback
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import threading
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.model import PM25Predictor
+from src.prediction_cache import PredictionCache
+
+DEFAULT_REGISTRY_DIR = "models/registry"
+MODEL_FILENAME = "pm25_model.joblib"
+
+
+class ModelRegistry:
+    """Versiuni de model pe disc, cu un pointer atomic către versiunea activă."""
+
+    def __init__(self, root: str = DEFAULT_REGISTRY_DIR):
+        """
+        Args:
+            root: Directorul registry-ului (creat la prima publicare)
+        """
+        self.root = root
+        self.versions_dir = os.path.join(root, "versions")
+        self.pointer_path = os.path.join(root, "CURRENT")
+
+    def versions(self) -> List[str]:
+        """Versiunile publicate, de la cea mai veche la cea mai nouă."""
+        if not os.path.isdir(self.versions_dir):
+            return []
+        return sorted(name for name in os.listdir(self.versions_dir) if not name.startswith("."))
+
+    def current_version(self) -> Optional[str]:
+        """Versiunea activă sau None dacă nu a fost activată niciuna."""
+        try:
+            with open(self.pointer_path, "r") as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def model_path(self, version: Optional[str] = None) -> str:
+        """Fișierul joblib al unei versiuni (implicit: versiunea activă)."""
+        version = version or self.current_version()
+        if version is None:
+            raise FileNotFoundError(f"Nicio versiune activă în {self.root}")
+        return os.path.join(self.versions_dir, version, MODEL_FILENAME)
+
+    def info(self, version: str) -> Dict:
+        """Metadatele salvate la publicarea unei versiuni."""
+        with open(os.path.join(self.versions_dir, version, "version.json"), "r") as f:
+            return json.load(f)
+
+    def _new_version_id(self) -> str:
+        version = datetime.now().strftime("%Y%m%dT%H%M%S%f")
+        existing = set(self.versions())
+        suffix = 0
+        candidate = version
+        while candidate in existing:
+            suffix += 1
+            candidate = f"{version}-{suffix}"
+        return candidate
+
+    def publish(self, predictor: PM25Predictor, activate: bool = True) -> str:
+        """
+        Publică modelul unui predictor antrenat ca versiune nouă.
+
+        Modelul este salvat (`save_model`) într-un director de lucru, redenumit
+        atomic în `versions/<versiune>/` și, cu `activate=True`, devine activ.
+
+        Returns:
+            Identificatorul versiunii publicate
+        """
+        if predictor.model is None:
+            raise ValueError("Predictorul nu are un model antrenat sau încărcat")
+
+        version = self._new_version_id()
+        staging_dir = os.path.join(self.versions_dir, f".staging-{version}")
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        os.makedirs(staging_dir)
+
+        original_path = predictor.model_path
+        predictor.model_path = os.path.join(staging_dir, MODEL_FILENAME)
+        try:
+            predictor.save_model()
+        finally:
+            predictor.model_path = original_path
+
+        with open(os.path.join(staging_dir, "version.json"), "w") as f:
+            json.dump(
+                {
+                    "version": version,
+                    "published_at": datetime.now().isoformat(),
+                    "backend": predictor.backend,
+                    "feature_columns": predictor.feature_columns,
+                    "metrics": predictor.metrics.get("test"),
+                },
+                f,
+                indent=2,
+            )
+
+        os.rename(staging_dir, os.path.join(self.versions_dir, version))
+        print(f"📦 Versiune publicată: {version}")
+
+        if activate:
+            self.activate(version)
+        return version
+
+    def activate(self, version: str):
+        """Face versiunea activă (înlocuire atomică a pointerului)."""
+        if version not in self.versions():
+            raise ValueError(f"Versiune necunoscută: {version}")
+
+        tmp_path = f"{self.pointer_path}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(version)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.pointer_path)
+        print(f"✅ Versiune activă: {version}")
+
+    def rollback(self) -> str:
+        """
+        Activează versiunea publicată înaintea celei active.
+
+        Returns:
+            Versiunea activată
+
+        Raises:
+            ValueError: Dacă versiunea activă este prima (sau nu există)
+        """
+        versions = self.versions()
+        current = self.current_version()
+        if current not in versions or versions.index(current) == 0:
+            raise ValueError(f"Nu există o versiune anterioară pentru {current}")
+
+        previous = versions[versions.index(current) - 1]
+        self.activate(previous)
+        return previous
+
+    def load(self, version: Optional[str] = None, **predictor_kwargs) -> PM25Predictor:
+        """
+        Încarcă o versiune (implicit: versiunea activă) într-un predictor nou.
+
+        Args:
+            version: Versiunea încărcată
+            **predictor_kwargs: Argumente pentru `PM25Predictor` (ex: `use_mmap`, `engine`)
+        """
+        predictor = PM25Predictor(model_path=self.model_path(version), **predictor_kwargs)
+        predictor.load_model()
+        return predictor
+
+
+class HotSwapPredictor:
+    """
+    Predictor care urmărește versiunea activă din registry și o încarcă în fundal.
+
+    Noul model este încărcat complet înainte de înlocuire, iar înlocuirea este
+    o singură atribuire de referință: apelurile `predict` în curs se termină
+    pe modelul vechi, cele noi folosesc modelul nou. Metodele și atributele
+    predictorului curent (`predict`, `predict_batch`, `predict_next_24h`,
+    `metrics` etc.) sunt disponibile direct pe acest obiect.
+
+    Fiecare versiune încărcată primește propriul cache de predicții: un cache
+    comun ar putea fi reumplut de apelurile în curs pe modelul vechi după
+    înlocuire, iar modelul nou ar servi apoi valorile vechi.
+    """
+
+    def __init__(
+        self,
+        registry: ModelRegistry,
+        poll_interval: Optional[float] = 5.0,
+        prediction_cache_factory: Optional[Callable[[], PredictionCache]] = None,
+        **predictor_kwargs,
+    ):
+        """
+        Args:
+            registry: Registry-ul urmărit
+            poll_interval: Secunde între verificările pointerului (None: doar
+                manual, prin `check_for_update`)
+            prediction_cache_factory: Creează cache-ul de predicții al fiecărei
+                versiuni încărcate (ex: `PredictionCache`); None: fără cache
+            **predictor_kwargs: Argumente pentru fiecare `PM25Predictor` încărcat
+        """
+        if "prediction_cache" in predictor_kwargs:
+            raise ValueError(
+                "Folosiți prediction_cache_factory: un cache nu poate fi "
+                "împărțit între versiunile modelului"
+            )
+        self.registry = registry
+        self.poll_interval = poll_interval
+        self._prediction_cache_factory = prediction_cache_factory
+        self._predictor_kwargs = predictor_kwargs
+        self.version = registry.current_version()
+        if self.version is None:
+            raise FileNotFoundError(f"Nicio versiune activă în {registry.root}")
+        self._predictor = self._load(self.version)
+        self.swaps = 0
+        self.last_error = None
+
+        self._update_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        if poll_interval is not None:
+            self._thread = threading.Thread(
+                target=self._watch, name="model-registry-watch", daemon=True
+            )
+            self._thread.start()
+
+    @property
+    def predictor(self) -> PM25Predictor:
+        """Predictorul versiunii încărcate acum."""
+        return self._predictor
+
+    def __getattr__(self, name):
+        # Apelat doar pentru atributele care nu există pe HotSwapPredictor
+        if name == "_predictor":
+            raise AttributeError(name)
+        return getattr(self._predictor, name)
+
+    def check_for_update(self) -> bool:
+        """Încarcă versiunea activă dacă s-a schimbat. Returnează True dacă modelul a fost înlocuit."""
+        with self._update_lock:
+            version = self.registry.current_version()
+            if version is None or version == self.version:
+                return False
+
+            predictor = self._load(version)
+            self._predictor = predictor
+            previous, self.version = self.version, version
+            self.swaps += 1
+            print(f"🔄 Model înlocuit: {previous} -> {version}")
+            return True
+
+    def _load(self, version: str) -> PM25Predictor:
+        """Încarcă o versiune, cu un cache de predicții nou."""
+        kwargs = dict(self._predictor_kwargs)
+        if self._prediction_cache_factory is not None:
+            kwargs["prediction_cache"] = self._prediction_cache_factory()
+        return self.registry.load(version, **kwargs)
+
+    def _watch(self):
+        while not self._stop.wait(self.poll_interval):
+            try:
+                self.check_for_update()
+                self.last_error = None
+            except Exception as e:
+                # Versiunea veche rămâne activă; se reîncearcă la următoarea verificare
+                self.last_error = e
+                print(f"⚠️ Eroare la încărcarea versiunii noi: {e}")
+
+    def close(self):
+        """Oprește urmărirea pointerului."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "HotSwapPredictor":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def main():
+    """Comenzi pentru registry: publicare, listare, activare, rollback."""
+    parser = argparse.ArgumentParser(description="Registry de modele PM2.5")
+    parser.add_argument("--root", default=DEFAULT_REGISTRY_DIR, help="Directorul registry-ului")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    publish_parser = subparsers.add_parser("publish", help="Publică un model antrenat")
+    publish_parser.add_argument(
+        "--model", default="models/pm25_model.joblib", help="Fișierul joblib publicat"
+    )
+    publish_parser.add_argument(
+        "--no-activate", action="store_true", help="Publică fără a activa versiunea"
+    )
+    subparsers.add_parser("list", help="Listează versiunile")
+    activate_parser = subparsers.add_parser("activate", help="Activează o versiune")
+    activate_parser.add_argument("version")
+    subparsers.add_parser("rollback", help="Revine la versiunea anterioară")
+    args = parser.parse_args()
+
+    registry = ModelRegistry(args.root)
+    if args.command == "publish":
+        predictor = PM25Predictor(model_path=args.model)
+        predictor.load_model()
+        registry.publish(predictor, activate=not args.no_activate)
+    elif args.command == "list":
+        current = registry.current_version()
+        for version in registry.versions():
+            test = registry.info(version).get("metrics") or {}
+            marker = "*" if version == current else " "
+            print(f"{marker} {version}  RMSE test: {test.get('rmse', float('nan')):.2f}")
+    elif args.command == "activate":
+        registry.activate(args.version)
+    else:
+        registry.rollback()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+"""
+Modul pentru colectarea datelor din mai multe orașe în paralel.
+
+Funcționalități:
+- Colectare PM2.5 + meteo pentru o listă de orașe, pe un pool de procese
+- Dataset partiționat pe orașe (`city=<oraș>/part-0.<ext>`)
+- Raport cu durata și eventualele erori per oraș
+"""
+
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError, as_completed
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+# Adaugă directorul părinte la path pentru import module
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data_collection import DataCollector
+from src.process_pool import terminate_workers
+from src.rate_limiter import TokenBucket
+from src.storage import partition_path, write_training_data
+
+# Orașe mari din România (oraș, țară, latitudine, longitudine)
+ROMANIAN_CITIES = [
+    {"city": "Bucharest", "country": "RO", "lat": 44.4268, "lon": 26.1025},
+    {"city": "Cluj-Napoca", "country": "RO", "lat": 46.7712, "lon": 23.6236},
+    {"city": "Timisoara", "country": "RO", "lat": 45.7489, "lon": 21.2087},
+    {"city": "Iasi", "country": "RO", "lat": 47.1585, "lon": 27.6014},
+    {"city": "Constanta", "country": "RO", "lat": 44.1598, "lon": 28.6348},
+    {"city": "Craiova", "country": "RO", "lat": 44.3302, "lon": 23.7949},
+    {"city": "Brasov", "country": "RO", "lat": 45.6427, "lon": 25.5887},
+    {"city": "Galati", "country": "RO", "lat": 45.4353, "lon": 28.0080},
+]
+
+
+def _collect_city(
+    location: Dict, days: int, output_dir: str, weather_calls_per_minute: float
+) -> Dict:
+    """
+    Colectează datele unui singur oraș (rulează într-un proces worker).
+
+    Datele PM2.5 simulate nu sunt folosite: fără măsurători reale orașul
+    este raportat ca eșuat, în loc să primească o partiție cu date false.
+
+    Returns:
+        Dicționar cu orașul, numărul de rânduri, durata, calea partiției și
+        numărul de rânduri completate cu date simulate, pe tip
+
+    Raises:
+        ValueError: Dacă OpenAQ nu a returnat măsurători pentru oraș
+    """
+    start = time.perf_counter()
+    collector = DataCollector(
+        city=location["city"],
+        country=location.get("country"),
+        lat=location.get("lat"),
+        lon=location.get("lon"),
+    )
+    collector.weather_rate_limiter = TokenBucket.per_minute(weather_calls_per_minute)
+
+    pm25_df = collector.get_air_quality_data(days, synthetic_fallback=False)
+    if pm25_df.empty:
+        raise ValueError(f"Nu există măsurători PM2.5 reale pentru {location['city']}")
+    combined_df = collector._enrich_with_weather(pm25_df)
+
+    path = partition_path(output_dir, location["city"])
+    write_training_data(combined_df, path)
+
+    return {
+        "city": location["city"],
+        "rows": len(combined_df),
+        "seconds": time.perf_counter() - start,
+        "path": path,
+        "fallbacks": collector.stats.to_dict()["fallbacks"],
+    }
+
+
+def collect_cities(
+    locations: List[Dict],
+    days: int = 30,
+    output_dir: str = "data/cities",
+    max_workers: Optional[int] = None,
+    timeout: Optional[float] = None,
+) -> pd.DataFrame:
+    """
+    Colectează datele pentru mai multe orașe în paralel.
+
+    Fiecare oraș este procesat într-un proces separat și scris în propria
+    partiție, deci un oraș lent sau care eșuează nu le blochează pe celelalte.
+    Cota OpenWeatherMap este împărțită egal între procese.
+
+    Args:
+        locations: Listă de dicționare cu cheile `city`, `country`, `lat`, `lon`
+        days: Numărul de zile de date de colectat
+        output_dir: Directorul dataset-ului partiționat
+        max_workers: Numărul de procese (implicit: min(orașe, CPU-uri))
+        timeout: Timp maxim total în secunde; orașele neterminate sunt
+            raportate ca eșuate, iar procesele lor sunt oprite
+
+    Returns:
+        DataFrame cu raportul per oraș (rânduri, durată, status, eroare și
+        rândurile completate cu date simulate)
+    """
+    columns = ["city", "rows", "seconds", "status", "error", "fallbacks", "path"]
+    if not locations:
+        print("⚠️ Nu există orașe de colectat")
+        return pd.DataFrame(columns=columns)
+
+    max_workers = max_workers or min(len(locations), os.cpu_count() or 1)
+    calls_per_minute = float(os.getenv("WEATHER_API_CALLS_PER_MINUTE", "60")) / max_workers
+
+    print(f"\n🏙️ Colectare date pentru {len(locations)} orașe pe {max_workers} procese...\n")
+
+    report = []
+    executor = ProcessPoolExecutor(max_workers=max_workers)
+    futures = {
+        executor.submit(_collect_city, location, days, output_dir, calls_per_minute): location
+        for location in locations
+    }
+
+    try:
+        for future in as_completed(futures, timeout=timeout):
+            city = futures[future]["city"]
+            try:
+                result = future.result()
+                result.update(status="ok", error=None)
+                print(
+                    f"  ✅ {city}: {result['rows']} înregistrări în {result['seconds']:.1f}s"
+                    + (f" (fallback simulat: {result['fallbacks']})" if result["fallbacks"] else "")
+                )
+            except Exception as e:
+                result = {
+                    "city": city,
+                    "rows": 0,
+                    "seconds": None,
+                    "path": None,
+                    "fallbacks": None,
+                    "status": "eroare",
+                    "error": str(e),
+                }
+                print(f"  ❌ {city}: {e}")
+            report.append(result)
+    except TimeoutError:
+        for future, location in futures.items():
+            if not future.done():
+                future.cancel()
+                report.append(
+                    {
+                        "city": location["city"],
+                        "rows": 0,
+                        "seconds": None,
+                        "path": None,
+                        "fallbacks": None,
+                        "status": "timeout",
+                        "error": f"Nu s-a terminat în {timeout}s",
+                    }
+                )
+                print(f"  ⏱️ {location['city']}: timeout")
+    finally:
+        terminate_workers(executor)
+
+    report_df = pd.DataFrame(report, columns=columns)
+    n_ok = (report_df["status"] == "ok").sum()
+    print(
+        f"\n📊 {n_ok}/{len(locations)} orașe colectate, "
+        f"{report_df['rows'].sum()} înregistrări în {output_dir}"
+    )
+
+    return report_df
+
+
+def main():
+    """Funcție principală pentru colectarea datelor din mai multe orașe."""
+    report_df = collect_cities(ROMANIAN_CITIES, days=30)
+    print(report_df[["city", "rows", "seconds", "status"]].to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Cache în memorie pentru predicțiile PM2.5.
+
+Funcționalități:
+- Chei construite din features cuantizate la rezoluții configurabile
+  (ex: 0.1 °C, 1 % umiditate), deci condiții meteo aproape identice
+  refolosesc aceeași predicție
+- Evacuare LRU la depășirea numărului maxim de intrări
+- Invalidare completă la încărcarea unui model nou (`clear`)
+- Contoare hit/miss/evacuări
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+# Rezoluția de cuantizare per feature; 0 înseamnă valoare exactă
+DEFAULT_RESOLUTIONS = {
+    "temperature": 0.1,  # °C
+    "humidity": 1.0,  # %
+    "pressure": 1.0,  # hPa
+    "wind_speed": 0.1,  # m/s
+    "wind_direction": 5.0,  # grade
+    "clouds": 1.0,  # %
+    "hour": 1.0,
+    "day_of_week": 1.0,
+    "month": 1.0,
+}
+
+
+class PredictionCache:
+    """Cache LRU thread-safe: features cuantizate -> predicție."""
+
+    def __init__(self, resolutions: Optional[Dict[str, float]] = None, max_entries: int = 10_000):
+        """
+        Args:
+            resolutions: Rezoluția per feature (completează `DEFAULT_RESOLUTIONS`)
+            max_entries: Numărul maxim de predicții păstrate
+        """
+        if max_entries <= 0:
+            raise ValueError(f"max_entries trebuie să fie pozitiv: {max_entries}")
+
+        self.resolutions = dict(DEFAULT_RESOLUTIONS, **(resolutions or {}))
+        self.max_entries = max_entries
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def hit_rate(self) -> float:
+        """Proporția rândurilor servite din cache."""
+        total = self.stats["hits"] + self.stats["misses"]
+        return self.stats["hits"] / total if total else 0.0
+
+    def quantize(self, X: np.ndarray, feature_columns: List[str]) -> np.ndarray:
+        """
+        Rotunjește fiecare coloană la rezoluția ei.
+
+        Predicția este calculată pe valorile cuantizate, deci rezultatul nu
+        depinde de ordinea în care au sosit cererile din aceeași celulă.
+        """
+        resolutions = np.array([self.resolutions.get(col, 0.0) for col in feature_columns])
+        exact = resolutions <= 0
+        steps = np.where(exact, 1.0, resolutions)
+        quantized = np.round(np.asarray(X, dtype=np.float64) / steps) * steps
+        # +0.0 elimină -0.0, ca valorile egale să aibă aceeași cheie
+        return np.where(exact, X, quantized) + 0.0
+
+    def get_or_compute(
+        self, X: np.ndarray, feature_columns: List[str], compute: Callable[[np.ndarray], np.ndarray]
+    ) -> np.ndarray:
+        """
+        Returnează predicțiile pentru `X`, calculând doar rândurile lipsă.
+
+        Rândurile care nu sunt în cache sunt evaluate într-un singur apel
+        `compute`, apoi adăugate în cache.
+
+        Args:
+            X: Matrice (n, n_features) în ordinea `feature_columns`
+            feature_columns: Numele coloanelor din `X`
+            compute: Funcția de predicție pentru o matrice de features
+
+        Returns:
+            Vector de predicții
+        """
+        X_quantized = self.quantize(X, feature_columns)
+        keys = [row.tobytes() for row in X_quantized]
+        predictions = np.empty(len(keys), dtype=np.float64)
+        missing = []
+
+        with self._lock:
+            for i, key in enumerate(keys):
+                value = self._entries.get(key)
+                if value is None:
+                    missing.append(i)
+                else:
+                    self._entries.move_to_end(key)
+                    predictions[i] = value
+            self.stats["hits"] += len(keys) - len(missing)
+            self.stats["misses"] += len(missing)
+
+        if missing:
+            predictions[missing] = compute(X_quantized[missing])
+            with self._lock:
+                for i in missing:
+                    self._entries[keys[i]] = float(predictions[i])
+                    self._entries.move_to_end(keys[i])
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self.stats["evictions"] += 1
+
+        return predictions
+
+    def clear(self):
+        """Șterge toate predicțiile (ex: după încărcarea unui model nou)."""
+        with self._lock:
+            if self._entries:
+                self.stats["invalidations"] += 1
+            self._entries.clear()
@@ -0,0 +1,26 @@
+"""
+Utilitare pentru pool-urile de procese.
+
+`ProcessPoolExecutor.shutdown(wait=False)` nu oprește task-urile aflate deja
+în execuție: procesele worker continuă să ruleze (și să ocupe CPU-urile)
+până termină, iar interpretorul le așteaptă la ieșire. Pentru bugete de timp
+și timeout-uri, procesele trebuie oprite explicit.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+
+
+def terminate_workers(executor: ProcessPoolExecutor):
+    """
+    Oprește pool-ul și termină imediat procesele worker, inclusiv task-urile în curs.
+
+    Future-urile neterminate nu mai primesc rezultat; apelantul trebuie să
+    le fi raportat deja (ex: ca `timeout`).
+    """
+    processes = list((executor._processes or {}).values())
+    executor.shutdown(wait=False)
+    for process in processes:
+        if process.is_alive():
+            process.terminate()
+    for process in processes:
+        process.join()
@@ -0,0 +1,60 @@
+"""
+Limitator de rată de tip token bucket pentru apelurile către API-uri externe.
+
+Funcționalități:
+- Respectarea cotei de apeluri (ex: 60 apeluri/minut pentru OpenWeatherMap)
+- Permite rafale scurte până la capacitatea bucket-ului
+- Sigur pentru utilizare din mai multe thread-uri
+"""
+
+import threading
+import time
+
+
+class TokenBucket:
+    """Token bucket thread-safe: fiecare apel consumă un token."""
+
+    def __init__(self, rate: float, capacity: float = None):
+        """
+        Args:
+            rate: Număr de token-uri adăugate pe secundă
+            capacity: Număr maxim de token-uri acumulate (implicit: `rate`, minim 1)
+        """
+        if rate <= 0:
+            raise ValueError(f"Rata trebuie să fie pozitivă: {rate}")
+
+        self.rate = float(rate)
+        self.capacity = float(capacity) if capacity is not None else max(1.0, self.rate)
+        self._tokens = self.capacity
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def per_minute(cls, calls_per_minute: float, capacity: float = None) -> "TokenBucket":
+        """Creează un bucket dintr-o cotă exprimată în apeluri/minut."""
+        return cls(calls_per_minute / 60.0, capacity)
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._last_refill) * self.rate)
+        self._last_refill = now
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """Consumă token-uri dacă sunt disponibile, fără a aștepta."""
+        with self._lock:
+            self._refill()
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return True
+            return False
+
+    def acquire(self, tokens: float = 1.0):
+        """Blochează până când sunt disponibile `tokens` token-uri și le consumă."""
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait = (tokens - self._tokens) / self.rate
+            time.sleep(wait)
@@ -0,0 +1,214 @@
+"""
+Cache persistent pe disc pentru răspunsurile JSON ale API-urilor externe.
+
+Funcționalități:
+- Chei construite din URL + parametri normalizați (fără cheia API)
+- TTL configurabil per endpoint (ex: `measurements`, `weather`)
+- Revalidare condiționată cu ETag / Last-Modified (răspuns 304)
+- Evacuare LRU când dimensiunea totală depășește limita
+- Contoare hit/miss
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Callable, Dict, Iterable, Optional
+
+import requests
+
+DEFAULT_TTLS = {
+    "measurements": 3600,  # date PM2.5 orare
+    "weather": 600,  # condiții meteo curente
+    "forecast": 1800,  # prognoză meteo
+    "history/city": 7 * 86400,  # meteo istoric (nu se mai modifică)
+}
+
+
+class ResponseCache:
+    """Cache LRU pe disc, cu TTL per endpoint, pentru răspunsuri JSON."""
+
+    def __init__(
+        self,
+        cache_dir: str,
+        max_bytes: int = 50 * 1024 * 1024,
+        ttls: Optional[Dict[str, float]] = None,
+        default_ttl: float = 3600,
+        ignored_params: Iterable[str] = ("appid",),
+    ):
+        """
+        Args:
+            cache_dir: Directorul în care se salvează intrările
+            max_bytes: Dimensiunea maximă totală a cache-ului
+            ttls: TTL în secunde per endpoint (completează `DEFAULT_TTLS`)
+            default_ttl: TTL pentru endpoint-uri fără valoare explicită
+            ignored_params: Parametri excluși din cheie (ex: cheia API)
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.ttls = dict(DEFAULT_TTLS, **(ttls or {}))
+        self.default_ttl = default_ttl
+        self.ignored_params = set(ignored_params)
+        self.stats = {"hits": 0, "misses": 0, "revalidated": 0, "evictions": 0}
+
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+
+        # Index în memorie: cheie -> (dimensiune, ultimul acces); ordinea LRU
+        # supraviețuiește repornirii prin mtime-ul fișierelor
+        self._index = {}
+        for name in os.listdir(cache_dir):
+            if name.endswith(".json"):
+                stat = os.stat(os.path.join(cache_dir, name))
+                self._index[name[:-5]] = (stat.st_size, stat.st_mtime)
+        self._total_bytes = sum(size for size, _ in self._index.values())
+
+    def make_key(self, url: str, params: Optional[Dict] = None) -> str:
+        """Construiește cheia de cache din URL și parametri normalizați."""
+        normalized = sorted(
+            (str(k), str(v))
+            for k, v in (params or {}).items()
+            if k not in self.ignored_params and v is not None
+        )
+        raw = json.dumps([url, normalized], ensure_ascii=False)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def ttl_for(self, endpoint: str) -> float:
+        """Returnează TTL-ul pentru un endpoint."""
+        return self.ttls.get(endpoint, self.default_ttl)
+
+    @property
+    def hit_rate(self) -> float:
+        """Proporția cererilor servite din cache (inclusiv revalidate)."""
+        served = self.stats["hits"] + self.stats["revalidated"]
+        total = served + self.stats["misses"]
+        return served / total if total else 0.0
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _read(self, key: str) -> Optional[Dict]:
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _touch(self, key: str):
+        now = time.time()
+        with self._lock:
+            if key in self._index:
+                self._index[key] = (self._index[key][0], now)
+        try:
+            os.utime(self._path(key), (now, now))
+        except OSError:
+            pass
+
+    def _write(self, key: str, entry: Dict):
+        data = json.dumps(entry, ensure_ascii=False).encode("utf-8")
+        tmp_path = f"{self._path(key)}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, self._path(key))
+
+        with self._lock:
+            old_size = self._index.get(key, (0, 0))[0]
+            self._index[key] = (len(data), time.time())
+            self._total_bytes += len(data) - old_size
+            self._evict()
+
+    def _evict(self):
+        """Elimină intrările cel mai puțin recent folosite (apelat sub lock)."""
+        while self._total_bytes > self.max_bytes and len(self._index) > 1:
+            key = min(self._index, key=lambda k: self._index[k][1])
+            size, _ = self._index.pop(key)
+            self._total_bytes -= size
+            self.stats["evictions"] += 1
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+    def clear(self):
+        """Șterge toate intrările din cache."""
+        with self._lock:
+            for key in list(self._index):
+                try:
+                    os.remove(self._path(key))
+                except OSError:
+                    pass
+            self._index.clear()
+            self._total_bytes = 0
+
+    def fetch(
+        self,
+        session: requests.Session,
+        url: str,
+        params: Optional[Dict] = None,
+        endpoint: str = "",
+        before_request: Optional[Callable[[], None]] = None,
+        on_response: Optional[Callable[[requests.Response, float], None]] = None,
+    ):
+        """
+        Returnează corpul JSON pentru `url` + `params`, din cache dacă e posibil.
+
+        Args:
+            session: Sesiunea HTTP folosită pentru request-uri
+            url: URL-ul complet al endpoint-ului
+            params: Parametrii query
+            endpoint: Numele endpoint-ului (pentru TTL)
+            before_request: Apelat înaintea fiecărui request de rețea
+                (ex: limitatorul de rată); nu este apelat pentru hit-uri
+            on_response: Apelat cu (răspuns, durată în secunde) după fiecare
+                request de rețea (ex: instrumentare)
+
+        Returns:
+            Corpul răspunsului JSON
+        """
+        key = self.make_key(url, params)
+        entry = self._read(key)
+        now = time.time()
+
+        if entry is not None and now - entry["stored_at"] < self.ttl_for(endpoint):
+            with self._lock:
+                self.stats["hits"] += 1
+            self._touch(key)
+            return entry["body"]
+
+        headers = {}
+        if entry is not None:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        if before_request is not None:
+            before_request()
+        start = time.perf_counter()
+        response = session.get(url, params=params, headers=headers or None)
+        if on_response is not None:
+            on_response(response, time.perf_counter() - start)
+
+        if entry is not None and headers and response.status_code == 304:
+            with self._lock:
+                self.stats["revalidated"] += 1
+            entry["stored_at"] = now
+            self._write(key, entry)
+            return entry["body"]
+
+        response.raise_for_status()
+        body = response.json()
+        with self._lock:
+            self.stats["misses"] += 1
+        self._write(
+            key,
+            {
+                "url": url,
+                "stored_at": now,
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "body": body,
+            },
+        )
+        return body
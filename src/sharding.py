@@ -0,0 +1,368 @@
+"""
+Antrenare sharded: câte un model PM2.5 per oraș (sau per stație).
+
+Funcționalități:
+- Dataset-ul este citit o singură dată și împărțit după `city` sau `location`
+- Fiecare shard este antrenat într-un proces separat, pe un pool de procese;
+  thread-urile per proces sunt limitate (`n_jobs` al pădurii și, prin
+  threadpoolctl, OpenMP/BLAS), astfel încât procese × thread-uri ≤ CPU-uri
+- Layout cu un model per shard (`<cheie>=<valoare>/pm25_model.joblib`) și
+  un manifest `shards.json` scris atomic
+- `ShardedPredictor`: trimite fiecare cerere la modelul shard-ului ei, cu
+  încărcare leneșă a modelelor și fallback opțional la un model global
+
+Rulare:
+    python src/sharding.py --data data/cities --by city
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import redirect_stdout
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from threadpoolctl import threadpool_limits
+
+# Adaugă directorul părinte la path pentru import module
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.model import PM25Predictor
+from src.storage import DEFAULT_TRAINING_PATH, read_training_data, write_training_data
+
+DEFAULT_SHARDS_DIR = "models/shards"
+SHARD_KEYS = ("city", "location")
+MANIFEST_FILENAME = "shards.json"
+MODEL_FILENAME = "pm25_model.joblib"
+
+
+def shard_dir_name(shard_by: str, shard: str) -> str:
+    """Numele directorului unui shard (`<cheie>=<valoare>`)."""
+    safe_shard = str(shard).replace(os.sep, "_").replace(" ", "_")
+    return f"{shard_by}={safe_shard}"
+
+
+def threads_per_worker(max_workers: int) -> int:
+    """Thread-urile alocate fiecărui proces, astfel încât procesele să nu suprasolicite CPU-urile."""
+    return max(1, (os.cpu_count() or 1) // max_workers)
+
+
+def _train_shard(
+    shard: str,
+    data_path: str,
+    model_path: str,
+    threads: int,
+    predictor_kwargs: Dict,
+    train_kwargs: Dict,
+) -> Dict:
+    """
+    Antrenează modelul unui shard (rulează într-un proces worker).
+
+    Mesajele antrenării sunt scrise în `train.log`, lângă model.
+
+    Returns:
+        Dicționar cu shard-ul, rândurile de antrenare (fără setul de test),
+        durata, RMSE-ul de test și calea modelului
+    """
+    start = time.perf_counter()
+    log_path = os.path.join(os.path.dirname(model_path), "train.log")
+    os.makedirs(os.path.dirname(model_path), exist_ok=True)
+
+    with open(log_path, "w") as log, redirect_stdout(log), threadpool_limits(limits=threads):
+        predictor = PM25Predictor(model_path=model_path, n_jobs=threads, **predictor_kwargs)
+        predictor.train(data_path, **train_kwargs)
+
+    return {
+        "shard": shard,
+        "train_rows": predictor.metrics["training"]["rows"],
+        "seconds": time.perf_counter() - start,
+        "test_rmse": predictor.metrics["test"]["rmse"],
+        "threads": threads,
+        "path": model_path,
+    }
+
+
+def _write_manifest(output_dir: str, manifest: Dict):
+    path = os.path.join(output_dir, MANIFEST_FILENAME)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def train_shards(
+    data_path: str,
+    output_dir: str = DEFAULT_SHARDS_DIR,
+    shard_by: str = "city",
+    max_workers: Optional[int] = None,
+    min_rows: int = 500,
+    predictor_kwargs: Optional[Dict] = None,
+    train_kwargs: Optional[Dict] = None,
+) -> pd.DataFrame:
+    """
+    Antrenează câte un model per shard, în paralel.
+
+    Fiecare proces primește `CPU-uri // procese` thread-uri (minim 1), deci
+    `n_jobs=-1` într-un shard nu mai pornește câte un thread per CPU în
+    fiecare proces. Un shard care eșuează nu le blochează pe celelalte și
+    nu apare în manifest.
+
+    Args:
+        data_path: Dataset-ul de antrenare (fișier sau director partiționat)
+        output_dir: Directorul cu modelele per shard și `shards.json`
+        shard_by: Coloana după care se împart datele (`city` sau `location`)
+        max_workers: Numărul de procese (implicit: min(shard-uri, CPU-uri))
+        min_rows: Shard-urile cu mai puține rânduri sunt sărite
+        predictor_kwargs: Argumente pentru fiecare `PM25Predictor`
+            (ex: `backend`, `params`, `lag_features`)
+        train_kwargs: Argumente pentru `PM25Predictor.train` (ex: `evaluation`)
+
+    Returns:
+        DataFrame cu raportul per shard (rândurile shard-ului, rândurile de
+        antrenare, durată, RMSE, status, eroare)
+    """
+    if shard_by not in SHARD_KEYS:
+        raise ValueError(f"Cheie de sharding necunoscută: {shard_by} (disponibile: {SHARD_KEYS})")
+    predictor_kwargs = dict(predictor_kwargs or {})
+    train_kwargs = dict(train_kwargs or {})
+
+    columns = PM25Predictor(**predictor_kwargs)._training_columns()
+    df = read_training_data(data_path, columns=list(dict.fromkeys(columns + [shard_by])))
+    groups = df.groupby(shard_by, observed=True, sort=True).indices
+
+    report = []
+    shards = {}
+    for shard, rows in groups.items():
+        if len(rows) < min_rows:
+            report.append(
+                {
+                    "shard": shard,
+                    "rows": len(rows),
+                    "train_rows": None,
+                    "seconds": None,
+                    "test_rmse": None,
+                    "threads": None,
+                    "path": None,
+                    "status": "sărit",
+                    "error": f"Sub {min_rows} rânduri",
+                }
+            )
+        else:
+            shards[shard] = rows
+    if not shards:
+        raise ValueError(f"Niciun shard cu cel puțin {min_rows} rânduri în {data_path}")
+
+    max_workers = max_workers or min(len(shards), os.cpu_count() or 1)
+    threads = threads_per_worker(max_workers)
+    print(
+        f"\n🧩 Antrenare {len(shards)} modele per {shard_by} pe {max_workers} procese "
+        f"× {threads} thread-uri...\n"
+    )
+
+    extension = os.path.splitext(DEFAULT_TRAINING_PATH)[1]
+    with tempfile.TemporaryDirectory() as data_dir:
+        # Fiecare shard este scris o dată; workerii citesc doar fișierul lor
+        futures = {}
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            for shard, rows in shards.items():
+                name = shard_dir_name(shard_by, shard)
+                shard_path = os.path.join(data_dir, f"{name}{extension}")
+                write_training_data(df.iloc[rows], shard_path)
+                model_path = os.path.join(output_dir, name, MODEL_FILENAME)
+                future = executor.submit(
+                    _train_shard,
+                    shard,
+                    shard_path,
+                    model_path,
+                    threads,
+                    predictor_kwargs,
+                    train_kwargs,
+                )
+                futures[future] = shard
+            del df
+
+            for future in as_completed(futures):
+                shard = futures[future]
+                try:
+                    result = future.result()
+                    result.update(rows=len(shards[shard]), status="ok", error=None)
+                    print(
+                        f"  ✅ {shard}: {result['rows']:,} rânduri, "
+                        f"RMSE {result['test_rmse']:.2f}, {result['seconds']:.1f}s"
+                    )
+                except Exception as e:
+                    result = {
+                        "shard": shard,
+                        "rows": len(shards[shard]),
+                        "train_rows": None,
+                        "seconds": None,
+                        "test_rmse": None,
+                        "threads": threads,
+                        "path": None,
+                        "status": "eroare",
+                        "error": str(e),
+                    }
+                    print(f"  ❌ {shard}: {e}")
+                report.append(result)
+
+    report_df = pd.DataFrame(
+        report,
+        columns=[
+            "shard",
+            "rows",
+            "train_rows",
+            "seconds",
+            "test_rmse",
+            "threads",
+            "status",
+            "error",
+            "path",
+        ],
+    )
+    trained = report_df[report_df["status"] == "ok"]
+    _write_manifest(
+        output_dir,
+        {
+            "shard_by": shard_by,
+            "trained_at": datetime.now().isoformat(),
+            "shards": {
+                row.shard: {
+                    "path": os.path.relpath(row.path, output_dir),
+                    "rows": int(row.rows),
+                    "train_rows": int(row.train_rows),
+                    "test_rmse": float(row.test_rmse),
+                }
+                for row in trained.itertuples()
+            },
+        },
+    )
+
+    print(f"\n📊 {len(trained)}/{len(groups)} shard-uri antrenate în {output_dir}")
+    return report_df
+
+
+class ShardedPredictor:
+    """
+    Predictor care trimite fiecare cerere la modelul shard-ului ei.
+
+    Modelele sunt încărcate la prima cerere pentru shard-ul respectiv. O
+    cerere pentru un shard fără model folosește predictorul `fallback`
+    (ex: modelul global), dacă există.
+    """
+
+    def __init__(
+        self,
+        root: str = DEFAULT_SHARDS_DIR,
+        fallback: Optional[PM25Predictor] = None,
+        **predictor_kwargs,
+    ):
+        """
+        Args:
+            root: Directorul scris de `train_shards`
+            fallback: Predictor folosit pentru shard-urile fără model
+            **predictor_kwargs: Argumente pentru fiecare `PM25Predictor` încărcat
+                (ex: `use_mmap`, `engine`)
+        """
+        with open(os.path.join(root, MANIFEST_FILENAME), "r") as f:
+            manifest = json.load(f)
+        self.root = root
+        self.shard_by = manifest["shard_by"]
+        self.manifest = manifest
+        self.fallback = fallback
+        self._predictor_kwargs = predictor_kwargs
+        self._predictors = {}
+        self._load_lock = threading.Lock()
+
+    @property
+    def shards(self) -> List[str]:
+        """Shard-urile cu model antrenat."""
+        return list(self.manifest["shards"])
+
+    def predictor_for(self, shard: str) -> PM25Predictor:
+        """
+        Predictorul unui shard (încărcat la prima cerere).
+
+        Raises:
+            ValueError: Dacă shard-ul nu are model și nu există fallback
+        """
+        predictor = self._predictors.get(shard)
+        if predictor is not None:
+            return predictor
+
+        if shard not in self.manifest["shards"]:
+            if self.fallback is None:
+                raise ValueError(f"Nu există model pentru {self.shard_by}={shard}")
+            return self.fallback
+
+        with self._load_lock:
+            if shard not in self._predictors:
+                model_path = os.path.join(self.root, self.manifest["shards"][shard]["path"])
+                predictor = PM25Predictor(model_path=model_path, **self._predictor_kwargs)
+                predictor.load_model()
+                self._predictors[shard] = predictor
+        return self._predictors[shard]
+
+    def _shard_of(self, weather_data: Dict) -> str:
+        if self.shard_by not in weather_data:
+            raise ValueError(f"Cererea nu conține cheia de sharding: {self.shard_by}")
+        return weather_data[self.shard_by]
+
+    def predict(self, weather_data: Dict) -> float:
+        """Predicție pentru o observație; shard-ul este dat de cheia `shard_by` din date."""
+        return self.predictor_for(self._shard_of(weather_data)).predict(weather_data)
+
+    def predict_batch(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        Predicții pentru un lot cu rânduri din mai multe shard-uri.
+
+        Rândurile sunt grupate pe shard, fiecare grup este prezis de modelul
+        lui, iar rezultatele revin în ordinea inițială.
+        """
+        self._shard_of(df)
+        predictions = np.empty(len(df))
+        for shard, rows in df.groupby(self.shard_by, observed=True, sort=False).indices.items():
+            predictions[rows] = self.predictor_for(shard).predict_batch(df.iloc[rows])
+        return predictions
+
+    def predict_next_24h(self, shard: str, current_weather: Dict, **kwargs) -> pd.DataFrame:
+        """Prognoza pe următoarele ore cu modelul shard-ului (vezi `PM25Predictor.predict_next_24h`)."""
+        return self.predictor_for(shard).predict_next_24h(current_weather, **kwargs)
+
+
+def main():
+    """Antrenează câte un model per oraș (sau stație)."""
+    parser = argparse.ArgumentParser(description="Antrenare PM2.5 cu un model per shard")
+    parser.add_argument(
+        "--data",
+        default=DEFAULT_TRAINING_PATH,
+        help="Fișierul sau directorul partiționat de antrenare",
+    )
+    parser.add_argument("--output", default=DEFAULT_SHARDS_DIR, help="Directorul modelelor")
+    parser.add_argument("--by", choices=SHARD_KEYS, default="city", help="Cheia de sharding")
+    parser.add_argument("--workers", type=int, default=None, help="Numărul de procese")
+    parser.add_argument(
+        "--min-rows", type=int, default=500, help="Numărul minim de rânduri per shard"
+    )
+    parser.add_argument("--backend", default="random_forest", help="Estimatorul fiecărui shard")
+    args = parser.parse_args()
+
+    report_df = train_shards(
+        args.data,
+        output_dir=args.output,
+        shard_by=args.by,
+        max_workers=args.workers,
+        min_rows=args.min_rows,
+        predictor_kwargs={"backend": args.backend},
+    )
+    print(report_df[["shard", "rows", "seconds", "test_rmse", "status"]].to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
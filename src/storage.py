@@ -0,0 +1,318 @@
+"""
+Modul pentru stocarea dataset-ului de antrenare.
+
+Funcționalități:
+- Schemă explicită: măsurători float32, locații categorice, timestamp-uri native
+- Format columnar (Parquet/Feather) cu proiecție pe coloane la citire
+- Format CSV păstrat pentru export
+- Citire pe bucăți (`iter_training_data`) pentru dataset-uri mai mari decât memoria
+- Adăugări incrementale în fișiere delta (`<dataset>.parts/part-*`), compactate periodic
+"""
+
+import glob
+import os
+import shutil
+from typing import Iterator, List, Optional
+
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401
+
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+
+# Schema dataset-ului de antrenare (coloană -> dtype pandas)
+TRAINING_SCHEMA = {
+    "timestamp": "datetime64[ns]",
+    "pm25": "float32",
+    "location": "category",
+    "city": "category",
+    "country": "category",
+    "temperature": "float32",
+    "humidity": "float32",
+    "pressure": "float32",
+    "wind_speed": "float32",
+    "wind_direction": "float32",
+    "clouds": "float32",
+    "hour": "int8",
+    "day_of_week": "int8",
+    "month": "int8",
+}
+
+COLUMNAR_FORMATS = {".parquet", ".feather"}
+
+# Numărul de fișiere delta după care `append_training_data` compactează dataset-ul
+COMPACT_AFTER_PARTS = 16
+
+# Calea implicită a dataset-ului: Parquet dacă pyarrow e instalat, altfel CSV
+DEFAULT_TRAINING_PATH = "data/training_data.parquet" if HAS_PYARROW else "data/training_data.csv"
+
+
+def to_utc_naive(timestamps: pd.Series) -> pd.Series:
+    """Normalizează timestamp-uri (cu sau fără fus orar) la UTC fără fus orar."""
+    return pd.to_datetime(timestamps, utc=True, format="ISO8601").dt.tz_localize(None)
+
+
+def apply_schema(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Aplică `TRAINING_SCHEMA` coloanelor prezente în DataFrame.
+
+    Timestamp-urile sunt convertite la UTC fără fus orar; coloanele
+    necunoscute schemei sunt păstrate neschimbate.
+    """
+    df = df.copy()
+    for column, dtype in TRAINING_SCHEMA.items():
+        if column not in df.columns:
+            continue
+        if column == "timestamp":
+            df[column] = to_utc_naive(df[column])
+        elif dtype.startswith("int") and df[column].isna().any():
+            df[column] = df[column].astype("float32")
+        else:
+            df[column] = df[column].astype(dtype)
+    return df
+
+
+def _format(path: str) -> str:
+    extension = os.path.splitext(path)[1].lower()
+    if extension in COLUMNAR_FORMATS and not HAS_PYARROW:
+        raise ImportError(
+            f"Formatul {extension} necesită pyarrow. Instalați cu: pip install pyarrow"
+        )
+    return extension
+
+
+def write_training_data(df: pd.DataFrame, path: str):
+    """
+    Salvează dataset-ul în formatul dat de extensie (.parquet, .feather sau .csv).
+
+    Scrierea se face într-un fișier temporar urmat de redenumire atomică.
+    """
+    extension = _format(path)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp"
+
+    if extension == ".parquet":
+        apply_schema(df).to_parquet(tmp_path, index=False)
+    elif extension == ".feather":
+        apply_schema(df).reset_index(drop=True).to_feather(tmp_path)
+    else:
+        df.to_csv(tmp_path, index=False)
+
+    os.replace(tmp_path, path)
+    # Fișierele delta ale versiunii anterioare sunt incluse deja (compactare) sau înlocuite
+    shutil.rmtree(_delta_dir(path), ignore_errors=True)
+
+
+def _delta_dir(path: str) -> str:
+    """Directorul cu fișierele delta adăugate unui dataset columnar."""
+    return f"{path}.parts"
+
+
+def _delta_files(path: str) -> List[str]:
+    """Lista sortată a fișierelor delta ale unui dataset (goală dacă nu există)."""
+    extension = os.path.splitext(path)[1].lower()
+    return sorted(glob.glob(os.path.join(_delta_dir(path), f"part-*{extension}")))
+
+
+def training_data_size(path: str) -> int:
+    """Dimensiunea pe disc a dataset-ului, inclusiv fișierele delta."""
+    return os.path.getsize(path) + sum(os.path.getsize(part) for part in _delta_files(path))
+
+
+def _with_categories(df: pd.DataFrame) -> pd.DataFrame:
+    """Refă coloanele categorice după concatenarea mai multor fișiere."""
+    for column in df.columns:
+        if TRAINING_SCHEMA.get(column) == "category":
+            df[column] = df[column].astype("category")
+    return df
+
+
+def read_training_data(path: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Încarcă dataset-ul, citind doar coloanele cerute.
+
+    Args:
+        path: Calea fișierului (.parquet, .feather sau .csv)
+        columns: Coloanele de citit (implicit: toate)
+
+    Returns:
+        DataFrame cu schema aplicată
+    """
+    if os.path.isdir(path):
+        return read_partitioned_data(path, columns)
+
+    deltas = _delta_files(path)
+    if deltas:
+        return _with_categories(
+            pd.concat([_read_file(part, columns) for part in [path] + deltas], ignore_index=True)
+        )
+    return _read_file(path, columns)
+
+
+def _read_file(path: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """Încarcă un singur fișier de date, în formatul dat de extensie."""
+    extension = _format(path)
+
+    if extension == ".parquet":
+        return pd.read_parquet(path, columns=columns)
+    if extension == ".feather":
+        return pd.read_feather(path, columns=columns)
+
+    # Coloanele întregi sunt lăsate la inferență, pentru a tolera valori lipsă
+    dtypes = {
+        col: dtype
+        for col, dtype in TRAINING_SCHEMA.items()
+        if dtype == "category" or dtype.startswith("float")
+    }
+    df = pd.read_csv(path, usecols=columns, dtype=dtypes)
+    if "timestamp" in df.columns:
+        df["timestamp"] = to_utc_naive(df["timestamp"])
+    return df
+
+
+def partition_path(output_dir: str, city: str, extension: str = None) -> str:
+    """Calea partiției unui oraș într-un dataset partiționat (`city=<oraș>/part-0.<ext>`)."""
+    if extension is None:
+        extension = os.path.splitext(DEFAULT_TRAINING_PATH)[1]
+    safe_city = city.replace(os.sep, "_").replace(" ", "_")
+    return os.path.join(output_dir, f"city={safe_city}", f"part-0{extension}")
+
+
+def _partition_files(output_dir: str) -> List[str]:
+    """Lista sortată a fișierelor `part-*` dintr-un director (recursiv)."""
+    paths = sorted(
+        path
+        for path in glob.glob(os.path.join(output_dir, "**", "part-*"), recursive=True)
+        if os.path.splitext(path)[1].lower() in COLUMNAR_FORMATS | {".csv"}
+    )
+    if not paths:
+        raise FileNotFoundError(f"Nu există partiții în {output_dir}")
+    return paths
+
+
+def read_partitioned_data(output_dir: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Încarcă și concatenează toate fișierele `part-*` dintr-un director.
+
+    Acceptă atât layout-ul partiționat pe orașe (`city=<oraș>/part-0.<ext>`),
+    cât și fișiere `part-<i>.<ext>` direct în director.
+    """
+    paths = _partition_files(output_dir)
+    return _with_categories(
+        pd.concat([read_training_data(path, columns) for path in paths], ignore_index=True)
+    )
+
+
+def iter_training_data(
+    path: str, columns: Optional[List[str]] = None, chunk_rows: int = 500_000
+) -> Iterator[pd.DataFrame]:
+    """
+    Citește dataset-ul pe bucăți de cel mult `chunk_rows` rânduri.
+
+    Parquet este citit pe record batch-uri, Feather prin memory-map, CSV cu
+    `chunksize`; un director partiționat și fișierele delta ale unui dataset
+    sunt parcurse fișier cu fișier.
+    Memoria folosită depinde de `chunk_rows`, nu de dimensiunea dataset-ului.
+
+    Args:
+        path: Calea fișierului sau a directorului partiționat
+        columns: Coloanele de citit (implicit: toate)
+        chunk_rows: Numărul maxim de rânduri per bucată
+
+    Yields:
+        DataFrame-uri cu schema aplicată
+    """
+    if os.path.isdir(path):
+        for part in _partition_files(path):
+            yield from iter_training_data(part, columns, chunk_rows)
+        return
+
+    for part in [path] + _delta_files(path):
+        yield from _iter_file(part, columns, chunk_rows)
+
+
+def _iter_file(path: str, columns: Optional[List[str]], chunk_rows: int) -> Iterator[pd.DataFrame]:
+    """Citește pe bucăți un singur fișier de date."""
+    extension = _format(path)
+
+    if extension == ".parquet":
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_rows, columns=columns):
+            yield batch.to_pandas()
+        return
+
+    if extension == ".feather":
+        import pyarrow as pa
+        import pyarrow.ipc
+
+        with pa.memory_map(path) as source:
+            reader = pa.ipc.open_file(source)
+            for i in range(reader.num_record_batches):
+                batch = reader.get_batch(i)
+                if columns is not None:
+                    batch = batch.select(columns)
+                for start in range(0, batch.num_rows, chunk_rows):
+                    yield batch.slice(start, chunk_rows).to_pandas()
+        return
+
+    dtypes = {
+        col: dtype
+        for col, dtype in TRAINING_SCHEMA.items()
+        if dtype == "category" or dtype.startswith("float")
+    }
+    for chunk in pd.read_csv(path, usecols=columns, dtype=dtypes, chunksize=chunk_rows):
+        if "timestamp" in chunk.columns:
+            chunk["timestamp"] = to_utc_naive(chunk["timestamp"])
+        yield chunk
+
+
+def append_training_data(df: pd.DataFrame, path: str):
+    """
+    Adaugă rânduri la un dataset existent.
+
+    CSV-ul este completat direct la sfârșit. Pentru formatele columnare,
+    rândurile noi sunt scrise într-un fișier delta (`<dataset>.parts/part-<n>`),
+    fără a citi sau rescrie dataset-ul; după `COMPACT_AFTER_PARTS` fișiere
+    delta, acestea sunt compactate în fișierul principal.
+    """
+    extension = _format(path)
+
+    if extension in COLUMNAR_FORMATS:
+        deltas = _delta_files(path)
+        part_path = os.path.join(_delta_dir(path), f"part-{len(deltas):05d}{extension}")
+        write_training_data(df[_schema_columns(path)], part_path)
+        if len(deltas) + 1 >= COMPACT_AFTER_PARTS:
+            compact_training_data(path)
+    else:
+        columns = pd.read_csv(path, nrows=0).columns
+        df[columns].to_csv(path, mode="a", header=False, index=False)
+
+
+def _schema_columns(path: str) -> List[str]:
+    """Coloanele unui fișier columnar, citite din schemă (fără date)."""
+    if _format(path) == ".parquet":
+        import pyarrow.parquet as pq
+
+        return pq.read_schema(path).names
+    import pyarrow as pa
+    import pyarrow.ipc
+
+    with pa.memory_map(path) as source:
+        return pa.ipc.open_file(source).schema.names
+
+
+def compact_training_data(path: str):
+    """Rescrie atomic dataset-ul columnar împreună cu fișierele delta într-un singur fișier."""
+    if _delta_files(path):
+        write_training_data(read_training_data(path), path)
+
+
+def export_csv(path: str, csv_path: str):
+    """Exportă un dataset columnar în format CSV."""
+    read_training_data(path).to_csv(csv_path, index=False)
+    print(f"📤 Dataset exportat: {csv_path}")
@@ -0,0 +1,195 @@
+"""
+Generator de date simulate PM2.5 + meteo pentru teste de încărcare.
+
+Funcționalități:
+- N stații × M ani de date orare, fără acces la rețea
+- Complet vectorizat, cu `np.random.Generator` local (fără seed global)
+- Generare pe bucăți de stații și scriere directă pe disc
+"""
+
+import argparse
+import os
+import sys
+import time
+from typing import Iterator, Optional
+
+import numpy as np
+import pandas as pd
+
+# Adaugă directorul părinte la path pentru import module
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.storage import DEFAULT_TRAINING_PATH, write_training_data
+
+
+def synthetic_weather(timestamps, rng: np.random.Generator) -> pd.DataFrame:
+    """
+    Generează date meteo simulate realiste pentru un vector de timestamp-uri.
+
+    Args:
+        timestamps: Serie sau index de timestamp-uri
+        rng: Generator NumPy folosit pentru zgomot
+
+    Returns:
+        DataFrame cu coloanele meteo, câte un rând pentru fiecare timestamp
+    """
+    ts = pd.DatetimeIndex(timestamps)
+    n = len(ts)
+    hour = ts.hour.to_numpy()
+    day_of_year = ts.dayofyear.to_numpy()
+
+    # Temperatură variabilă cu ora și anotimpul
+    base_temp = 15 + 10 * np.sin(2 * np.pi * day_of_year / 365)
+    temp_variation = 5 * np.sin(2 * np.pi * hour / 24)
+    temperature = base_temp + temp_variation + rng.normal(0, 2, n)
+
+    # Umiditate inversă cu temperatura
+    humidity = np.clip(70 - (temperature - 15) * 2 + rng.normal(0, 10, n), 30, 95)
+
+    return pd.DataFrame(
+        {
+            "temperature": np.round(temperature, 2),
+            "humidity": np.round(humidity, 2),
+            "pressure": np.round(1013 + rng.normal(0, 5, n), 2),
+            "wind_speed": np.round(2 + rng.exponential(3, n), 2),
+            "wind_direction": np.round(rng.uniform(0, 360, n), 2),
+            "clouds": np.round(rng.uniform(0, 100, n), 2),
+        }
+    )
+
+
+def _generate_chunk(
+    station_ids: np.ndarray,
+    timestamps: pd.DatetimeIndex,
+    n_cities: int,
+    country: str,
+    rng: np.random.Generator,
+) -> pd.DataFrame:
+    """Generează toate orele pentru un grup de stații, într-un singur pas vectorizat."""
+    n_stations = len(station_ids)
+    n_hours = len(timestamps)
+
+    all_timestamps = pd.DatetimeIndex(np.tile(timestamps.values, n_stations))
+    station_per_row = np.repeat(station_ids, n_hours)
+
+    weather_df = synthetic_weather(all_timestamps, rng)
+
+    # PM2.5: nivel de bază per stație + ciclu diurn + sezon rece + efectul meteo
+    base_pm25 = np.repeat(rng.uniform(15, 45, n_stations), n_hours)
+    hour = all_timestamps.hour.to_numpy()
+    day_of_year = all_timestamps.dayofyear.to_numpy()
+    pm25 = (
+        base_pm25
+        + 15 * np.sin(2 * np.pi * (hour - 6) / 24)
+        + 10 * np.cos(2 * np.pi * day_of_year / 365)
+        - 2 * weather_df["wind_speed"].to_numpy()
+        + 0.1 * (weather_df["humidity"].to_numpy() - 60)
+        + rng.normal(0, 8, n_stations * n_hours)
+    )
+
+    df = pd.DataFrame(
+        {
+            "timestamp": all_timestamps,
+            "pm25": np.clip(pm25, 5, 150),
+            "location": pd.Categorical.from_codes(
+                station_per_row - station_ids[0],
+                [f"Simulated Station {i:05d}" for i in station_ids],
+            ),
+            "city": pd.Categorical.from_codes(
+                station_per_row % n_cities, [f"Simulated City {i:03d}" for i in range(n_cities)]
+            ),
+            "country": country,
+        }
+    )
+    df = pd.concat([df, weather_df], axis=1)
+    df["hour"] = hour
+    df["day_of_week"] = all_timestamps.dayofweek.to_numpy()
+    df["month"] = all_timestamps.month.to_numpy()
+    return df
+
+
+def iter_synthetic_chunks(
+    n_stations: int,
+    years: float = 1,
+    start: str = "2020-01-01",
+    seed: int = 42,
+    stations_per_chunk: int = 100,
+    n_cities: Optional[int] = None,
+    country: str = "RO",
+) -> Iterator[pd.DataFrame]:
+    """
+    Generează dataset-ul simulat pe bucăți de `stations_per_chunk` stații.
+
+    Fiecare bucată primește propriul generator derivat din `seed`, deci
+    rezultatul este reproductibil pentru aceeași combinație
+    (`seed`, `stations_per_chunk`).
+
+    Args:
+        n_stations: Numărul de stații
+        years: Numărul de ani de date orare per stație
+        start: Momentul de început (UTC)
+        seed: Seed-ul pentru `np.random.SeedSequence`
+        stations_per_chunk: Stații per bucată (limitează memoria folosită)
+        n_cities: Numărul de orașe în care sunt distribuite stațiile
+        country: Codul țării
+
+    Yields:
+        DataFrame-uri cu schema dataset-ului de antrenare
+    """
+    timestamps = pd.date_range(start=start, periods=int(round(years * 365 * 24)), freq="H")
+    n_cities = n_cities or min(n_stations, 10)
+    chunk_starts = range(0, n_stations, stations_per_chunk)
+    seeds = np.random.SeedSequence(seed).spawn(len(chunk_starts))
+
+    for chunk_start, chunk_seed in zip(chunk_starts, seeds):
+        station_ids = np.arange(chunk_start, min(chunk_start + stations_per_chunk, n_stations))
+        yield _generate_chunk(
+            station_ids, timestamps, n_cities, country, np.random.default_rng(chunk_seed)
+        )
+
+
+def generate_synthetic_dataset(n_stations: int, years: float = 1, **kwargs) -> pd.DataFrame:
+    """Generează întregul dataset simulat în memorie (vezi `iter_synthetic_chunks`)."""
+    return pd.concat(list(iter_synthetic_chunks(n_stations, years, **kwargs)), ignore_index=True)
+
+
+def write_synthetic_dataset(
+    output_dir: str, n_stations: int, years: float = 1, extension: Optional[str] = None, **kwargs
+) -> int:
+    """
+    Scrie dataset-ul simulat pe disc, câte un fișier `part-<i>` per bucată.
+
+    Directorul rezultat poate fi citit direct cu `read_training_data(output_dir)`.
+
+    Returns:
+        Numărul total de rânduri scrise
+    """
+    extension = extension or os.path.splitext(DEFAULT_TRAINING_PATH)[1]
+    print(f"🧪 Generare date simulate: {n_stations} stații × {years} ani -> {output_dir}")
+
+    start = time.perf_counter()
+    total = 0
+    for i, chunk in enumerate(iter_synthetic_chunks(n_stations, years, **kwargs)):
+        write_training_data(chunk, os.path.join(output_dir, f"part-{i:05d}{extension}"))
+        total += len(chunk)
+        print(f"  Bucata {i}: {total:,} rânduri")
+
+    elapsed = time.perf_counter() - start
+    print(f"✅ {total:,} rânduri în {elapsed:.1f}s ({total / elapsed:,.0f} rânduri/s)")
+    return total
+
+
+def main():
+    """Funcție principală pentru generarea unui dataset simulat pe disc."""
+    parser = argparse.ArgumentParser(description="Generator de date simulate PM2.5 + meteo")
+    parser.add_argument("--stations", type=int, default=100, help="Numărul de stații")
+    parser.add_argument("--years", type=float, default=1, help="Ani de date orare per stație")
+    parser.add_argument("--seed", type=int, default=42, help="Seed pentru generator")
+    parser.add_argument("--output-dir", default="data/synthetic", help="Directorul de ieșire")
+    args = parser.parse_args()
+
+    write_synthetic_dataset(args.output_dir, args.stations, args.years, seed=args.seed)
+
+
+if __name__ == "__main__":
+    main()
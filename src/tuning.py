@@ -0,0 +1,221 @@
+"""
+Căutare de hiperparametri pentru Random Forest, cu buget de timp.
+
+Funcționalități:
+- Successive halving: mulți candidați evaluați pe puține rânduri, doar cei
+  mai buni 1/`eta` avansează la runda următoare, cu de `eta` ori mai multe rânduri
+- Candidații unei runde sunt evaluați în paralel, pe un pool de procese
+  (datele sunt trimise o singură dată per proces)
+- Buget de timp total: o rundă nu este pornită dacă durata estimată
+  depășește timpul rămas, iar procesele cu candidați neterminați la expirare
+  sunt oprite
+- Istoricul complet al căutării (runde, parametri, scoruri, durate)
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError, as_completed
+from typing import Dict, List, Optional
+
+import numpy as np
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.metrics import mean_squared_error
+
+from src.process_pool import terminate_workers
+
+# Spațiul de căutare pentru parametrii pădurii
+SEARCH_SPACE = {
+    "n_estimators": [50, 100, 200],
+    "max_depth": [8, 12, 15, 20, None],
+    "min_samples_split": [2, 5, 10, 20],
+    "min_samples_leaf": [1, 2, 4, 8],
+    "max_features": [1.0, 0.5, "sqrt"],
+}
+
+# Datele de antrenare/validare, setate o singură dată în fiecare proces worker
+_worker_data = {}
+
+
+def _init_worker(X_train: np.ndarray, y_train: np.ndarray, X_val: np.ndarray, y_val: np.ndarray):
+    _worker_data.update(X_train=X_train, y_train=y_train, X_val=X_val, y_val=y_val)
+
+
+def _evaluate_candidate(params: Dict, n_rows: int) -> Dict:
+    """Antrenează un candidat pe primele `n_rows` rânduri și returnează RMSE pe validare."""
+    start = time.perf_counter()
+    model = RandomForestRegressor(**params, random_state=42, n_jobs=1)
+    model.fit(_worker_data["X_train"][:n_rows], _worker_data["y_train"][:n_rows])
+    predictions = model.predict(_worker_data["X_val"])
+    rmse = float(np.sqrt(mean_squared_error(_worker_data["y_val"], predictions)))
+    return {"val_rmse": rmse, "seconds": time.perf_counter() - start}
+
+
+def count_rounds(n_candidates: int, eta: int) -> int:
+    """
+    Numărul de runde până rămâne un singur candidat: cel mai mic k cu
+    `eta ** k >= n_candidates`, plus runda finală (calcul întreg, fără logaritmi).
+    """
+    n_rounds = 1
+    while eta ** (n_rounds - 1) < n_candidates:
+        n_rounds += 1
+    return n_rounds
+
+
+def sample_candidates(
+    n_candidates: int,
+    search_space: Optional[Dict[str, List]] = None,
+    seed: int = 42,
+    include: Optional[Dict] = None,
+) -> List[Dict]:
+    """
+    Extrage combinații distincte de parametri din spațiul de căutare.
+
+    Args:
+        n_candidates: Numărul de candidați
+        search_space: Valorile posibile per parametru (implicit `SEARCH_SPACE`)
+        seed: Seed pentru generator
+        include: Configurație adăugată mereu (ex: parametrii actuali)
+    """
+    search_space = search_space or SEARCH_SPACE
+    rng = np.random.default_rng(seed)
+    n_combinations = int(np.prod([len(values) for values in search_space.values()]))
+
+    candidates = [dict(include)] if include else []
+    seen = {tuple(sorted(map(str, c.items()))) for c in candidates}
+    while len(candidates) < min(n_candidates, n_combinations):
+        params = {name: values[rng.integers(len(values))] for name, values in search_space.items()}
+        key = tuple(sorted(map(str, params.items())))
+        if key not in seen:
+            seen.add(key)
+            candidates.append(params)
+    return candidates
+
+
+def successive_halving(
+    X_train: np.ndarray,
+    y_train: np.ndarray,
+    X_val: np.ndarray,
+    y_val: np.ndarray,
+    candidates: List[Dict],
+    budget_seconds: float = 300,
+    eta: int = 3,
+    min_rows: int = 2000,
+    max_workers: Optional[int] = None,
+) -> Dict:
+    """
+    Caută cea mai bună configurație prin successive halving, în limita unui buget de timp.
+
+    Args:
+        X_train, y_train: Date de antrenare pentru candidați
+        X_val, y_val: Date de validare (RMSE-ul decide clasamentul)
+        candidates: Configurațiile de evaluat (ex: `sample_candidates`)
+        budget_seconds: Timpul total disponibil
+        eta: Factorul de reducere: 1/`eta` candidați avansează, cu de `eta` ori mai multe rânduri
+        min_rows: Numărul minim de rânduri din prima rundă
+        max_workers: Numărul de procese (implicit: numărul de CPU-uri)
+
+    Returns:
+        Dicționar cu `best_params`, `best_val_rmse`, `best_rows`, `elapsed_seconds`,
+        `budget_exhausted` și `trace` (câte o intrare per evaluare)
+    """
+    start = time.perf_counter()
+    deadline = start + budget_seconds
+    max_workers = max_workers or os.cpu_count() or 1
+
+    # Datele sunt amestecate o dată; fiecare rundă folosește un prefix mai lung
+    order = np.random.default_rng(42).permutation(len(X_train))
+    X_train, y_train = X_train[order], y_train[order]
+
+    n_rounds = count_rounds(len(candidates), eta)
+    rows = max(min(min_rows, len(X_train)), len(X_train) // eta ** (n_rounds - 1))
+
+    trace = []
+    survivors = list(candidates)
+    best = None
+    budget_exhausted = False
+    last_round_cost = None
+
+    print(
+        f"🔎 Successive halving: {len(candidates)} candidați, {n_rounds} runde, "
+        f"buget {budget_seconds:.0f}s, {max_workers} procese"
+    )
+
+    executor = ProcessPoolExecutor(
+        max_workers=max_workers, initializer=_init_worker, initargs=(X_train, y_train, X_val, y_val)
+    )
+    try:
+        for round_index in range(n_rounds):
+            remaining = deadline - time.perf_counter()
+            # Durata estimată crește proporțional cu candidați × rânduri
+            if last_round_cost is not None:
+                seconds, cost = last_round_cost
+                estimate = seconds * len(survivors) * rows / cost
+                if estimate > remaining:
+                    budget_exhausted = True
+                    print(
+                        f"  ⏱️ Runda {round_index} (estimat {estimate:.0f}s) nu încape "
+                        f"în bugetul rămas ({remaining:.0f}s)"
+                    )
+                    break
+
+            round_start = time.perf_counter()
+            futures = {
+                executor.submit(_evaluate_candidate, params, rows): params for params in survivors
+            }
+            results = []
+            try:
+                for future in as_completed(futures, timeout=max(0.0, remaining)):
+                    result = dict(round=round_index, rows=rows, params=futures[future])
+                    try:
+                        result.update(future.result(), status="ok")
+                        results.append(result)
+                    except Exception as e:
+                        result.update(val_rmse=None, seconds=None, status=f"eroare: {e}")
+                    trace.append(result)
+            except TimeoutError:
+                budget_exhausted = True
+                for future, params in futures.items():
+                    if not future.done():
+                        future.cancel()
+                        trace.append(
+                            dict(
+                                round=round_index,
+                                rows=rows,
+                                params=params,
+                                val_rmse=None,
+                                seconds=None,
+                                status="timeout",
+                            )
+                        )
+            last_round_seconds = time.perf_counter() - round_start
+            last_round_cost = (last_round_seconds, len(survivors) * rows)
+
+            if not results:
+                break
+            results.sort(key=lambda r: r["val_rmse"])
+            best = results[0]
+            print(
+                f"  Runda {round_index}: {len(results)}/{len(survivors)} candidați pe "
+                f"{rows:,} rânduri, cel mai bun RMSE {best['val_rmse']:.3f} "
+                f"({last_round_seconds:.1f}s)"
+            )
+
+            if budget_exhausted or len(results) == 1 or rows >= len(X_train):
+                break
+            survivors = [r["params"] for r in results[: max(1, len(results) // eta)]]
+            rows = min(len(X_train), rows * eta)
+    finally:
+        # Candidații încă în antrenare nu trebuie să concureze cu refit-ul
+        terminate_workers(executor)
+
+    return {
+        "best_params": best["params"] if best else None,
+        "best_val_rmse": best["val_rmse"] if best else None,
+        "best_rows": best["rows"] if best else None,
+        "n_candidates": len(candidates),
+        "eta": eta,
+        "budget_seconds": budget_seconds,
+        "elapsed_seconds": time.perf_counter() - start,
+        "budget_exhausted": budget_exhausted,
+        "trace": trace,
+    }
@@ -0,0 +1,31 @@
+"""
+Fixture-uri comune pentru teste.
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.model import PM25Predictor
+from src.storage import write_training_data
+from src.synthetic import generate_synthetic_dataset
+
+
+@pytest.fixture(scope="session")
+def training_data_path(tmp_path_factory):
+    """Dataset simulat mic, salvat pe disc."""
+    path = str(tmp_path_factory.mktemp("data") / "training_data.csv")
+    write_training_data(generate_synthetic_dataset(n_stations=2, years=0.1, seed=1), path)
+    return path
+
+
+@pytest.fixture(scope="session")
+def trained_predictor(training_data_path, tmp_path_factory):
+    """Predictor antrenat pe datele simulate (model salvat într-un director temporar)."""
+    model_path = str(tmp_path_factory.mktemp("models") / "pm25_model.joblib")
+    predictor = PM25Predictor(model_path=model_path)
+    predictor.train(training_data_path)
+    return predictor
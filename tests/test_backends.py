@@ -0,0 +1,86 @@
+"""
+Teste pentru backend-urile de estimator.
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sklearn.ensemble import HistGradientBoostingRegressor, RandomForestRegressor
+
+from src.backends import DEFAULT_HIST_GB_PARAMS, build_estimator, uses_scaler
+from src.model import PM25Predictor
+
+HGB_PARAMS = dict(DEFAULT_HIST_GB_PARAMS, max_iter=30)
+
+
+@pytest.fixture(scope="module")
+def hgb_predictor(training_data_path, tmp_path_factory):
+    """Predictor gradient boosting antrenat pe datele simulate."""
+    model_path = str(tmp_path_factory.mktemp("hgb") / "pm25_model.joblib")
+    predictor = PM25Predictor(
+        model_path=model_path, backend="hist_gradient_boosting", params=HGB_PARAMS
+    )
+    predictor.train(training_data_path)
+    return predictor
+
+
+class TestBackends:
+    """Teste pentru alegerea și persistența backend-ului."""
+
+    def test_build_estimator(self):
+        """Test: fiecare backend construiește estimatorul lui, cu parametrii impliciți."""
+        forest = build_estimator("random_forest", n_jobs=1)
+        boosting = build_estimator("hist_gradient_boosting")
+
+        assert isinstance(forest, RandomForestRegressor) and forest.n_jobs == 1
+        assert isinstance(boosting, HistGradientBoostingRegressor)
+        assert boosting.max_iter == DEFAULT_HIST_GB_PARAMS["max_iter"]
+        assert uses_scaler("random_forest") and not uses_scaler("hist_gradient_boosting")
+        with pytest.raises(ValueError):
+            build_estimator("xgboost")
+
+    def test_hgb_trains_without_scaler(self, hgb_predictor):
+        """Test: gradient boosting nu folosește scaler și nu scrie artefact `.mmap`."""
+        assert hgb_predictor.scaler is None
+        assert isinstance(hgb_predictor.model, HistGradientBoostingRegressor)
+        assert hgb_predictor.metrics["training"]["backend"] == "hist_gradient_boosting"
+        assert hgb_predictor.metrics["test"]["rmse"] > 0
+        assert not os.path.exists(hgb_predictor.mmap_path)
+
+    def test_hgb_roundtrip(self, hgb_predictor, training_data_path):
+        """Test: backend-ul este preluat la încărcare; motorul compilat revine la sklearn."""
+        df = pd.read_csv(training_data_path).dropna().head(50)
+
+        loaded = PM25Predictor(
+            model_path=hgb_predictor.model_path, use_mmap=True, engine="compiled"
+        )
+        loaded.load_model()
+
+        assert loaded.backend == "hist_gradient_boosting"
+        np.testing.assert_allclose(loaded.predict_batch(df), hgb_predictor.predict_batch(df))
+
+    def test_forest_only_operations(self, hgb_predictor, training_data_path):
+        """Test: operațiile specifice pădurii refuză alt backend."""
+        with pytest.raises(ValueError):
+            hgb_predictor.train_chunked(training_data_path)
+        with pytest.raises(ValueError):
+            hgb_predictor.tune(training_data_path, budget_seconds=1)
+        with pytest.raises(ValueError):
+            hgb_predictor.compact(training_data_path)
+
+    def test_hgb_backtest(self, hgb_predictor, training_data_path):
+        """Test: backtest-ul reantrenează backend-ul modelului la fiecare fold."""
+        tables = hgb_predictor.backtest(training_data_path, n_folds=2, max_workers=1)
+
+        assert len(tables["by_fold"]) == 2
+        assert list(tables["by_horizon"]["horizon"]) == list(range(1, 25))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
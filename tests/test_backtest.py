@@ -0,0 +1,158 @@
+"""
+Teste pentru backtest-ul cu origine mobilă.
+"""
+
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.backtest import rolling_origin_backtest
+from src.lag_features import LAG_FEATURE_COLUMNS, add_lag_features
+from src.model import PM25Predictor
+
+FEATURES = ["temperature", "hour"]
+PARAMS = {"n_estimators": 5, "max_depth": 4}
+
+
+@pytest.fixture
+def hourly_df():
+    """Două stații, 20 de zile orare; PM2.5 depinde de temperatură."""
+    timestamps = pd.date_range("2026-01-01", periods=20 * 24, freq="H")
+    rng = np.random.default_rng(0)
+    frames = []
+    for station in range(2):
+        temperature = rng.normal(10, 5, len(timestamps))
+        frames.append(
+            pd.DataFrame(
+                {
+                    "timestamp": timestamps,
+                    "temperature": temperature,
+                    "hour": timestamps.hour,
+                    "pm25": 50 - 2 * temperature + rng.normal(0, 1, len(timestamps)),
+                }
+            )
+        )
+    return pd.concat(frames, ignore_index=True).sample(frac=1, random_state=0)
+
+
+class TestBacktest:
+    """Teste pentru rolling_origin_backtest."""
+
+    def test_tables(self, hourly_df):
+        """Test: tabele per orizont și per fold, fără date din viitor la antrenare."""
+        tables = rolling_origin_backtest(
+            hourly_df, FEATURES, PARAMS, n_folds=3, horizon_hours=24, step_hours=48, max_workers=2
+        )
+
+        by_horizon = tables["by_horizon"]
+        assert list(by_horizon["horizon"]) == list(range(1, 25))
+        assert (by_horizon["rows"] == 3 * 2).all()
+        assert (by_horizon["rmse"] >= by_horizon["mae"]).all()
+
+        by_fold = tables["by_fold"]
+        assert len(by_fold) == 3
+        # Ultima fereastră se termină la ultima oră din date
+        assert by_fold["cutoff"].max() == pd.Timestamp("2026-01-20")
+        # Fiecare fold se antrenează pe toate orele dinaintea cutoff-ului (2 stații)
+        expected_rows = [
+            (cutoff - pd.Timestamp("2026-01-01")) // pd.Timedelta(hours=1) * 2
+            for cutoff in by_fold["cutoff"]
+        ]
+        assert list(by_fold["train_rows"]) == expected_rows
+        assert by_fold["rmse"].max() < 5
+
+    def test_train_window(self, hourly_df):
+        """Test: fereastra de antrenare limitată."""
+        tables = rolling_origin_backtest(
+            hourly_df, FEATURES, PARAMS, n_folds=2, train_hours=72, max_workers=1
+        )
+
+        assert (tables["by_fold"]["train_rows"] == 72 * 2).all()
+
+    def test_data_gap_at_cutoff(self, hourly_df):
+        """Test: un fold fără date în fereastră rămâne în tabel cu erori NaN."""
+        gap = (hourly_df["timestamp"] >= "2026-01-18") & (hourly_df["timestamp"] < "2026-01-19")
+
+        tables = rolling_origin_backtest(
+            hourly_df[~gap],
+            FEATURES,
+            PARAMS,
+            n_folds=3,
+            horizon_hours=24,
+            step_hours=48,
+            max_workers=1,
+        )
+
+        by_fold = tables["by_fold"].set_index("cutoff")
+        assert len(by_fold) == 3
+        assert by_fold.loc[pd.Timestamp("2026-01-18"), "rows"] == 0
+        assert np.isnan(by_fold.loc[pd.Timestamp("2026-01-18"), "rmse"])
+        assert by_fold["rmse"].notna().sum() == 2
+        assert (tables["by_horizon"]["rows"] == 2 * 2).all()
+
+    def test_insufficient_history(self, hourly_df):
+        """Test eroare când cutoff-urile ies din intervalul datelor."""
+        with pytest.raises(ValueError):
+            rolling_origin_backtest(hourly_df, FEATURES, PARAMS, n_folds=30, max_workers=1)
+
+    def test_lag_features_forecast_recursively(self):
+        """Test: cu lag-uri, fereastra este prezisă recursiv, fără PM2.5 observat din ea."""
+        timestamps = pd.date_range("2026-01-01", periods=15 * 24, freq="H")
+        rng = np.random.default_rng(1)
+        df = add_lag_features(
+            pd.concat(
+                [
+                    pd.DataFrame(
+                        {
+                            "timestamp": timestamps,
+                            "location": f"Stația {station}",
+                            "hour": timestamps.hour,
+                            "pm25": 100 + np.cumsum(rng.normal(0, 3, len(timestamps))),
+                        }
+                    )
+                    for station in range(2)
+                ],
+                ignore_index=True,
+            )
+        )
+        features = ["hour"] + LAG_FEATURE_COLUMNS
+        params = {"n_estimators": 20, "max_depth": 8}
+
+        recursive = rolling_origin_backtest(
+            df, features, params, n_folds=3, max_workers=1, lag_features=True
+        )["by_horizon"]
+        one_step = rolling_origin_backtest(df, features, params, n_folds=3, max_workers=1)[
+            "by_horizon"
+        ]
+
+        assert list(recursive["horizon"]) == list(range(1, 25))
+        assert (recursive["rows"] == 3 * 2).all()
+        # Prognoza de o oră este aceeași; eroarea recursivă crește apoi cu orizontul
+        assert recursive["rmse"].iloc[0] == pytest.approx(one_step["rmse"].iloc[0])
+        assert recursive["rmse"].iloc[-6:].mean() > 2 * one_step["rmse"].iloc[-6:].mean()
+
+    def test_predictor_backtest_saves_tables(self, training_data_path, tmp_path):
+        """Test: backtest-ul predictorului salvează tabelele lângă metrici."""
+        predictor = PM25Predictor(
+            model_path=str(tmp_path / "pm25_model.joblib"),
+            params={"n_estimators": 5, "max_depth": 6},
+        )
+
+        predictor.backtest(training_data_path, n_folds=2, max_workers=2)
+
+        with open(predictor.backtest_path) as f:
+            saved = json.load(f)
+        assert len(saved["by_horizon"]) == 24
+        assert len(saved["by_fold"]) == 2
+        assert saved["overall"]["rmse"] > 0
+        assert not os.path.exists(predictor.model_path)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
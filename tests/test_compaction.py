@@ -0,0 +1,111 @@
+"""
+Teste pentru compactarea modelului.
+"""
+
+import os
+import shutil
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.compaction import compact_forest, compaction_report, select_trees
+from src.model import PM25Predictor
+from src.model_artifacts import flatten_forest
+
+
+@pytest.fixture
+def validation_data(trained_predictor, training_data_path):
+    """Features scalate și valori reale, împărțite în validare și test."""
+    df = pd.read_csv(training_data_path).dropna().head(1000)
+    X = trained_predictor.scaler.transform(df[trained_predictor.feature_columns].values)
+    y = df["pm25"].values
+    return X[:500], y[:500], X[500:], y[500:]
+
+
+class TestCompaction:
+    """Teste pentru selecția arborilor, limita de frunze și float32."""
+
+    def test_select_trees_distinct(self, trained_predictor, validation_data):
+        """Test: arborii aleși sunt distincți, iar primul este cel mai bun individual."""
+        X_val, y_val, _, _ = validation_data
+        forest = flatten_forest(trained_predictor.model)
+
+        chosen = select_trees(forest, X_val, y_val, 5)
+
+        assert len(set(chosen)) == 5
+        errors = ((forest.predict_trees(X_val) - y_val[:, None]) ** 2).mean(axis=0)
+        assert chosen[0] == int(np.argmin(errors))
+
+    def test_max_leaves_respected(self, trained_predictor, validation_data):
+        """Test: fiecare arbore are cel mult `max_leaves` frunze."""
+        forest = compact_forest(
+            trained_predictor.model, *validation_data[:2], n_trees=4, max_leaves=16
+        )
+
+        leaves = np.isinf(forest.threshold)
+        roots = list(forest.roots) + [len(forest.threshold)]
+        assert forest.n_estimators == 4
+        for start, stop in zip(roots[:-1], roots[1:]):
+            assert 1 <= leaves[start:stop].sum() <= 16
+
+    def test_float32_close_to_full(self, trained_predictor, validation_data):
+        """Test: pragurile float32 nu schimbă ramurile, doar rotunjesc valorile."""
+        X_val, y_val, X_test, _ = validation_data
+
+        forest = compact_forest(trained_predictor.model, X_val, y_val, float32=True)
+
+        assert forest.threshold.dtype == np.float32
+        np.testing.assert_allclose(
+            forest.predict(X_test), trained_predictor.model.predict(X_test), rtol=1e-5
+        )
+
+    def test_report_shrinks_model(self, trained_predictor, validation_data):
+        """Test: raportul are un rând per nivel, iar dimensiunea scade."""
+        levels = [
+            {"name": "complet", "n_trees": None, "max_leaves": None, "float32": False},
+            {"name": "float32", "n_trees": None, "max_leaves": None, "float32": True},
+            {"name": "3 arbori, 32 frunze", "n_trees": 3, "max_leaves": 32, "float32": True},
+        ]
+
+        report = compaction_report(
+            trained_predictor.model,
+            trained_predictor.scaler,
+            trained_predictor.feature_columns,
+            *validation_data,
+            levels,
+            joblib_path=trained_predictor.model_path,
+        )
+
+        assert list(report["level"]) == [
+            "sklearn (joblib)",
+            "complet",
+            "float32",
+            "3 arbori, 32 frunze",
+        ]
+        assert report["bytes"].iloc[1:].is_monotonic_decreasing
+        assert report["trees"].iloc[-1] == 3
+        assert (report["test_rmse"] > 0).all()
+
+    def test_predictor_compact_roundtrip(self, trained_predictor, training_data_path, tmp_path):
+        """Test: modelul compactat este salvat și reîncărcat prin artefactul `.mmap`."""
+        model_path = str(tmp_path / "pm25_model.joblib")
+        shutil.copy(trained_predictor.model_path, model_path)
+        predictor = PM25Predictor(model_path=model_path)
+        predictor.load_model()
+
+        predictor.compact(training_data_path, n_trees=5, max_leaves=64)
+
+        loaded = PM25Predictor(model_path=model_path, use_mmap=True, engine="compiled")
+        loaded.load_model()
+        assert loaded.model.n_estimators == 5
+        assert loaded.metrics["compaction"]["max_leaves"] == 64
+        with pytest.raises(ValueError):
+            loaded.compact(training_data_path)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
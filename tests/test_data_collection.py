@@ -6,13 +6,86 @@ Student 4: Documentare + Testare
 import pytest
 import pandas as pd
 from datetime import datetime
+import json
 import sys
 import os
+import threading
+from unittest.mock import MagicMock
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
 
 # Adaugă directorul părinte la path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.data_collection import DataCollector
+from src.rate_limiter import TokenBucket
+
+
+class _StubWeatherHandler(BaseHTTPRequestHandler):
+    """Server HTTP local care imită endpoint-ul `/weather` OpenWeatherMap."""
+    
+    def do_GET(self):
+        body = json.dumps({
+            'main': {'temp': 18.5, 'humidity': 60, 'pressure': 1012},
+            'wind': {'speed': 2.5, 'deg': 90},
+            'clouds': {'all': 20}
+        }).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        
+    def log_message(self, format, *args):
+        pass
+
+
+class _StubHistoryHandler(BaseHTTPRequestHandler):
+    """Server HTTP local care imită `history/city`: temperatura = ora din zi."""
+    
+    paths = []
+    
+    def do_GET(self):
+        url = urlparse(self.path)
+        type(self).paths.append(url.path)
+        query = parse_qs(url.query)
+        start, end = int(query['start'][0]), int(query['end'][0])
+        items = [
+            {'dt': dt, 'main': {'temp': (dt // 3600) % 24, 'humidity': 50, 'pressure': 1010},
+             'wind': {'speed': 1.0, 'deg': 0}, 'clouds': {'all': 0}}
+            for dt in range(start - start % 3600, end + 1, 3600)
+        ]
+        body = json.dumps({'list': items}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        
+    def log_message(self, format, *args):
+        pass
+
+
+def _serve(handler):
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_address[1]}'
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def stub_weather_url():
+    """Pornește serverul stub `/weather` și returnează URL-ul de bază."""
+    yield from _serve(_StubWeatherHandler)
+
+
+@pytest.fixture
+def stub_history_url():
+    """Pornește serverul stub `history/city` și returnează URL-ul de bază."""
+    _StubHistoryHandler.paths = []
+    yield from _serve(_StubHistoryHandler)
 
 
 class TestDataCollector:
@@ -80,6 +153,227 @@ class TestDataCollector:
         
         assert weather is not None
         assert all(key in weather for key in ['temperature', 'humidity', 'pressure', 'wind_speed'])
+        
+    def test_synthetic_weather_batch_generation(self, collector):
+        """Test generare vectorizată date meteo simulate."""
+        timestamps = pd.Series(pd.date_range('2026-01-01', periods=48, freq='H'))
+        weather_df = collector.get_weather_data_batch(timestamps)
+        
+        assert len(weather_df) == len(timestamps)
+        assert list(weather_df.columns) == [
+            'temperature', 'humidity', 'pressure', 'wind_speed', 'wind_direction', 'clouds'
+        ]
+        assert weather_df['humidity'].between(30, 95).all()
+        assert (weather_df['wind_speed'] >= 0).all()
+        
+    def test_concurrent_weather_fetch_stub_server(self, collector, stub_history_url):
+        """Test ferestre istorice cerute concurent contra unui server HTTP local."""
+        collector.weather_api_key = 'test_key'
+        collector.weather_history_url = stub_history_url
+        collector.weather_rate_limiter = TokenBucket(rate=1000, capacity=1000)
+        
+        timestamps = pd.Series(pd.date_range('2026-01-01', periods=40 * 24, freq='H', tz='UTC'))
+        weather_df = collector.get_weather_data_batch(timestamps)
+        
+        assert len(weather_df) == len(timestamps)
+        assert (weather_df['temperature'].values == timestamps.dt.hour.values).all()
+        assert collector.weather_fetch_stats['requests'] == 6
+        assert collector.weather_fetch_stats['requests_per_second'] > 0
+        
+    def test_history_unavailable_falls_back_to_synthetic(self, collector, stub_weather_url):
+        """Test: fără API istoric se folosesc date simulate, nu condițiile curente."""
+        collector.weather_api_key = 'test_key'
+        collector.weather_url = stub_weather_url
+        collector.weather_history_url = stub_weather_url + '/indisponibil'
+        collector.weather_rate_limiter = TokenBucket(rate=1000, capacity=1000)
+        
+        timestamps = pd.Series(pd.date_range('2026-01-01', periods=40, freq='30min'))
+        weather_df = collector.get_weather_data_batch(timestamps)
+        
+        assert len(weather_df) == 40
+        assert not (weather_df['temperature'] == 18.5).any()
+        assert collector.stats.to_dict()['fallbacks']['weather'] == 40
+        
+    def test_openaq_pagination(self, collector, tmp_path):
+        """Test parcurgere pagini OpenAQ și scriere în flux pe disc."""
+        def fake_page(n_results):
+            response = MagicMock()
+            response.json.return_value = {'results': [
+                {'date': {'utc': '2026-01-01T00:00:00Z'}, 'value': 20.0 + i,
+                 'location': 'Stație Test'}
+                for i in range(n_results)
+            ]}
+            return response
+        
+        # Fereastră unică: două pagini pline și una parțială
+        collector.session = MagicMock()
+        collector.session.get.side_effect = [fake_page(5), fake_page(5), fake_page(2)]
+        
+        output_file = str(tmp_path / 'pm25.csv')
+        chunks = list(collector.iter_air_quality_chunks(days=1, page_size=5))
+        
+        assert [len(c) for c in chunks] == [5, 5, 2]
+        assert collector.session.get.call_count == 3
+        assert collector.session.get.call_args.kwargs['params']['page'] == 3
+        
+        collector.session.get.side_effect = [fake_page(5), fake_page(2)]
+        total = collector.stream_air_quality_to_csv(days=1, output_file=output_file, page_size=5)
+        
+        assert total == 7
+        assert len(pd.read_csv(output_file)) == 7
+        
+    def test_openaq_windows_half_open(self, collector):
+        """Test: măsurătorile de la granița ferestrelor nu sunt duplicate."""
+        def endpoints_page(url, params):
+            # API-ul include ambele capete ale intervalului cerut
+            response = MagicMock()
+            response.json.return_value = {'results': [
+                {'date': {'utc': params[key]}, 'value': 20.0, 'location': 'Stație Test'}
+                for key in ('date_from', 'date_to')
+            ]}
+            return response
+        
+        collector.session = MagicMock()
+        collector.session.get.side_effect = endpoints_page
+        df = pd.concat(collector.iter_air_quality_chunks(days=3, page_size=5, window_days=1))
+        
+        assert collector.session.get.call_count == 3
+        assert len(df) == 4
+        assert not df['timestamp'].duplicated().any()
+        
+    def test_openaq_error_mid_stream_raises(self, collector, tmp_path):
+        """Test: o eroare după primele pagini este propagată, fără CSV incomplet."""
+        page = MagicMock()
+        page.json.return_value = {'results': [
+            {'date': {'utc': '2026-01-01T00:00:00Z'}, 'value': 20.0, 'location': 'Stație Test'}
+        ] * 5}
+        collector.session = MagicMock()
+        collector.session.get.side_effect = [page, ConnectionError('conexiune pierdută')]
+        output_file = str(tmp_path / 'pm25.csv')
+        
+        with pytest.raises(ConnectionError):
+            collector.stream_air_quality_to_csv(days=1, output_file=output_file, page_size=5)
+        
+        assert not os.path.exists(output_file)
+        assert not os.path.exists(output_file + '.tmp')
+        
+    def test_incremental_update_no_duplicates(self, collector, tmp_path, monkeypatch):
+        """Test actualizare incrementală idempotentă pe baza watermark-urilor."""
+        def fake_pm25(start_hour, periods):
+            return pd.DataFrame({
+                'timestamp': pd.date_range('2026-01-01', periods=periods, freq='H', tz='UTC')
+                             + pd.Timedelta(hours=start_hour),
+                'pm25': 25.0,
+                'location': 'Stație Test',
+                'city': 'Bucharest',
+                'country': 'RO'
+            })
+        
+        output_file = str(tmp_path / 'training_data.csv')
+        monkeypatch.setattr(collector, 'get_air_quality_data',
+                            lambda days, since=None, **kwargs: fake_pm25(0, 10))
+        collector.create_training_dataset(days=1, output_file=output_file)
+        
+        # Suprapunere parțială: orele 5-14, dintre care doar 10-14 sunt noi
+        monkeypatch.setattr(collector, 'get_air_quality_data',
+                            lambda days, since=None, **kwargs: fake_pm25(5, 10))
+        added = collector.create_training_dataset(days=1, output_file=output_file, incremental=True)
+        again = collector.update_training_dataset(days=1, output_file=output_file)
+        
+        df = pd.read_csv(output_file)
+        assert len(added) == 5
+        assert again.empty
+        assert len(df) == 15
+        assert not df.duplicated(subset=['timestamp', 'location']).any()
+        
+        # Watermark-uri pierdute: sunt recalculate din dataset
+        os.remove(collector._watermark_path(output_file))
+        assert collector.update_training_dataset(days=1, output_file=output_file).empty
+        
+    def test_incremental_update_window_capped(self, collector, tmp_path, monkeypatch):
+        """Test: o stație inactivă nu mută începutul colectării înaintea ferestrei."""
+        output_file = str(tmp_path / 'training_data.csv')
+        recent = pd.Timestamp(datetime.utcnow()).floor('H') - pd.Timedelta(hours=2)
+        pd.DataFrame({
+            'timestamp': [pd.Timestamp('2020-01-01'), recent],
+            'pm25': 25.0, 'location': ['Stație Veche', 'Stație Test'],
+            'city': 'Bucharest', 'country': 'RO'
+        }).to_csv(output_file, index=False)
+        requested = []
+        
+        def fake_pm25(days, since=None, **kwargs):
+            requested.append(since)
+            return pd.DataFrame(columns=['timestamp', 'pm25', 'location', 'city', 'country'])
+        
+        monkeypatch.setattr(collector, 'get_air_quality_data', fake_pm25)
+        collector.update_training_dataset(days=2, output_file=output_file)
+        
+        assert requested[0] >= datetime.utcnow() - pd.Timedelta(days=2, minutes=1)
+        assert requested[0] < recent
+        
+    def test_incremental_update_skips_synthetic_fallback(self, collector, tmp_path):
+        """Test: la eșecul OpenAQ nu se adaugă date simulate, watermark-urile rămân."""
+        output_file = str(tmp_path / 'training_data.csv')
+        pd.DataFrame({
+            'timestamp': pd.date_range('2026-01-01', periods=3, freq='H'),
+            'pm25': 25.0, 'location': 'Stație Test', 'city': 'Bucharest', 'country': 'RO'
+        }).to_csv(output_file, index=False)
+        watermark_path = collector._watermark_path(output_file)
+        collector._save_watermarks(output_file, {'Bucharest|Stație Test': '2026-01-01 02:00:00'})
+        with open(watermark_path) as f:
+            state = json.load(f)
+        
+        collector.session = MagicMock()
+        collector.session.get.side_effect = ConnectionError('OpenAQ indisponibil')
+        added = collector.update_training_dataset(days=1, output_file=output_file)
+        
+        assert added.empty
+        assert len(pd.read_csv(output_file)) == 3
+        with open(watermark_path) as f:
+            assert json.load(f)['watermarks'] == state['watermarks']
+        assert 'pm25' not in collector.stats.to_dict()['fallbacks']
+        
+    def test_bulk_historical_weather_asof(self, collector, stub_history_url):
+        """Test meteo istoric în bloc, aliniat cu merge_asof."""
+        collector.weather_api_key = 'test_key'
+        collector.weather_history_url = stub_history_url
+        collector.weather_rate_limiter = TokenBucket(rate=1000, capacity=1000)
+        
+        # 10 zile de date la 20 de minute, în ordine inversă
+        timestamps = pd.Series(
+            pd.date_range('2026-01-01', periods=720, freq='20min', tz='UTC')[::-1]
+        )
+        weather_df = collector.get_weather_data_batch(timestamps)
+        
+        assert len(weather_df) == len(timestamps)
+        assert _StubHistoryHandler.paths == ['/history/city', '/history/city']
+        stats = collector.stats.to_dict()
+        assert stats['requests']['history/city']['count'] == 2
+        assert stats['bytes_received'] > 0
+        expected_hour = timestamps.dt.round('H').dt.hour.values
+        assert (weather_df['temperature'].values == expected_hour).all()
+
+
+class TestTokenBucket:
+    """Teste pentru limitatorul de rată."""
+    
+    def test_burst_up_to_capacity(self):
+        """Test că se pot consuma imediat maxim `capacity` token-uri."""
+        bucket = TokenBucket(rate=1, capacity=3)
+        
+        assert all(bucket.try_acquire() for _ in range(3))
+        assert not bucket.try_acquire()
+        
+    def test_per_minute_rate(self):
+        """Test conversie cotă apeluri/minut."""
+        bucket = TokenBucket.per_minute(120)
+        
+        assert bucket.rate == 2.0
+        
+    def test_invalid_rate(self):
+        """Test eroare pentru rată invalidă."""
+        with pytest.raises(ValueError):
+            TokenBucket(rate=0)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,54 @@
+"""
+Teste unitare pentru instrumentarea pipeline-ului.
+"""
+
+import json
+import logging
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.instrumentation import PipelineStats
+
+
+class TestPipelineStats:
+    """Teste pentru clasa PipelineStats."""
+
+    def test_stage_timing_and_rows(self):
+        """Test cronometrare etape și calcul rânduri/secundă."""
+        stats = PipelineStats()
+        for _ in range(2):
+            with stats.stage("write"):
+                sum(range(10000))
+        stats.add_rows("write", 500)
+
+        record = stats.to_dict()["stages"]["write"]
+        assert record["calls"] == 2
+        assert record["rows"] == 500
+        assert record["rows_per_second"] > 0
+
+    def test_requests_and_fallbacks(self):
+        """Test contoare request-uri, bytes și fallback-uri."""
+        stats = PipelineStats()
+        stats.record_request("weather", 120, 0.01)
+        stats.record_request("weather", 80, 0.02)
+        stats.record_fallback("pm25", 24)
+
+        result = stats.to_dict()
+        assert result["total_requests"] == 2
+        assert result["bytes_received"] == 200
+        assert result["fallbacks"] == {"pm25": 24}
+
+    def test_log_emits_json(self, caplog):
+        """Test emitere statistici ca linie JSON."""
+        stats = PipelineStats()
+        stats.record_fallback("weather", 3)
+
+        with caplog.at_level(logging.INFO, logger="src.instrumentation"):
+            stats.log("test_run", {"city": "Bucharest"})
+
+        payload = json.loads(caplog.records[-1].getMessage())
+        assert payload["event"] == "test_run"
+        assert payload["city"] == "Bucharest"
+        assert payload["fallbacks"] == {"weather": 3}
@@ -0,0 +1,108 @@
+"""
+Teste pentru features de lag și starea online.
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.lag_features import HISTORY_HOURS, LAG_FEATURE_COLUMNS, OnlineLagState, add_lag_features
+from src.model import PM25Predictor
+from src.synthetic import generate_synthetic_dataset
+
+
+@pytest.fixture
+def station_data():
+    """Trei stații × 5 zile, cu câteva ore lipsă, în ordine amestecată."""
+    df = generate_synthetic_dataset(n_stations=3, years=5 / 365, seed=3)
+    return df.drop(index=[30, 31, 200]).sample(frac=1, random_state=0)
+
+
+class TestLagFeatures:
+    """Teste pentru varianta vectorizată și cea incrementală."""
+
+    def test_online_state_matches_vectorized(self, station_data):
+        """Test: starea online reproduce features de antrenare, inclusiv după pauze."""
+        features = add_lag_features(station_data)
+
+        for _, station in features.groupby("location", observed=True):
+            station = station.sort_values("timestamp")
+            state = OnlineLagState()
+            for timestamp, value, expected in zip(
+                station["timestamp"], station["pm25"], station[LAG_FEATURE_COLUMNS].values
+            ):
+                online = state.features(timestamp)
+                np.testing.assert_allclose(
+                    [online[col] for col in LAG_FEATURE_COLUMNS], expected, rtol=1e-9
+                )
+                state.update(timestamp, value)
+
+    def test_only_past_values_are_used(self, station_data):
+        """Test: modificarea valorii de la ora t nu schimbă features de la ora t."""
+        changed = station_data.copy()
+        changed["pm25"] = changed["pm25"].where(changed.index != 100, 1e6)
+
+        original = add_lag_features(station_data).loc[100, LAG_FEATURE_COLUMNS]
+        modified = add_lag_features(changed).loc[100, LAG_FEATURE_COLUMNS]
+
+        pd.testing.assert_series_equal(original, modified)
+
+    def test_gap_resets_windows(self):
+        """Test: după o pauză lag-urile sunt NaN, iar EWM continuă."""
+        state = OnlineLagState()
+        start = pd.Timestamp("2024-01-01")
+        for hour in range(HISTORY_HOURS):
+            state.update(start + pd.Timedelta(hours=hour), 10.0)
+        assert state.is_ready
+        assert state.features()["pm25_roll_max_24h"] == 10.0
+
+        state.update(start + pd.Timedelta(hours=HISTORY_HOURS + 5), 20.0)
+
+        features = state.features()
+        assert not state.is_ready
+        assert features["pm25_lag_1h"] == 20.0
+        assert np.isnan(features["pm25_lag_2h"])
+        assert 10.0 < features["pm25_ewm_6h"] < 20.0
+        with pytest.raises(ValueError):
+            state.update(start, 5.0)
+
+    def test_predictor_recursive_forecast(self, training_data_path, tmp_path):
+        """Test: modelul cu lag-uri se antrenează și prognozează recursiv din starea stației."""
+        predictor = PM25Predictor(
+            model_path=str(tmp_path / "pm25_model.joblib"),
+            params={"n_estimators": 10, "max_depth": 8},
+            lag_features=True,
+        )
+        predictor.train(training_data_path)
+
+        loaded = PM25Predictor(model_path=predictor.model_path)
+        loaded.load_model()
+        assert loaded.uses_lag_features
+
+        history = pd.read_csv(training_data_path, parse_dates=["timestamp"])
+        station = history[history["location"] == history["location"].iloc[0]]
+        state = OnlineLagState.from_history(station)
+        weather = {
+            "temperature": 20.0,
+            "humidity": 60.0,
+            "pressure": 1013.0,
+            "wind_speed": 3.0,
+            "wind_direction": 180.0,
+            "clouds": 50.0,
+        }
+
+        forecast = loaded.predict_next_24h(weather, lag_state=state)
+
+        assert forecast["timestamp"].iloc[0] == state.last_hour + pd.Timedelta(hours=1)
+        assert len(forecast) == 24 and (forecast["pm25_predicted"] >= 0).all()
+        with pytest.raises(ValueError):
+            loaded.predict_next_24h(weather)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
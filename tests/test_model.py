@@ -13,6 +13,7 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.model import PM25Predictor
+from src.prediction_cache import PredictionCache
 
 
 class TestPM25Predictor:
@@ -110,6 +111,133 @@ class TestPM25Predictor:
         assert 'humidity' in varied_weather
         # Verifică că valorile au variat
         assert varied_weather['temperature'] != base_weather['temperature']
+        
+    def test_predict_next_24h_batched(self, trained_predictor):
+        """Test predicție 24h asamblată într-o singură matrice."""
+        current_weather = {'temperature': 20.0, 'humidity': 60.0, 'pressure': 1013.0,
+                           'wind_speed': 3.0, 'wind_direction': 180.0, 'clouds': 50.0}
+        forecast = [{'temperature': 5.0, 'humidity': 90.0}] * 3
+        
+        predictions_df = trained_predictor.predict_next_24h(current_weather, forecast)
+        
+        assert len(predictions_df) == 24
+        assert (predictions_df['pm25_predicted'] >= 0).all()
+        assert (predictions_df['temperature'].iloc[:3] == 5.0).all()
+        assert trained_predictor.last_forecast_latency_ms > 0
+        
+    def test_predict_7_day_horizon(self, trained_predictor):
+        """Test orizont extins la 7 zile și validarea limitelor."""
+        predictions_df = trained_predictor.predict_next_24h({'temperature': 15.0}, hours=168)
+        
+        assert len(predictions_df) == 168
+        with pytest.raises(ValueError):
+            trained_predictor.predict_next_24h({'temperature': 15.0}, hours=169)
+        
+    def test_predict_batch(self, trained_predictor, training_data_path):
+        """Test predicție în bloc pentru array, DataFrame și flux de bucăți."""
+        df = pd.read_csv(training_data_path).head(250)
+        X = df[trained_predictor.feature_columns].values
+        
+        from_frame = trained_predictor.predict_batch(df)
+        from_array = trained_predictor.predict_batch(X, chunk_size=64)
+        from_chunks = trained_predictor.predict_batch(iter([X[:100], X[100:]]))
+        
+        assert from_frame.shape == (250,)
+        assert (from_frame >= 0).all()
+        np.testing.assert_allclose(from_frame, from_array)
+        np.testing.assert_allclose(from_frame, from_chunks)
+        assert from_frame[0] == pytest.approx(trained_predictor.predict(df.iloc[0].to_dict()))
+        
+    def test_train_chunked(self, training_data_path, tmp_path):
+        """Test antrenare pe bucăți: scaler incremental și arbori adăugați per bucată."""
+        predictor = PM25Predictor(model_path=str(tmp_path / 'pm25_model.joblib'))
+        predictor.train_chunked(training_data_path, chunk_rows=200, n_estimators=10,
+                                max_eval_rows=50)
+        
+        df = pd.read_csv(training_data_path)
+        training = predictor.metrics['training']
+        assert training['rows'] == len(df)
+        assert training['chunks'] == int(np.ceil(len(df) / 200))
+        assert len(predictor.model.estimators_) == sum(training['trees_per_chunk']) == 10
+        assert max(training['trees_per_chunk']) - min(training['trees_per_chunk']) <= 1
+        assert training['eval_rows']['test'] <= 80
+        assert training['eval_rows']['train'] <= 80
+        np.testing.assert_allclose(predictor.scaler.mean_,
+                                   df[predictor.feature_columns].mean().values, rtol=1e-5)
+        assert predictor.metrics['test']['r2'] > 0
+        assert os.path.exists(predictor.model_path)
+        
+    def test_train_evaluation_sample(self, training_data_path, tmp_path):
+        """Test evaluare pe eșantion: cel mult `max_eval_rows` rânduri per set."""
+        predictor = PM25Predictor(model_path=str(tmp_path / 'pm25_model.joblib'),
+                                  params={'n_estimators': 10, 'max_depth': 8})
+        predictor.train(training_data_path, evaluation='sample', max_eval_rows=100)
+        
+        evaluation = predictor.metrics['evaluation']
+        assert evaluation['mode'] == 'sample'
+        assert evaluation['rows'] == {'train': 100, 'test': 100}
+        assert predictor.metrics['train']['rmse'] < predictor.metrics['test']['rmse']
+        
+    def test_train_evaluation_oob(self, training_data_path, tmp_path):
+        """Test evaluare out-of-bag: scorurile OOB se adaugă lângă cele de antrenare."""
+        predictor = PM25Predictor(model_path=str(tmp_path / 'pm25_model.joblib'),
+                                  params={'n_estimators': 20, 'max_depth': 8})
+        predictor.train(training_data_path, evaluation='oob', max_eval_rows=100)
+        
+        assert predictor.metrics['evaluation']['rows']['train'] == 100
+        assert predictor.metrics['oob']['r2'] > 0
+        assert predictor.metrics['oob']['rmse'] > predictor.metrics['train']['rmse']
+        assert predictor.metrics['evaluation']['rows']['oob'] == \
+            predictor.metrics['training']['rows']
+        assert not hasattr(predictor.model, 'oob_prediction_')
+        
+        with pytest.raises(ValueError):
+            PM25Predictor(backend='hist_gradient_boosting').train(training_data_path,
+                                                                  evaluation='oob')
+        
+    def test_predict_intervals(self, trained_predictor, training_data_path):
+        """Test benzi p10/p90: media arborilor este predicția punctuală, ambele căi coincid."""
+        df = pd.read_csv(training_data_path).head(600)
+        X_scaled = trained_predictor.scaler.transform(df[trained_predictor.feature_columns].values)
+        trees = np.column_stack([tree.predict(X_scaled)
+                                 for tree in trained_predictor.model.estimators_])
+        
+        compiled = trained_predictor.predict_intervals(df, chunk_size=100)
+        sklearn_trees = trained_predictor.predict_intervals(df, chunk_size=600)
+        
+        assert list(compiled.columns) == ['pm25_predicted', 'pm25_p10', 'pm25_p90']
+        pd.testing.assert_frame_equal(compiled, sklearn_trees)
+        np.testing.assert_allclose(compiled['pm25_predicted'],
+                                   trained_predictor.predict_batch(df))
+        np.testing.assert_allclose(compiled['pm25_p90'],
+                                   np.maximum(np.quantile(trees, 0.9, axis=1), 0))
+        assert (compiled['pm25_p10'] <= compiled['pm25_p90']).all()
+        
+    def test_predict_next_24h_intervals(self, trained_predictor):
+        """Test benzile din prognoza de 24h, cerute explicit."""
+        predictions_df = trained_predictor.predict_next_24h({'temperature': 15.0}, intervals=True)
+        
+        assert (predictions_df['pm25_p10'] <= predictions_df['pm25_p90']).all()
+        assert 'pm25_p10' not in trained_predictor.predict_next_24h({'temperature': 15.0})
+        
+    def test_predict_next_24h_uses_prediction_cache(self, trained_predictor):
+        """Test: prognoza (cu sau fără benzi) trece prin cache-ul de predicții."""
+        cache = PredictionCache()
+        predictor = PM25Predictor(model_path=trained_predictor.model_path, prediction_cache=cache)
+        forecast = [{'temperature': 15.0, 'humidity': 60.0, 'pressure': 1013.0, 'wind_speed': 3.0,
+                     'wind_direction': 180.0, 'clouds': 50.0}] * 24
+        
+        first = predictor.predict_next_24h({}, forecast)
+        second = predictor.predict_next_24h({}, forecast, intervals=True)
+        
+        assert cache.stats['misses'] > 0
+        assert cache.stats['hits'] >= 24
+        np.testing.assert_allclose(first['pm25_predicted'], second['pm25_predicted'])
+        
+    def test_predict_batch_invalid_shape(self, trained_predictor):
+        """Test eroare pentru matrice cu număr greșit de coloane."""
+        with pytest.raises(ValueError):
+            trained_predictor.predict_batch(np.zeros((5, 3)))
 
 
 if __name__ == "__main__":
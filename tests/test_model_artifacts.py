@@ -0,0 +1,152 @@
+"""
+Teste pentru artefactele de model mapate în memorie.
+"""
+
+import os
+import sys
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.model import PM25Predictor
+from src.model_artifacts import (
+    compile_forest,
+    current_revision,
+    flatten_forest,
+    load_mmap_artifact,
+    save_mmap_artifact,
+)
+
+
+class TestMmapArtifact:
+    """Teste pentru formatul `.mmap` al modelului."""
+
+    def test_flat_forest_matches_sklearn(self, trained_predictor, training_data_path):
+        """Test: pădurea aplatizată prezice identic cu RandomForestRegressor."""
+        df = pd.read_csv(training_data_path).head(500)
+        X = trained_predictor.scaler.transform(df[trained_predictor.feature_columns].values)
+
+        artifact = load_mmap_artifact(trained_predictor.mmap_path)
+
+        np.testing.assert_allclose(
+            artifact["model"].predict(X, chunk_size=128), trained_predictor.model.predict(X)
+        )
+
+    def test_arrays_are_memory_mapped(self, trained_predictor):
+        """Test: array-urile arborilor sunt mapate din fișier, nu copiate în RAM."""
+        artifact = load_mmap_artifact(trained_predictor.mmap_path)
+
+        assert isinstance(artifact["model"].threshold, np.memmap)
+        assert artifact["model"].n_estimators == len(trained_predictor.model.estimators_)
+        assert artifact["feature_columns"] == trained_predictor.feature_columns
+        np.testing.assert_allclose(artifact["scaler"].mean_, trained_predictor.scaler.mean_)
+
+    def test_leaves_point_to_themselves(self, trained_predictor):
+        """Test: frunzele au prag infinit și trimit spre ele însele."""
+        forest = flatten_forest(trained_predictor.model)
+        leaves = np.isinf(forest.threshold)
+
+        assert leaves.any()
+        nodes = np.flatnonzero(leaves)
+        np.testing.assert_array_equal(forest.children[2 * nodes], nodes)
+        np.testing.assert_array_equal(forest.children[2 * nodes + 1], nodes)
+
+    def test_load_model_use_mmap(self, trained_predictor, training_data_path):
+        """Test: predictorul încărcat cu `use_mmap` dă aceleași predicții."""
+        predictor = PM25Predictor(model_path=trained_predictor.model_path, use_mmap=True)
+        predictor.load_model()
+        df = pd.read_csv(training_data_path).head(100)
+
+        np.testing.assert_allclose(predictor.predict_batch(df), trained_predictor.predict_batch(df))
+        assert predictor.metrics == trained_predictor.metrics
+
+    def test_save_never_leaves_artifact_missing(self, trained_predictor, tmp_path):
+        """Test: cititorii concurenți găsesc mereu o revizie completă în timpul salvărilor."""
+        path = str(tmp_path / "pm25_model.mmap")
+        forest = flatten_forest(trained_predictor.model)
+        args = (forest, trained_predictor.scaler, trained_predictor.feature_columns, {}, None)
+        save_mmap_artifact(path, *args)
+        errors = []
+        stop = threading.Event()
+
+        def read_loop():
+            while not stop.is_set():
+                try:
+                    load_mmap_artifact(path, mmap_mode=None)
+                except Exception as e:
+                    errors.append(e)
+
+        reader = threading.Thread(target=read_loop)
+        reader.start()
+        try:
+            for _ in range(10):
+                save_mmap_artifact(path, *args)
+        finally:
+            stop.set()
+            reader.join()
+
+        assert errors == []
+        assert len(os.listdir(os.path.join(path, "revisions"))) == 2
+        assert current_revision(path) == sorted(os.listdir(os.path.join(path, "revisions")))[-1]
+
+    def test_load_model_falls_back_to_joblib(self, trained_predictor, tmp_path):
+        """Test: fără artefact `.mmap` se încarcă fișierul joblib."""
+        import shutil
+
+        model_path = str(tmp_path / "pm25_model.joblib")
+        shutil.copy(trained_predictor.model_path, model_path)
+
+        predictor = PM25Predictor(model_path=model_path, use_mmap=True)
+        predictor.load_model()
+
+        assert hasattr(predictor.model, "estimators_")
+
+
+class TestCompiledForest:
+    """Teste pentru motorul de inferență compilat (scaler integrat în praguri)."""
+
+    def test_matches_sklearn_on_raw_features(self, trained_predictor, training_data_path):
+        """Test: pădurea compilată primește features brute și reproduce sklearn."""
+        df = pd.read_csv(training_data_path)
+        X = df[trained_predictor.feature_columns].values
+        rng = np.random.default_rng(0)
+        X = np.vstack([X, X + rng.normal(0, 0.01, X.shape)])
+
+        compiled = compile_forest(trained_predictor.model, trained_predictor.scaler)
+        expected = trained_predictor.model.predict(trained_predictor.scaler.transform(X))
+
+        np.testing.assert_allclose(compiled.predict(X), expected, rtol=1e-12)
+
+    def test_compile_from_mmap_artifact(self, trained_predictor, training_data_path):
+        """Test: compilarea funcționează și pe pădurea mapată în memorie."""
+        artifact = load_mmap_artifact(trained_predictor.mmap_path)
+        X = pd.read_csv(training_data_path).head(200)[trained_predictor.feature_columns].values
+
+        from_mmap = compile_forest(artifact["model"], artifact["scaler"])
+        from_sklearn = compile_forest(trained_predictor.model, trained_predictor.scaler)
+
+        np.testing.assert_allclose(from_mmap.predict(X), from_sklearn.predict(X))
+        assert isinstance(artifact["model"].threshold, np.memmap)
+
+    def test_predictor_compiled_engine(self, trained_predictor, training_data_path):
+        """Test: `engine='compiled'` dă aceleași predicții ca motorul sklearn."""
+        predictor = PM25Predictor(model_path=trained_predictor.model_path, engine="compiled")
+        predictor.load_model()
+        df = pd.read_csv(training_data_path).head(100)
+
+        np.testing.assert_allclose(predictor.predict_batch(df), trained_predictor.predict_batch(df))
+        row = df.iloc[0].to_dict()
+        assert predictor.predict(row) == pytest.approx(trained_predictor.predict(row))
+
+    def test_unknown_engine(self):
+        """Test eroare pentru motor de inferență necunoscut."""
+        with pytest.raises(ValueError):
+            PM25Predictor(engine="gpu")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
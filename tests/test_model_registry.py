@@ -0,0 +1,152 @@
+"""
+Teste pentru registry-ul de modele și înlocuirea la cald.
+"""
+
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.model import PM25Predictor
+from src.model_registry import HotSwapPredictor, ModelRegistry
+from src.prediction_cache import PredictionCache
+
+
+@pytest.fixture(scope="module")
+def small_predictor(training_data_path, tmp_path_factory):
+    """Un al doilea model, diferit de `trained_predictor` (pădure mică)."""
+    model_path = str(tmp_path_factory.mktemp("small") / "pm25_model.joblib")
+    predictor = PM25Predictor(model_path=model_path, params={"n_estimators": 5, "max_depth": 3})
+    predictor.train(training_data_path)
+    return predictor
+
+
+@pytest.fixture
+def features(trained_predictor, training_data_path):
+    """Câteva rânduri de features pentru predicții."""
+    return pd.read_csv(training_data_path).dropna().head(20)[trained_predictor.feature_columns]
+
+
+class TestModelRegistry:
+    """Teste pentru publicare, activare și rollback."""
+
+    def test_publish_activate_rollback(self, trained_predictor, small_predictor, tmp_path):
+        """Test: fiecare publicare este o versiune nouă; rollback revine la cea anterioară."""
+        registry = ModelRegistry(str(tmp_path / "registry"))
+        original_path = trained_predictor.model_path
+
+        first = registry.publish(trained_predictor)
+        second = registry.publish(small_predictor)
+
+        assert registry.versions() == [first, second]
+        assert registry.current_version() == second
+        assert trained_predictor.model_path == original_path
+        assert os.path.exists(registry.model_path(first))
+        assert registry.info(first)["metrics"] == trained_predictor.metrics["test"]
+        assert not [name for name in os.listdir(registry.versions_dir) if name.startswith(".")]
+
+        assert registry.rollback() == first
+        assert registry.current_version() == first
+        assert registry.load().model.n_estimators == trained_predictor.model.n_estimators
+        with pytest.raises(ValueError):
+            registry.rollback()
+        with pytest.raises(ValueError):
+            registry.activate("inexistentă")
+
+    def test_publish_without_activation(self, trained_predictor, tmp_path):
+        """Test: o versiune publicată fără activare nu schimbă pointerul."""
+        registry = ModelRegistry(str(tmp_path / "registry"))
+        first = registry.publish(trained_predictor)
+
+        registry.publish(trained_predictor, activate=False)
+
+        assert len(registry.versions()) == 2
+        assert registry.current_version() == first
+
+
+class TestHotSwapPredictor:
+    """Teste pentru urmărirea pointerului și înlocuirea modelului."""
+
+    def test_manual_swap(self, trained_predictor, small_predictor, features, tmp_path):
+        """Test: `check_for_update` încarcă versiunea activată și schimbă predicțiile."""
+        registry = ModelRegistry(str(tmp_path / "registry"))
+        first = registry.publish(trained_predictor)
+        handle = HotSwapPredictor(registry, poll_interval=None)
+
+        assert handle.version == first
+        assert not handle.check_for_update()
+        np.testing.assert_allclose(
+            handle.predict_batch(features), trained_predictor.predict_batch(features)
+        )
+
+        second = registry.publish(small_predictor)
+
+        assert handle.check_for_update()
+        assert handle.version == second and handle.swaps == 1
+        np.testing.assert_allclose(
+            handle.predict_batch(features), small_predictor.predict_batch(features)
+        )
+
+    def test_swap_does_not_serve_stale_cache(
+        self, trained_predictor, small_predictor, features, tmp_path
+    ):
+        """Test: o predicție în curs pe modelul vechi nu ajunge în cache-ul modelului nou."""
+        registry = ModelRegistry(str(tmp_path / "registry"))
+        registry.publish(trained_predictor)
+        handle = HotSwapPredictor(
+            registry, poll_interval=None, prediction_cache_factory=PredictionCache
+        )
+        row = features.iloc[0].to_dict()
+        in_flight = handle.predict
+
+        registry.publish(small_predictor)
+        assert handle.check_for_update()
+        old_value = in_flight(row)
+
+        assert old_value == pytest.approx(trained_predictor.predict(row))
+        assert handle.predict(row) == pytest.approx(small_predictor.predict(row))
+        assert handle.prediction_cache is not in_flight.__self__.prediction_cache
+        with pytest.raises(ValueError):
+            HotSwapPredictor(registry, poll_interval=None, prediction_cache=PredictionCache())
+
+    def test_background_swap_during_predictions(
+        self, trained_predictor, small_predictor, features, tmp_path
+    ):
+        """Test: predicțiile continue nu eșuează cât timp modelul este înlocuit în fundal."""
+        registry = ModelRegistry(str(tmp_path / "registry"))
+        registry.publish(trained_predictor)
+        errors, stop = [], threading.Event()
+
+        with HotSwapPredictor(
+            registry, poll_interval=0.05, use_mmap=True, engine="compiled"
+        ) as handle:
+
+            def serve():
+                while not stop.is_set():
+                    try:
+                        handle.predict_batch(features)
+                    except Exception as e:  # pragma: no cover - raportat mai jos
+                        errors.append(e)
+
+            worker = threading.Thread(target=serve)
+            worker.start()
+
+            second = registry.publish(small_predictor)
+            deadline = time.monotonic() + 10
+            while handle.version != second and time.monotonic() < deadline:
+                time.sleep(0.05)
+            stop.set()
+            worker.join()
+
+        assert handle.version == second
+        assert errors == []
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
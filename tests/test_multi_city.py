@@ -0,0 +1,84 @@
+"""
+Teste pentru colectarea paralelă din mai multe orașe.
+"""
+
+import multiprocessing
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data_collection import DataCollector
+from src.multi_city import collect_cities
+from src.storage import read_training_data
+
+
+class TestMultiCity:
+    """Teste pentru funcția collect_cities."""
+
+    def test_collect_cities_partitioned(self, tmp_path, monkeypatch):
+        """Test colectare paralelă, partiționare și raportare erori."""
+
+        def fake_pages(self, date_from, date_to, page_size=1000, window_days=7):
+            if self.city == "Fără date":
+                raise ConnectionError("OpenAQ indisponibil")
+            yield pd.DataFrame(
+                {
+                    "timestamp": pd.date_range(date_from, periods=24, freq="H", tz="UTC"),
+                    "pm25": 20.0,
+                    "location": f"Stație {self.city}",
+                    "city": self.city,
+                    "country": self.country,
+                }
+            )
+
+        monkeypatch.setattr(DataCollector, "_iter_openaq_pages", fake_pages)
+        locations = [
+            {"city": "Cluj-Napoca", "country": "RO", "lat": 46.7712, "lon": 23.6236},
+            {"city": "Iasi", "country": "RO", "lat": 47.1585, "lon": 27.6014},
+            {"city": "Invalid", "country": "RO", "lat": "nu-este-numar", "lon": 0},
+            {"city": "Fără date", "country": "RO", "lat": 45.0, "lon": 25.0},
+        ]
+        output_dir = str(tmp_path / "cities")
+
+        report_df = collect_cities(locations, days=1, output_dir=output_dir, max_workers=2)
+
+        statuses = dict(zip(report_df["city"], report_df["status"]))
+        assert statuses == {
+            "Cluj-Napoca": "ok",
+            "Iasi": "ok",
+            "Invalid": "eroare",
+            "Fără date": "eroare",
+        }
+        ok = report_df[report_df["status"] == "ok"]
+        assert all("pm25" not in fallbacks for fallbacks in ok["fallbacks"])
+
+        df = read_training_data(output_dir)
+        assert set(df["city"].unique()) == {"Cluj-Napoca", "Iasi"}
+        assert "Simulated Station" not in set(df["location"])
+        assert len(df) == report_df["rows"].sum()
+
+    def test_timeout_terminates_workers(self, tmp_path, monkeypatch):
+        """Test: orașele neterminate la timeout sunt raportate, iar procesele lor oprite."""
+        monkeypatch.setattr(
+            DataCollector, "get_air_quality_data", lambda self, days, **kwargs: time.sleep(60)
+        )
+        locations = [{"city": "Lent", "country": "RO", "lat": 0, "lon": 0}]
+
+        start = time.perf_counter()
+        report_df = collect_cities(
+            locations, days=1, output_dir=str(tmp_path), max_workers=1, timeout=1
+        )
+
+        assert list(report_df["status"]) == ["timeout"]
+        assert time.perf_counter() - start < 30
+        assert not multiprocessing.active_children()
+
+    def test_no_locations(self, tmp_path):
+        """Test: o listă goală de orașe produce un raport gol."""
+        report_df = collect_cities([], output_dir=str(tmp_path))
+
+        assert report_df.empty
@@ -0,0 +1,89 @@
+"""
+Teste pentru cache-ul de predicții cu features cuantizate.
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.model import PM25Predictor
+from src.prediction_cache import PredictionCache
+
+COLUMNS = ["temperature", "humidity"]
+
+
+def fake_model(X):
+    """Predicție deterministă, ușor de verificat."""
+    return X.sum(axis=1)
+
+
+class TestPredictionCache:
+    """Teste pentru clasa PredictionCache."""
+
+    def test_quantize(self):
+        """Test rotunjire la rezoluția fiecărei coloane."""
+        cache = PredictionCache({"temperature": 0.5, "humidity": 0})
+        X = np.array([[20.26, 55.55], [-0.1, 1.0]])
+
+        np.testing.assert_allclose(cache.quantize(X, COLUMNS), [[20.5, 55.55], [0.0, 1.0]])
+
+    def test_near_identical_rows_hit(self):
+        """Test: valori din aceeași celulă refolosesc predicția."""
+        cache = PredictionCache()
+        calls = []
+
+        def compute(X):
+            calls.append(len(X))
+            return fake_model(X)
+
+        first = cache.get_or_compute(np.array([[20.01, 60.2]]), COLUMNS, compute)
+        second = cache.get_or_compute(np.array([[19.99, 59.8], [25.0, 40.0]]), COLUMNS, compute)
+
+        assert calls == [1, 1]
+        assert second[0] == first[0] == pytest.approx(80.0)
+        assert cache.stats["hits"] == 1
+        assert cache.stats["misses"] == 2
+        assert cache.hit_rate == pytest.approx(1 / 3)
+
+    def test_lru_eviction(self):
+        """Test evacuare LRU la depășirea numărului de intrări."""
+        cache = PredictionCache(max_entries=2)
+        for temperature in [10.0, 20.0, 10.0, 30.0]:
+            cache.get_or_compute(np.array([[temperature, 50.0]]), COLUMNS, fake_model)
+
+        assert len(cache) == 2
+        assert cache.stats["evictions"] == 1
+        # 20 a fost cel mai vechi folosit, 10 a rămas în cache
+        cache.get_or_compute(np.array([[10.0, 50.0]]), COLUMNS, fake_model)
+        assert cache.stats["hits"] == 2
+
+    def test_invalid_max_entries(self):
+        """Test eroare pentru dimensiune invalidă."""
+        with pytest.raises(ValueError):
+            PredictionCache(max_entries=0)
+
+    def test_predictor_cache_invalidated_on_load(self, trained_predictor, training_data_path):
+        """Test: predictorul folosește cache-ul, golit la încărcarea unui model."""
+        cache = PredictionCache()
+        predictor = PM25Predictor(model_path=trained_predictor.model_path, prediction_cache=cache)
+        predictor.load_model()
+        row = pd.read_csv(training_data_path).iloc[0].to_dict()
+
+        row["temperature"] = 20.02
+        value = predictor.predict(row)
+        row["temperature"] = 19.98
+        assert predictor.predict(row) == value
+        assert cache.stats["hits"] == 1
+
+        predictor.load_model()
+        assert len(cache) == 0
+        assert cache.stats["invalidations"] == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
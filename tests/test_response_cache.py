@@ -0,0 +1,112 @@
+"""
+Teste unitare pentru cache-ul de răspunsuri HTTP.
+"""
+
+import json
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.response_cache import ResponseCache
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    """Server local care numără request-urile și suportă ETag."""
+
+    calls = 0
+
+    def do_GET(self):
+        type(self).calls += 1
+        if self.headers.get("If-None-Match") == '"v1"':
+            self.send_response(304)
+            self.end_headers()
+            return
+        body = json.dumps({"path": self.path, "padding": "x" * 200}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", '"v1"')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestResponseCache:
+    """Teste pentru clasa ResponseCache."""
+
+    @pytest.fixture
+    def base_url(self):
+        """Pornește serverul stub."""
+        _StubHandler.calls = 0
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+        server.shutdown()
+        server.server_close()
+
+    @pytest.fixture
+    def session(self):
+        """Sesiune HTTP pentru teste."""
+        with requests.Session() as session:
+            yield session
+
+    def test_key_ignores_api_key_and_param_order(self, tmp_path):
+        """Test normalizare parametri în cheie."""
+        cache = ResponseCache(str(tmp_path))
+
+        key1 = cache.make_key("http://api/weather", {"lat": 1, "lon": 2, "appid": "a"})
+        key2 = cache.make_key("http://api/weather", {"lon": 2, "lat": 1, "appid": "b"})
+
+        assert key1 == key2
+        assert key1 != cache.make_key("http://api/weather", {"lat": 1, "lon": 3})
+
+    def test_hit_after_miss(self, tmp_path, base_url, session):
+        """Test că al doilea apel este servit din cache."""
+        cache = ResponseCache(str(tmp_path))
+
+        first = cache.fetch(session, f"{base_url}/weather", {"lat": 1}, "weather")
+        second = cache.fetch(session, f"{base_url}/weather", {"lat": 1}, "weather")
+
+        assert first == second
+        assert _StubHandler.calls == 1
+        assert cache.stats["hits"] == 1
+        assert cache.stats["misses"] == 1
+        assert cache.hit_rate == 0.5
+
+    def test_persistent_across_instances(self, tmp_path, base_url, session):
+        """Test că intrările supraviețuiesc recreării cache-ului."""
+        ResponseCache(str(tmp_path)).fetch(session, f"{base_url}/weather", {"lat": 1}, "weather")
+        cache = ResponseCache(str(tmp_path))
+        cache.fetch(session, f"{base_url}/weather", {"lat": 1}, "weather")
+
+        assert _StubHandler.calls == 1
+        assert cache.stats["hits"] == 1
+
+    def test_conditional_revalidation(self, tmp_path, base_url, session):
+        """Test revalidare cu ETag după expirarea TTL."""
+        cache = ResponseCache(str(tmp_path), ttls={"weather": 0})
+
+        first = cache.fetch(session, f"{base_url}/weather", {"lat": 1}, "weather")
+        second = cache.fetch(session, f"{base_url}/weather", {"lat": 1}, "weather")
+
+        assert first == second
+        assert _StubHandler.calls == 2
+        assert cache.stats["revalidated"] == 1
+
+    def test_lru_eviction(self, tmp_path, base_url, session):
+        """Test evacuare LRU la depășirea dimensiunii maxime."""
+        cache = ResponseCache(str(tmp_path), max_bytes=1000)
+
+        for i in range(6):
+            cache.fetch(session, f"{base_url}/measurements", {"page": i}, "measurements")
+
+        assert cache.stats["evictions"] > 0
+        assert sum(os.path.getsize(tmp_path / f) for f in os.listdir(tmp_path)) <= 1000
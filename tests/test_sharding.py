@@ -0,0 +1,97 @@
+"""
+Teste pentru antrenarea sharded (un model per oraș) și rutarea predicțiilor.
+"""
+
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.sharding import ShardedPredictor, shard_dir_name, threads_per_worker, train_shards
+
+
+@pytest.fixture(scope="module")
+def shards_dir(training_data_path, tmp_path_factory):
+    """Modele per oraș antrenate pe datele simulate (păduri mici)."""
+    output_dir = str(tmp_path_factory.mktemp("shards"))
+    report_df = train_shards(
+        training_data_path,
+        output_dir=output_dir,
+        max_workers=2,
+        min_rows=100,
+        predictor_kwargs={"params": {"n_estimators": 5, "max_depth": 4}},
+    )
+    return output_dir, report_df
+
+
+class TestShardTraining:
+    """Teste pentru train_shards."""
+
+    def test_layout_and_manifest(self, shards_dir, training_data_path):
+        """Test: un model și un log per oraș, manifest cu toate orașele antrenate."""
+        output_dir, report_df = shards_dir
+        cities = sorted(pd.read_csv(training_data_path)["city"].unique())
+
+        assert list(report_df["status"]) == ["ok"] * len(cities)
+        with open(os.path.join(output_dir, "shards.json")) as f:
+            manifest = json.load(f)
+        assert manifest["shard_by"] == "city"
+        assert sorted(manifest["shards"]) == cities
+        city_rows = pd.read_csv(training_data_path)["city"].value_counts()
+        for row in report_df.itertuples():
+            assert row.rows == manifest["shards"][row.shard]["rows"] == city_rows[row.shard]
+            assert row.train_rows < row.rows
+
+        for city in cities:
+            shard_dir = os.path.join(output_dir, shard_dir_name("city", city))
+            assert os.path.isfile(os.path.join(shard_dir, "pm25_model.joblib"))
+            assert os.path.isfile(os.path.join(shard_dir, "train.log"))
+
+    def test_threads_bounded(self, shards_dir):
+        """Test: procese × thread-uri nu depășește numărul de CPU-uri."""
+        _, report_df = shards_dir
+        assert (report_df["threads"] == threads_per_worker(2)).all()
+        assert threads_per_worker(2) * 2 <= max(os.cpu_count(), 2)
+        assert threads_per_worker(10 * os.cpu_count()) == 1
+
+    def test_small_shards_skipped(self, training_data_path, tmp_path):
+        """Test: fără shard-uri suficient de mari se ridică ValueError."""
+        with pytest.raises(ValueError):
+            train_shards(training_data_path, output_dir=str(tmp_path), min_rows=10**6)
+
+
+class TestShardedPredictor:
+    """Teste pentru rutarea cererilor la modelul shard-ului."""
+
+    def test_routing_matches_shard_models(self, shards_dir, training_data_path):
+        """Test: un lot amestecat primește predicțiile modelului fiecărui oraș."""
+        output_dir, _ = shards_dir
+        sharded = ShardedPredictor(output_dir)
+        df = pd.read_csv(training_data_path).dropna().sample(50, random_state=0)
+        df = df.reset_index(drop=True)
+
+        predictions = sharded.predict_batch(df)
+        for city in sharded.shards:
+            mask = (df["city"] == city).to_numpy()
+            expected = sharded.predictor_for(city).predict_batch(df[mask])
+            np.testing.assert_allclose(predictions[mask], expected)
+
+        row = df.iloc[0].to_dict()
+        assert sharded.predict(row) == pytest.approx(predictions[0])
+
+    def test_unknown_shard_uses_fallback(self, shards_dir, trained_predictor, training_data_path):
+        """Test: un oraș fără model folosește fallback-ul sau ridică ValueError."""
+        output_dir, _ = shards_dir
+        row = pd.read_csv(training_data_path).dropna().iloc[0].to_dict()
+        row["city"] = "Oraș necunoscut"
+
+        with pytest.raises(ValueError):
+            ShardedPredictor(output_dir).predict(row)
+
+        sharded = ShardedPredictor(output_dir, fallback=trained_predictor)
+        assert sharded.predict(row) == pytest.approx(trained_predictor.predict(row))
@@ -0,0 +1,147 @@
+"""
+Teste unitare pentru modulul de stocare a dataset-ului.
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import storage
+from src.storage import (
+    append_training_data,
+    apply_schema,
+    iter_training_data,
+    read_training_data,
+    write_training_data,
+)
+
+
+@pytest.fixture
+def training_df():
+    """Dataset mic cu toate coloanele schemei."""
+    n = 24
+    timestamps = pd.date_range("2026-01-01", periods=n, freq="H", tz="UTC")
+    return pd.DataFrame(
+        {
+            "timestamp": timestamps,
+            "pm25": np.linspace(10, 50, n),
+            "location": "Stație Test",
+            "city": "Bucharest",
+            "country": "RO",
+            "temperature": 20.0,
+            "humidity": 60.0,
+            "pressure": 1013.25,
+            "wind_speed": 3.0,
+            "wind_direction": 180.0,
+            "clouds": 50.0,
+            "hour": timestamps.hour,
+            "day_of_week": timestamps.dayofweek,
+            "month": timestamps.month,
+        }
+    )
+
+
+class TestStorage:
+    """Teste pentru citirea/scrierea dataset-ului de antrenare."""
+
+    def test_apply_schema(self, training_df):
+        """Test tipuri de date conform schemei."""
+        df = apply_schema(training_df)
+
+        assert df["pm25"].dtype == np.float32
+        assert df["hour"].dtype == np.int8
+        assert df["city"].dtype == "category"
+        assert df["timestamp"].dt.tz is None
+
+    @pytest.mark.parametrize("extension", [".parquet", ".feather"])
+    def test_columnar_roundtrip_with_projection(self, training_df, tmp_path, extension):
+        """Test scriere/citire columnară cu proiecție pe coloane."""
+        pytest.importorskip("pyarrow")
+        path = str(tmp_path / f"training_data{extension}")
+        write_training_data(training_df, path)
+
+        df = read_training_data(path, columns=["temperature", "pm25"])
+
+        assert list(df.columns) == ["temperature", "pm25"]
+        assert len(df) == len(training_df)
+        assert df["pm25"].dtype == np.float32
+
+    def test_csv_export_roundtrip(self, training_df, tmp_path):
+        """Test că formatul CSV rămâne disponibil."""
+        path = str(tmp_path / "training_data.csv")
+        write_training_data(training_df, path)
+        append_training_data(training_df.iloc[:2], path)
+
+        df = read_training_data(path)
+
+        assert len(df) == len(training_df) + 2
+        assert df["pm25"].dtype == np.float32
+
+    def test_columnar_append(self, training_df, tmp_path):
+        """Test adăugare rânduri la un dataset Parquet."""
+        pytest.importorskip("pyarrow")
+        path = str(tmp_path / "training_data.parquet")
+        write_training_data(training_df, path)
+        append_training_data(training_df.iloc[:3], path)
+
+        df = read_training_data(path)
+
+        assert len(df) == len(training_df) + 3
+        assert df["city"].dtype == "category"
+
+    @pytest.mark.parametrize("extension", [".parquet", ".feather"])
+    def test_columnar_append_writes_parts_and_compacts(
+        self, training_df, tmp_path, extension, monkeypatch
+    ):
+        """Test: adăugările nu rescriu fișierul principal; delta-urile sunt compactate periodic."""
+        pytest.importorskip("pyarrow")
+        monkeypatch.setattr(storage, "COMPACT_AFTER_PARTS", 3)
+        path = str(tmp_path / f"training_data{extension}")
+        write_training_data(training_df, path)
+        mtime = os.stat(path).st_mtime_ns
+
+        append_training_data(training_df.iloc[:2], path)
+        append_training_data(training_df.iloc[2:5], path)
+
+        assert os.stat(path).st_mtime_ns == mtime
+        assert len(os.listdir(path + ".parts")) == 2
+        assert len(read_training_data(path)) == len(training_df) + 5
+        assert (
+            sum(len(chunk) for chunk in iter_training_data(path, chunk_rows=7))
+            == len(training_df) + 5
+        )
+
+        append_training_data(training_df.iloc[5:6], path)
+
+        assert not os.path.exists(path + ".parts")
+        df = read_training_data(path)
+        assert len(df) == len(training_df) + 6
+        np.testing.assert_allclose(df["pm25"].iloc[-6:], training_df["pm25"].iloc[:6], rtol=1e-6)
+
+    @pytest.mark.parametrize("extension", [".csv", ".parquet", ".feather"])
+    def test_iter_training_data_chunks(self, training_df, tmp_path, extension):
+        """Test citire pe bucăți, cu proiecție pe coloane."""
+        if extension != ".csv":
+            pytest.importorskip("pyarrow")
+        path = str(tmp_path / f"training_data{extension}")
+        write_training_data(training_df, path)
+
+        chunks = list(iter_training_data(path, columns=["pm25", "hour"], chunk_rows=10))
+
+        assert [len(chunk) for chunk in chunks] == [10, 10, 4]
+        assert list(chunks[0].columns) == ["pm25", "hour"]
+        np.testing.assert_allclose(pd.concat(chunks)["pm25"], training_df["pm25"], rtol=1e-6)
+
+    def test_iter_training_data_partitioned(self, training_df, tmp_path):
+        """Test citire pe bucăți dintr-un director cu mai multe partiții."""
+        write_training_data(training_df, str(tmp_path / "city=A" / "part-0.csv"))
+        write_training_data(training_df, str(tmp_path / "city=B" / "part-0.csv"))
+
+        chunks = list(iter_training_data(str(tmp_path), chunk_rows=20))
+
+        assert [len(chunk) for chunk in chunks] == [20, 4, 20, 4]
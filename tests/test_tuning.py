@@ -0,0 +1,104 @@
+"""
+Teste pentru căutarea de hiperparametri cu buget de timp.
+"""
+
+import json
+import multiprocessing
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.backends import DEFAULT_FOREST_PARAMS
+from src.model import PM25Predictor
+from src.tuning import SEARCH_SPACE, count_rounds, sample_candidates, successive_halving
+
+
+@pytest.fixture
+def regression_data():
+    """Date de regresie mici: y depinde de primele două coloane."""
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(900, 4))
+    y = 3 * X[:, 0] - 2 * X[:, 1] + rng.normal(0, 0.1, 900)
+    return X[:600], y[:600], X[600:], y[600:]
+
+
+SMALL_SPACE = {"n_estimators": [5, 10], "max_depth": [2, 6], "min_samples_leaf": [1, 5]}
+
+
+class TestTuning:
+    """Teste pentru successive halving."""
+
+    def test_sample_candidates_distinct(self):
+        """Test: candidații sunt distincți, din spațiul de căutare, cu configurația inclusă."""
+        candidates = sample_candidates(10, include=DEFAULT_FOREST_PARAMS)
+
+        assert len(candidates) == 10
+        assert candidates[0] == DEFAULT_FOREST_PARAMS
+        assert len({str(sorted(c.items())) for c in candidates}) == 10
+        for params in candidates[1:]:
+            assert all(params[name] in SEARCH_SPACE[name] for name in params)
+
+    def test_sample_candidates_capped_by_space(self):
+        """Test: nu se cer mai mulți candidați decât combinații posibile."""
+        assert len(sample_candidates(100, SMALL_SPACE)) == 8
+
+    def test_count_rounds_exact_powers(self):
+        """Test: puterile exacte ale lui `eta` nu adaugă o rundă în plus."""
+        assert count_rounds(27, 3) == 4
+        assert count_rounds(28, 3) == 5
+        assert count_rounds(8, 2) == 4
+        assert count_rounds(1, 3) == 1
+
+    def test_successive_halving_rounds(self, regression_data):
+        """Test: rundele reduc candidații și cresc numărul de rânduri."""
+        candidates = sample_candidates(8, SMALL_SPACE)
+
+        result = successive_halving(
+            *regression_data, candidates, budget_seconds=120, eta=2, min_rows=100, max_workers=2
+        )
+
+        rounds = [entry["round"] for entry in result["trace"]]
+        assert rounds.count(0) == 8
+        assert rounds.count(1) == 4
+        rows = {entry["round"]: entry["rows"] for entry in result["trace"]}
+        assert rows[1] == 2 * rows[0]
+        assert result["best_params"] in candidates
+        assert result["best_params"]["max_depth"] == 6
+        assert not result["budget_exhausted"]
+
+    def test_budget_exhausted(self, regression_data):
+        """Test: fără buget, candidații sunt marcați timeout și procesele sunt oprite."""
+        candidates = sample_candidates(4, SMALL_SPACE)
+
+        result = successive_halving(*regression_data, candidates, budget_seconds=0, max_workers=1)
+
+        assert result["budget_exhausted"]
+        assert result["best_params"] is None
+        assert {entry["status"] for entry in result["trace"]} <= {"timeout", "ok"}
+        assert not multiprocessing.active_children()
+
+    def test_predictor_tune_persists_result(self, training_data_path, tmp_path):
+        """Test: rezultatul căutării este salvat lângă metrici și poate fi reîncărcat."""
+        predictor = PM25Predictor(model_path=str(tmp_path / "pm25_model.joblib"))
+
+        result = predictor.tune(
+            training_data_path, budget_seconds=60, n_candidates=3, max_workers=2, refit=False
+        )
+
+        with open(predictor.tuning_path) as f:
+            saved = json.load(f)
+        assert saved["best_params"] == result["best_params"] == predictor.params
+        assert saved["baseline_params"] == DEFAULT_FOREST_PARAMS
+        assert len(saved["trace"]) >= 3
+
+        other = PM25Predictor(model_path=predictor.model_path)
+        assert other.load_tuned_params()
+        assert other.params == predictor.params
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])